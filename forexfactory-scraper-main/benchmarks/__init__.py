@@ -0,0 +1,4 @@
+"""
+Benchmarks for the scraper's pure-Python hot paths. Run from the project root,
+e.g. python -m benchmarks.bench_merge
+"""
@@ -0,0 +1,84 @@
+# benchmarks/bench_asof.py
+"""
+Attaching the latest release of one (Currency, Event) series to minute
+bars: calendar_query.CalendarIndex (one searchsorted per call) against the
+naive per-bar lookup on the string DateTime column and pd.merge_asof.
+
+The naive lookup is timed on --naive-bars bars and extrapolated to the full
+bar count; results are checked to agree on those bars.
+
+    python -m benchmarks.bench_asof [--rows 100000] [--bars 1000000 10000000] [--naive-bars 500]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.forexfactory.calendar_query import CalendarIndex
+from src.forexfactory.schema import format_datetimes
+
+from .synthetic import make_cache
+
+
+def naive_latest(cache, bars, currency, event):
+    """
+    Row-by-row lookup, as done before: filter the cache for each bar.
+    """
+    stamps = format_datetimes(pd.Series(bars)).tolist()
+    out = []
+    for stamp in stamps:
+        rows = cache[(cache["Currency"] == currency) & (cache["Event"] == event) & (cache["DateTime"] <= stamp)]
+        out.append(rows["DateTime"].iloc[-1] if len(rows) else np.nan)
+    return out
+
+
+def merge_asof_latest(cache, bars, currency, event):
+    series = cache[(cache["Currency"] == currency) & (cache["Event"] == event)]
+    right = pd.DataFrame({"EventTime": pd.to_datetime(series["DateTime"], utc=True), "Actual": series["Actual"]})
+    left = pd.DataFrame({"Bar": bars})
+    return pd.merge_asof(left, right.sort_values("EventTime"), left_on="Bar", right_on="EventTime")
+
+
+def run(rows, bar_counts, naive_bars):
+    cache = make_cache(rows)
+    currency, event = cache.groupby(["Currency", "Event"]).size().idxmax()
+    t0 = time.perf_counter()
+    index = CalendarIndex(cache)
+    print(f"cache: {len(cache)} rows, series {currency}/{event}; index built in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+    print(f"{'bars':>12} {'naive (s, est.)':>16} {'merge_asof (ms)':>16} {'CalendarIndex (ms)':>19} {'vs naive':>9}")
+    start = pd.Timestamp(cache["DateTime"].iloc[0], tz="UTC")
+    for n in bar_counts:
+        bars = pd.date_range(start, periods=n, freq="min")
+        sample = bars[np.linspace(0, n - 1, min(naive_bars, n)).astype(int)]
+
+        t0 = time.perf_counter()
+        expected = naive_latest(cache, sample, currency, event)
+        t_naive = (time.perf_counter() - t0) / len(sample) * n
+
+        t0 = time.perf_counter()
+        merge_asof_latest(cache, bars, currency, event)
+        t_merge = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        index.latest(bars, currency, event, columns=["EventTime", "Actual", "Surprise"])
+        t_index = time.perf_counter() - t0
+
+        got = index.latest(sample, currency, event, columns=["EventTime"])["EventTime"]
+        assert format_datetimes(got).fillna("").tolist() == pd.Series(expected).fillna("").tolist()
+        print(f"{n:>12} {t_naive:>16.1f} {t_merge * 1e3:>16.1f} {t_index * 1e3:>19.1f} {t_naive / t_index:>8.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="As-of join benchmark")
+    parser.add_argument('--rows', type=int, default=100_000, help="Synthetic cache size (rows)")
+    parser.add_argument('--bars', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--naive-bars', type=int, default=500)
+    args = parser.parse_args()
+    run(args.rows, args.bars, args.naive_bars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_browser.py
+"""
+Page load time and Chrome memory of the browser profiles against a local
+stand-in calendar page that pulls in slow images, fonts, media and trackers.
+Needs Chrome (and psutil for the memory column).
+
+    python -m benchmarks.bench_browser [--pages 10] [--asset-delay 0.3] [--headless]
+"""
+
+import argparse
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.forexfactory.browser import PROFILES, chrome_rss, get_profile, launch_chrome
+from tests.local_server import CalendarServer, heavy_page
+from tests.selenium_fakes import read_fixture
+
+
+def run(pages, asset_delay, headless):
+    page = heavy_page(read_fixture("calendar_day_jan06_2025.html"))
+    print(f"{'profile':>8} {'pages':>6} {'mean load (ms)':>15} {'chrome RSS (MB)':>16}")
+    with CalendarServer(page) as srv:
+        srv.asset_delay = asset_delay
+        for name in PROFILES:
+            driver = launch_chrome(get_profile(name, headless=headless))
+            try:
+                timings = []
+                for i in range(pages):
+                    start = time.perf_counter()
+                    driver.get(f"{srv.calendar_url}?day=jan{i + 1:02d}.2025")
+                    WebDriverWait(driver, 25).until(EC.visibility_of_element_located(
+                        (By.XPATH, '//table[contains(@class,"calendar__table")]')))
+                    timings.append(time.perf_counter() - start)
+                rss = chrome_rss(driver)
+            finally:
+                driver.quit()
+            rss_mb = f"{rss / 2**20:.0f}" if rss is not None else "n/a"
+            print(f"{name:>8} {pages:>6} {sum(timings) / len(timings) * 1e3:>15.0f} {rss_mb:>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Browser profile benchmark")
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--asset-delay', type=float, default=0.3,
+                        help="Seconds the stand-in server takes to serve each heavy asset")
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+    run(args.pages, args.asset_delay, args.headless)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# benchmarks/bench_hotpaths.py
+"""
+Micro-benchmarks of the per-page and per-run hot paths, on the saved
+calendar fixture and on synthetic caches shaped like test.csv:
+
+    parse/*            calendar_html.parse_calendar_html (day page, month page)
+    detail_to_string   detail_parser.detail_data_to_string
+    merge/<rows>       csv_util.merge_new_data, one scraped day into the cache
+    detail_index/*     DetailIndex build over the cache and existing-detail lookups
+    write_csv/<rows>   csv_util.write_data_to_csv
+    read_csv/<rows>    csv_util.read_existing_data
+    normalize/<rows>   normalize.normalize over the typed cache (once per run, at load)
+    write_arrow/<rows> arrow_export.write_data_to_arrow of the normalized cache,
+                       as the scraper exports it
+    read_arrow/<rows>  arrow_export.read_arrow (memory-mapped, what a backtester loads)
+
+Timings are the best of --repeat runs (each run loops small cases for at
+least 50 ms), in milliseconds per call. --save records them in
+baselines.json; --check compares against it and exits with status 1 when
+a case got slower than the baseline by more than --tolerance.
+
+    python -m benchmarks.bench_hotpaths [--sizes 10000 100000 1000000] [--repeat 3]
+    python -m benchmarks.bench_hotpaths --check [--tolerance 0.3]
+    python -m benchmarks.bench_hotpaths --save
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory.arrow_export import read_arrow, write_data_to_arrow
+from src.forexfactory.calendar_html import parse_calendar_html
+from src.forexfactory.csv_util import merge_new_data, read_existing_data, write_data_to_csv
+from src.forexfactory.detail_index import DetailIndex
+from src.forexfactory.detail_parser import detail_data_to_string
+from src.forexfactory.normalize import normalize
+from src.forexfactory.schema import to_typed
+from tests.selenium_fakes import calendar_page_for, read_fixture
+
+from .synthetic import make_cache, make_day_batch
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+MIN_RUN_SECONDS = 0.05
+
+# A parse_detail_table() result as Forex Factory lays it out
+DETAIL_SPECS = {
+    "Source": "Destatis (latest release)",
+    "Measures": "Change in the price of goods and services\npurchased by consumers;",
+    "Usual Effect": "Actual > Forecast = Good for currency;",
+    "Frequency": "Released monthly, about 30 days after the month ends;",
+    "Next Release": "Feb 6, 2025",
+    "FF Notes": "This is the earliest CPI data for the Euro Zone;\n\tGerman states report before the national figure",
+    "Why Traders Care": "Consumer prices account for a majority of overall inflation.",
+}
+
+
+def measure(fn, repeat):
+    """
+    Best time per call (seconds) over `repeat` runs of enough calls to last
+    MIN_RUN_SECONDS.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_RUN_SECONDS:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def page_cases():
+    utc = gettz("UTC")
+    day = datetime(2025, 1, 6, tzinfo=utc)
+    month = [datetime(2025, 1, d, tzinfo=utc) for d in range(1, 32)]
+    day_page = read_fixture("calendar_day_jan06_2025.html")
+    month_page = calendar_page_for(month)
+    details = [dict(DETAIL_SPECS) for _ in range(1000)]
+    return [
+        ("parse/day", lambda: parse_calendar_html(day_page, day)),
+        ("parse/month", lambda: parse_calendar_html(month_page, month[0])),
+        # 1000 expanded rows, about one week of --details scraping
+        ("detail_to_string/1000", lambda: [detail_data_to_string(d) for d in details]),
+    ]
+
+
+def cache_cases(n_rows, tmpdir):
+    """
+    Cases over one synthetic cache of n_rows rows (half of them with a Detail).
+    """
+    cache = make_cache(n_rows, detail_ratio=0.5)
+    batch = make_day_batch(cache)
+    index = DetailIndex.from_dataframe(cache)
+    # 10k lookups, half of them keys of the cache
+    rng = np.random.default_rng(2)
+    sample = cache.sample(n=min(5_000, len(cache)), random_state=2)
+    keys = list(zip(sample["DateTime"], sample["Currency"], sample["Event"]))
+    keys += [(f"2099-01-01T{h % 24:02d}:00:00+00:00", "USD", f"Event {h}")
+             for h in rng.integers(0, 500, size=10_000 - len(keys))]
+
+    csv_file = os.path.join(tmpdir, f"cache_{n_rows}.csv")
+    write_data_to_csv(cache, csv_file)
+    write_target = os.path.join(tmpdir, f"write_{n_rows}.csv")
+    # The scraper's in-memory cache: typed and normalized once at load
+    typed = to_typed(cache)
+    normalized = normalize(typed)
+    arrow_file = os.path.join(tmpdir, f"cache_{n_rows}.arrow")
+    write_data_to_arrow(normalized, arrow_file)
+    arrow_target = os.path.join(tmpdir, f"write_{n_rows}.arrow")
+    label = f"{n_rows // 1000}k" if n_rows < 1_000_000 else f"{n_rows // 1_000_000}M"
+    return [
+        (f"merge/{label}", lambda: merge_new_data(cache, batch)),
+        (f"detail_index/build/{label}", lambda: DetailIndex.from_dataframe(cache)),
+        (f"detail_index/lookup/{label}", lambda: [index.get(*key) for key in keys]),
+        (f"write_csv/{label}", lambda: write_data_to_csv(cache, write_target)),
+        (f"read_csv/{label}", lambda: read_existing_data(csv_file)),
+        (f"normalize/{label}", lambda: normalize(typed)),
+        (f"write_arrow/{label}", lambda: write_data_to_arrow(normalized, arrow_target)),
+        (f"read_arrow/{label}", lambda: read_arrow(arrow_file)),
+    ]
+
+
+def run(sizes, repeat):
+    results = {}
+
+    def time_cases(cases):
+        for name, fn in cases:
+            results[name] = measure(fn, repeat) * 1e3
+            print(f"{name:>26} {results[name]:>12.3f} ms", flush=True)
+
+    tmpdir = tempfile.mkdtemp(prefix="bench-hotpaths-")
+    try:
+        time_cases(page_cases())
+        # One cache at a time, so the 1M-row one is the only one in memory
+        for n in sizes:
+            time_cases(cache_cases(n, tmpdir))
+    finally:
+        shutil.rmtree(tmpdir)
+    return results
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baselines(path, results):
+    baselines = load_baselines(path)
+    baselines.update({name: round(ms, 4) for name, ms in results.items()})
+    doc = {
+        "machine": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": dict(sorted(baselines.items())),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baselines, tolerance):
+    """
+    Print current vs baseline per case. Returns the names of the cases slower
+    than their baseline by more than `tolerance` (0.3 = 30%).
+    """
+    regressions = []
+    print(f"\n{'case':>26} {'baseline (ms)':>14} {'now (ms)':>12} {'ratio':>7}")
+    for name, ms in results.items():
+        base = baselines.get(name)
+        if base is None:
+            print(f"{name:>26} {'-':>14} {ms:>12.3f} {'new':>7}")
+            continue
+        ratio = ms / base if base else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  <-- slower"
+        print(f"{name:>26} {base:>14.3f} {ms:>12.3f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot path micro-benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="Synthetic cache sizes (rows)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', type=str, default=BASELINES)
+    parser.add_argument('--save', action='store_true', help="Record the results as the new baselines")
+    parser.add_argument('--check', action='store_true', help="Fail on regressions against the baselines")
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help="Allowed slowdown before --check fails (default: 0.3, i.e. 30%%)")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    regressions = compare(results, load_baselines(args.baseline), args.tolerance)
+    if args.save:
+        save_baselines(args.baseline, results)
+        print(f"\nBaselines written to {args.baseline}")
+    if args.check and regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
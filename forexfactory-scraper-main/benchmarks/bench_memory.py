@@ -0,0 +1,59 @@
+# benchmarks/bench_memory.py
+"""
+Memory and merge time of the calendar cache held as CSV strings (as
+read_existing_data returns it) against the typed layout of schema.to_typed
+(tz-aware datetimes, categories, Arrow strings), on synthetic multi-year
+caches shaped like test.csv.
+
+    python -m benchmarks.bench_memory [--sizes 100000 1000000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.forexfactory.csv_util import changed_rows, merge_new_data
+from src.forexfactory.schema import memory_usage, to_strings, to_typed
+
+from .synthetic import make_cache, make_day_batch
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run(sizes, repeat):
+    print(f"{'cache rows':>12} {'layout':>8} {'memory (MB)':>12} {'merge (ms)':>11} {'diff (ms)':>10}")
+    for n in sizes:
+        cache = make_cache(n, detail_ratio=0.3)
+        batch = make_day_batch(cache)
+        t_typed, typed = best_of(lambda: to_typed(cache), repeat)
+        t_back, back = best_of(lambda: to_strings(typed), repeat)
+        pd.testing.assert_frame_equal(back, cache)
+
+        for layout, df in (("strings", cache), ("typed", typed)):
+            t_merge, merged = best_of(lambda: merge_new_data(df, batch), repeat)
+            t_diff, _ = best_of(lambda: changed_rows(df, batch), repeat)
+            print(f"{len(df):>12} {layout:>8} {memory_usage(df) / 2**20:>12.1f} "
+                  f"{t_merge * 1e3:>11.1f} {t_diff * 1e3:>10.1f}")
+        pd.testing.assert_frame_equal(to_strings(merged), merge_new_data(cache, batch))
+        print(f"{'':>12} to_typed {t_typed * 1e3:.0f} ms, to_strings {t_back * 1e3:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="String vs typed cache layout benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_merge.py
+"""
+Scaling of csv_util.merge_new_data against the previous row-by-row
+implementation, for one scraped day merged into caches of growing size.
+
+    python -m benchmarks.bench_merge [--sizes 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.forexfactory.csv_util import CSV_COLUMNS, merge_new_data
+
+from .synthetic import make_cache, make_day_batch
+
+
+def legacy_merge_new_data(existing_df, new_df):
+    """
+    The iterrows()/.at implementation merge_new_data replaced, kept as reference.
+    """
+    if existing_df.empty:
+        return new_df
+
+    def add_unique_key(df):
+        df = df.copy()
+        df['unique_key'] = (
+            df["DateTime"].astype(str).str.strip() + "_" +
+            df["Currency"].astype(str).str.strip() + "_" +
+            df["Event"].astype(str).str.strip()
+        )
+        return df
+
+    existing_df = add_unique_key(existing_df)
+    new_df = add_unique_key(new_df)
+    existing_df.set_index('unique_key', inplace=True)
+    new_df.set_index('unique_key', inplace=True)
+
+    new_rows_list = []
+    for key, new_row in new_df.iterrows():
+        if key in existing_df.index:
+            existing_detail = str(existing_df.at[key, "Detail"]).strip() if pd.notna(existing_df.at[key, "Detail"]) else ""
+            new_detail = str(new_row["Detail"]).strip() if pd.notna(new_row["Detail"]) else ""
+            if not existing_detail and new_detail:
+                existing_df.at[key, "Detail"] = new_detail
+        else:
+            new_rows_list.append(new_row)
+
+    if new_rows_list:
+        existing_df = pd.concat([existing_df, pd.DataFrame(new_rows_list)])
+
+    merged_df = existing_df.reset_index(drop=True)
+    return merged_df[CSV_COLUMNS]
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run(sizes, repeat):
+    """
+    Two shapes per cache size: one scraped day (~80 rows, as in the scrape
+    loop) and a bulk merge of 10% of the cache (journal compaction, backfill).
+    """
+    print(f"{'cache rows':>12} {'batch rows':>11} {'legacy (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8}")
+    for n in sizes:
+        cache = make_cache(n)
+        for batch in (make_day_batch(cache),
+                      make_day_batch(cache, n_known=n // 20, n_new=n // 20)):
+            t_legacy, expected = best_of(lambda: legacy_merge_new_data(cache, batch), repeat)
+            t_new, got = best_of(lambda: merge_new_data(cache, batch), repeat)
+            pd.testing.assert_frame_equal(got, expected)
+            print(f"{len(cache):>12} {len(batch):>11} {t_legacy * 1e3:>12.1f} "
+                  f"{t_new * 1e3:>16.1f} {t_legacy / t_new:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="merge_new_data scaling benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/synthetic.py
+"""
+Synthetic calendar caches shaped like test.csv (same columns, currencies,
+impacts, value formats), for benchmarking without scraping.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.forexfactory.csv_util import CSV_COLUMNS
+
+CURRENCIES = ["USD", "EUR", "GBP", "CAD", "AUD", "JPY", "NZD", "CNY", "CHF", "All"]
+CURRENCY_WEIGHTS = [0.31, 0.17, 0.14, 0.10, 0.09, 0.05, 0.05, 0.05, 0.03, 0.01]
+IMPACTS = ["Medium Impact Expected", "High Impact Expected"]
+VALUE_FORMATS = ["{:.1f}", "{:.1f}%", "{:.1f}K", "{:.2f}B", "{:.2f}%"]
+# Keep timestamps within a century (and within pandas' nanosecond range)
+MAX_DAYS = 36_500
+
+
+def make_cache(n_rows: int, seed: int = 0, n_events: int = 500, detail_ratio: float = 0.0) -> pd.DataFrame:
+    """
+    n_rows calendar rows, ~5 per day from 2008-01-01 (denser past MAX_DAYS
+    days), sorted by DateTime, with string columns exactly as
+    read_existing_data returns them.
+    """
+    rng = np.random.default_rng(seed)
+    days = min(n_rows // 5, MAX_DAYS)
+    minutes = np.sort(rng.integers(0, days * 24 * 60 + 1, size=n_rows)) // 30 * 30
+    stamps = pd.Timestamp("2008-01-01", tz="UTC") + pd.to_timedelta(minutes, unit="min")
+    currency = rng.choice(CURRENCIES, size=n_rows, p=CURRENCY_WEIGHTS)
+    event = np.char.add("Event ", rng.integers(0, n_events, size=n_rows).astype(str))
+
+    def values():
+        fmt = rng.integers(0, len(VALUE_FORMATS), size=n_rows)
+        nums = rng.normal(0, 50, size=n_rows)
+        out = np.array([VALUE_FORMATS[f].format(v) for f, v in zip(fmt, nums)], dtype=object)
+        out[rng.random(n_rows) < 0.2] = np.nan
+        return out
+
+    detail = np.full(n_rows, np.nan, dtype=object)
+    with_detail = rng.random(n_rows) < detail_ratio
+    detail[with_detail] = "Source: Synthetic Agency | Frequency: Released monthly"
+
+    df = pd.DataFrame({
+        "DateTime": stamps.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+        "Currency": currency,
+        "Impact": rng.choice(IMPACTS, size=n_rows),
+        "Event": event,
+        "Actual": values(),
+        "Forecast": values(),
+        "Previous": values(),
+        "Detail": detail,
+    }, columns=CSV_COLUMNS)
+    # Keys must be unique, as in a real cache
+    df = df.drop_duplicates(subset=["DateTime", "Currency", "Event"]).reset_index(drop=True)
+    return df
+
+
+def make_day_batch(cache: pd.DataFrame, n_known: int = 40, n_new: int = 40, seed: int = 1) -> pd.DataFrame:
+    """
+    A scraped batch: n_known rows already in the cache (with details to fill)
+    plus n_new unseen rows.
+    """
+    rng = np.random.default_rng(seed)
+    known = cache.sample(n=min(n_known, len(cache)), random_state=seed).copy()
+    known["Detail"] = "Source: Synthetic Agency"
+    new = make_cache(n_new * 2, seed=seed + 1000).head(n_new).copy()
+    new["DateTime"] = "2099-01-01T" + pd.Series(rng.integers(0, 24, size=len(new))).map("{:02d}".format).values + ":00:00+00:00"
+    new["Event"] = "New " + new["Event"]
+    return pd.concat([known, new], ignore_index=True)
@@ -0,0 +1,121 @@
+# src/forexfactory/arrow_export.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from . import metrics, schema
+from .atomic import atomic_write
+from .csv_util import CSV_COLUMNS
+from .normalize import NORMALIZED_COLUMNS, VALUE_COLUMNS, is_normalized, normalize
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Arrow IPC file (Feather v2) layout, uncompressed so that readers can
+# memory-map it: every process reading the file shares the same pages of
+# the OS page cache instead of holding its own copy. DateTime is the UTC
+# instant, UtcOffset the offset it was scraped with (minutes), which gives
+# back the CSV strings exactly. The normalized columns (normalize.py) follow.
+ARROW_SCHEMA = pa.schema([
+    ("DateTime", pa.timestamp("ns", tz="UTC")),
+    ("UtcOffset", pa.int16()),
+    ("Currency", pa.dictionary(pa.int32(), pa.string())),
+    ("Impact", pa.dictionary(pa.int32(), pa.string())),
+    ("Event", pa.dictionary(pa.int32(), pa.string())),
+    ("Actual", pa.string()),
+    ("Forecast", pa.string()),
+    ("Previous", pa.string()),
+    ("Detail", pa.string()),
+    *[
+        field
+        for col in VALUE_COLUMNS
+        for field in ((f"{col}Value", pa.float64()),
+                      (f"{col}Unit", pa.dictionary(pa.int8(), pa.string())),
+                      (f"{col}Magnitude", pa.int8()))
+    ],
+    ("Surprise", pa.float64()),
+    ("AllDay", pa.bool_()),
+    ("Tentative", pa.bool_()),
+])
+
+
+def to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Cache DataFrame (CSV strings or the typed layout) -> Arrow table
+    (ARROW_SCHEMA), sorted by DateTime. Empty strings are stored as nulls.
+    """
+    if not is_normalized(df):
+        df = normalize(df)
+    stamps, minutes = schema.split_datetimes(df["DateTime"])
+    order = pa.array(stamps.argsort(kind="mergesort").to_numpy())
+    utc = stamps.dt.tz_localize(None).to_numpy()
+    arrays = [
+        pa.array(utc, type=pa.timestamp("ns")).cast(ARROW_SCHEMA.field("DateTime").type),
+        pa.array(minutes, type=pa.int16()),
+    ]
+    for col in CSV_COLUMNS[1:]:
+        column = pa.array(df[col], type=pa.string(), from_pandas=True)
+        column = pc.if_else(pc.equal(column, ""), pa.scalar(None, pa.string()), column)
+        if pa.types.is_dictionary(ARROW_SCHEMA.field(col).type):
+            column = column.dictionary_encode()
+        arrays.append(column)
+    for col in NORMALIZED_COLUMNS:
+        arrays.append(pa.array(df[col], type=ARROW_SCHEMA.field(col).type, from_pandas=True))
+    arrays = [pc.take(array, order) for array in arrays]
+    return pa.Table.from_arrays(arrays, schema=ARROW_SCHEMA)
+
+
+@metrics.timed("arrow_write")
+def write_data_to_arrow(df: pd.DataFrame, arrow_file: str):
+    """
+    Export the cache as an uncompressed Arrow IPC file, atomically (same
+    temp file + rename as the CSV).
+    """
+    table = to_arrow_table(df)
+
+    def write(f):
+        with pa.ipc.new_file(f, table.schema) as ipc:
+            ipc.write_table(table)
+
+    atomic_write(arrow_file, write, binary=True)
+    logger.info(f"Exported {table.num_rows} rows to {arrow_file}")
+
+
+def open_arrow(arrow_file: str) -> pa.Table:
+    """
+    Memory-mapped Arrow table over the export: nothing is read or copied
+    until a column is used, and the pages are shared between processes.
+    """
+    source = pa.memory_map(arrow_file, "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+def read_arrow(arrow_file: str, columns: list[str] | None = None, strings: bool = False) -> pd.DataFrame:
+    """
+    The export as a DataFrame. By default the columns are Arrow-backed
+    (pd.ArrowDtype) views of the memory map, without conversion; with
+    strings=True, shaped like read_existing_data (CSV strings, NaN for
+    empty), which copies everything.
+    """
+    table = open_arrow(arrow_file)
+    if strings:
+        if table.num_rows == 0:
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        utc = table.column("DateTime").to_numpy().astype("datetime64[ns]")
+        minutes = table.column("UtcOffset").to_numpy()
+        out = pd.DataFrame({"DateTime": schema.format_local(utc, minutes)})
+        for col in CSV_COLUMNS[1:]:
+            values = table.column(col).cast(pa.string()).to_pandas()
+            out[col] = values.where(values.notna(), np.nan)
+        return out
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,33 @@
+# src/forexfactory/atomic.py
+
+import os
+import tempfile
+
+
+def atomic_write(path: str, writer, binary: bool = False):
+    """
+    Replace `path` atomically: writer(f) writes the content to a temp file
+    in the same directory, which is fsync'd then renamed over `path`. A
+    crash leaves either the old file or the new one, never a truncated one;
+    the temp file is removed if anything fails.
+
+    Text mode is UTF-8 with newlines written as is (newline="", as the csv
+    module needs); binary=True hands writer a binary file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    suffix = os.path.splitext(path)[1]
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=suffix, dir=directory)
+    try:
+        if binary:
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8", newline="")
+        with f:
+            writer(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,164 @@
+# src/forexfactory/backfill.py
+
+import argparse
+import logging
+from datetime import datetime
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from . import metrics
+from .browser import PROFILES
+from .config import (
+    DetailOptions,
+    FetchOptions,
+    MetricsOptions,
+    ResumeOptions,
+    ScrapeConfig,
+    StorageOptions,
+)
+from .coverage import CoverageManifest, manifest_path
+from .detail_cache import DEFAULT_MAX_AGE_DAYS
+from .detail_index import DetailIndex
+from .scraper import scrape_range_pandas
+from .storage import STORES, arrow_path, read_cache
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def rows_missing_details(df: pd.DataFrame, from_date: datetime | None = None,
+                         to_date: datetime | None = None) -> pd.DataFrame:
+    """
+    Cached rows whose Detail is empty, optionally limited to [from_date, to_date].
+    """
+    if df.empty:
+        return df
+    missing = df[df["Detail"].fillna("").astype(str).str.strip() == ""]
+    day = missing["DateTime"].astype(str).str.strip().str[:10]
+    if from_date is not None:
+        missing = missing[day >= from_date.strftime("%Y-%m-%d")]
+        day = day[missing.index]
+    if to_date is not None:
+        missing = missing[day <= to_date.strftime("%Y-%m-%d")]
+    return missing
+
+
+def backfill_details(output_csv, tzname="Asia/Tehran", workers=1, from_date=None, to_date=None,
+                     store="csv", store_path=None, export_csv=False, write_mode="rewrite",
+                     compact_every=0, detail_max_age_days=DEFAULT_MAX_AGE_DAYS, detail_refs=False,
+                     browser_profile="default", headless=False, spare_drivers=0, recycle_pages=0,
+                     max_browser_rss_mb=0, profile_day=None, export_arrow=None, max_rate=None) -> int:
+    """
+    Fill in empty Details of an existing cache without re-scraping the calendar.
+
+    Only the days holding such rows are visited (one ?day= page each, spread
+    over `workers` drivers), and only those rows are expanded; cached and
+    per-series Details are reused as in a --details scrape. tzname must be
+    the timezone the cache was scraped in. Returns the number of rows that
+    were missing a Detail.
+    """
+    missing = rows_missing_details(read_cache(output_csv, store, store_path), from_date, to_date)
+    if missing.empty:
+        logger.info("No rows without Detail, nothing to backfill.")
+        if export_arrow:
+            from .arrow_export import write_data_to_arrow
+            write_data_to_arrow(read_cache(output_csv, store, store_path), export_arrow)
+        return 0
+
+    tz = gettz(tzname)
+    day_strings = sorted(missing["DateTime"].astype(str).str.strip().str[:10].unique())
+    days = [datetime.fromisoformat(d).replace(tzinfo=tz) for d in day_strings]
+    keys = {
+        DetailIndex.key(dt, cur, ev)
+        for dt, cur, ev in zip(missing["DateTime"], missing["Currency"], missing["Event"])
+    }
+    logger.info(f"Backfilling Details of {len(keys)} rows over {len(days)} days")
+
+    manifest = CoverageManifest.load(manifest_path(output_csv))
+    config = ScrapeConfig(
+        fetch=FetchOptions(workers=workers, engine="selenium", granularity="day",
+                           browser_profile=browser_profile, headless=headless,
+                           spare_drivers=spare_drivers, recycle_pages=recycle_pages,
+                           max_browser_rss_mb=max_browser_rss_mb, max_rate=max_rate),
+        details=DetailOptions(scrape_details=True, detail_max_age_days=detail_max_age_days,
+                              detail_refs=detail_refs, detail_keys=keys),
+        storage=StorageOptions(store=store, store_path=store_path, write_mode=write_mode,
+                               compact_every=compact_every, export_csv=export_csv,
+                               export_arrow=export_arrow),
+        metrics=MetricsOptions(profile_day=profile_day),
+        resume=ResumeOptions(days=days, manifest=manifest),
+    )
+    scrape_range_pandas(days[0], days[-1], output_csv, tzname, config)
+    return len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forex Factory detail backfill")
+    parser.add_argument('--csv', type=str, default="forex_factory_cache.csv")
+    parser.add_argument('--tz', type=str, default="Asia/Tehran",
+                        help="Timezone the cache was scraped in")
+    parser.add_argument('--start', default=None, help="Only rows on or after this date (YYYY-MM-DD)")
+    parser.add_argument('--end', default=None, help="Only rows on or before this date (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of Chrome instances expanding days in parallel")
+    parser.add_argument('--store', choices=STORES, default="csv")
+    parser.add_argument('--store-path', type=str, default=None)
+    parser.add_argument('--export-csv', action='store_true')
+    parser.add_argument('--journal', action='store_true')
+    parser.add_argument('--compact-every', type=int, default=0)
+    parser.add_argument('--detail-max-age', type=float, default=DEFAULT_MAX_AGE_DAYS)
+    parser.add_argument('--detail-refs', action='store_true')
+    parser.add_argument('--browser-profile', choices=tuple(PROFILES), default="default")
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--spare-drivers', type=int, default=0)
+    parser.add_argument('--recycle-after', type=int, default=0)
+    parser.add_argument('--max-browser-mb', type=float, default=0)
+    parser.add_argument('--trace', type=str, default=None, metavar="PATH")
+    parser.add_argument('--metrics', type=str, default=None, metavar="PATH")
+    parser.add_argument('--profile-day', type=str, default=None, metavar="YYYY-MM-DD")
+    parser.add_argument('--export-arrow', nargs='?', const=True, default=None, metavar="PATH")
+    parser.add_argument('--max-rate', type=float, default=None, metavar="REQ_PER_S")
+
+    args = parser.parse_args()
+    tz = gettz(args.tz)
+    from_date = datetime.fromisoformat(args.start).replace(tzinfo=tz) if args.start else None
+    to_date = datetime.fromisoformat(args.end).replace(tzinfo=tz) if args.end else None
+    profile_day = datetime.fromisoformat(args.profile_day).replace(tzinfo=tz) if args.profile_day else None
+
+    run_metrics = metrics.Metrics(trace_path=args.trace, prometheus_path=args.metrics)
+    previous = metrics.install(run_metrics)
+    try:
+        backfill_details(
+            args.csv,
+            tzname=args.tz,
+            workers=args.workers,
+            from_date=from_date,
+            to_date=to_date,
+            store=args.store,
+            store_path=args.store_path,
+            export_csv=args.export_csv,
+            write_mode="journal" if args.journal else "rewrite",
+            compact_every=args.compact_every,
+            detail_max_age_days=args.detail_max_age,
+            detail_refs=args.detail_refs,
+            browser_profile=args.browser_profile,
+            headless=args.headless,
+            spare_drivers=args.spare_drivers,
+            recycle_pages=args.recycle_after,
+            max_browser_rss_mb=args.max_browser_mb,
+            profile_day=profile_day,
+            export_arrow=arrow_path(args.csv) if args.export_arrow is True else args.export_arrow,
+            max_rate=args.max_rate,
+        )
+    finally:
+        metrics.install(previous)
+        run_metrics.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# src/forexfactory/browser.py
+
+import fnmatch
+import importlib.util
+import logging
+from collections import namedtuple
+
+import undetected_chromedriver as uc
+
+from . import metrics
+from .date_logic import CALENDAR_URL
+from .fetcher import TIMEZONE_COOKIE, timezone_cookie
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# How Chrome is started.
+#   page_load_strategy: "normal" waits for every subresource, "eager" returns
+#                       at DOMContentLoaded (the calendar table is in the HTML)
+#   block_resources:    drop images, fonts, media, ads and trackers at the
+#                       network level (Chrome DevTools Network.setBlockedURLs)
+#   timezone:           zone the site shows the calendar in (its timezone
+#                       cookie, and the zone Chrome reports), None = untouched
+BrowserProfile = namedtuple(
+    "BrowserProfile",
+    ["name", "page_load_strategy", "window_size", "headless", "block_resources", "timezone"],
+    defaults=(None,),
+)
+
+PROFILES = {
+    "default": BrowserProfile("default", "normal", (1400, 1000), False, False),
+    "lean": BrowserProfile("lean", "eager", (1024, 768), False, True),
+}
+
+# Chrome DevTools URL patterns ("*" wildcards). Scripts of forexfactory.com
+# itself are left alone: the anti-bot challenge needs them.
+BLOCKED_URL_PATTERNS = [
+    # Images, fonts, media
+    "*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+    "*.webp", "*.webp?*", "*.svg", "*.svg?*", "*.ico", "*.ico?*",
+    "*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*",
+    "*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.mp3", "*.mp3?*",
+    # Ads, analytics, social widgets
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*amazon-adsystem.com*",
+    "*facebook.net*", "*facebook.com/tr*", "*twitter.com/widgets*", "*scorecardresearch.com*",
+    "*quantserve.com*", "*hotjar.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*",
+]
+
+CHROME_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+
+def get_profile(name: str = "default", headless: bool = False,
+                timezone: str | None = None) -> BrowserProfile:
+    """
+    Named launch profile, optionally forced headless and pinned to a timezone.
+    """
+    try:
+        profile = PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile {name!r}, expected one of {tuple(PROFILES)}")
+    return profile._replace(headless=profile.headless or headless, timezone=timezone or profile.timezone)
+
+
+def url_is_blocked(url: str, patterns=BLOCKED_URL_PATTERNS) -> bool:
+    """
+    Same matching as Network.setBlockedURLs: "*" wildcards over the whole URL.
+    """
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+
+
+def chrome_options(profile: BrowserProfile) -> uc.ChromeOptions:
+    options = uc.ChromeOptions()
+    options.page_load_strategy = profile.page_load_strategy
+    if profile.name != "default":
+        for arg in CHROME_ARGS:
+            options.add_argument(arg)
+        width, height = profile.window_size
+        options.add_argument(f"--window-size={width},{height}")
+    if profile.block_resources:
+        # Images are also switched off in the renderer (no decoding at all)
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    return options
+
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """
+    Make Chrome refuse requests to the given URL patterns for this session.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def pin_timezone(driver, tzname: str):
+    """
+    Make the calendar come back in tzname: the site's timezone cookie (the
+    one HttpFetcher sends) and the zone Chrome reports to scripts.
+    """
+    driver.execute_cdp_cmd("Network.setCookie", {
+        "name": TIMEZONE_COOKIE, "value": timezone_cookie(tzname), "url": CALENDAR_URL,
+    })
+    driver.execute_cdp_cmd("Emulation.setTimezoneOverride", {"timezoneId": tzname})
+
+
+def count_commands(driver):
+    """
+    Count every WebDriver command the driver sends (the webdriver_calls
+    metric). Selenium routes all of them, element calls included, through
+    driver.execute, so wrapping that one method sees each round trip.
+    """
+    execute = driver.execute
+
+    def counted(driver_command, params=None):
+        metrics.inc("webdriver_calls")
+        return execute(driver_command, params)
+
+    driver.execute = counted
+    return driver
+
+
+def launch_chrome(profile: BrowserProfile):
+    """
+    Start undetected_chromedriver with the given profile.
+    """
+    driver = count_commands(uc.Chrome(options=chrome_options(profile), headless=profile.headless))
+    driver.set_window_size(*profile.window_size)
+    if profile.block_resources:
+        block_resources(driver)
+    if profile.timezone:
+        pin_timezone(driver, profile.timezone)
+    return driver
+
+
+def rss_supported() -> bool:
+    """
+    True when psutil is installed, i.e. chrome_rss() can measure anything.
+    """
+    return importlib.util.find_spec("psutil") is not None
+
+
+def chrome_rss(driver) -> int | None:
+    """
+    Resident memory (bytes) of the Chrome behind driver, renderers and
+    helpers included. None when psutil is not installed or the process is gone.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    pid = getattr(driver, "browser_pid", None)
+    if pid is None:
+        service = getattr(driver, "service", None)
+        pid = getattr(getattr(service, "process", None), "pid", None)
+    if pid is None:
+        return None
+    try:
+        root = psutil.Process(pid)
+        return sum(p.memory_info().rss for p in [root] + root.children(recursive=True))
+    except psutil.Error:
+        return None
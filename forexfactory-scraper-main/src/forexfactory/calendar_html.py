@@ -0,0 +1,154 @@
+# src/forexfactory/calendar_html.py
+
+import re
+import logging
+from datetime import datetime
+
+import pandas as pd
+from dateutil.tz import gettz
+from lxml import html as lxml_html
+
+from .csv_util import CSV_COLUMNS
+from .schema import ALL_DAY_TIME, TENTATIVE_TIME
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Only these impacts are kept (same filter as the Selenium path)
+ALLOWED_IMPACTS = ["High Impact Expected", "Medium Impact Expected"]
+
+ROW_XPATH = '//tr[contains(@class,"calendar__row")]'
+CELL_XPATH = './/td[contains(@class,"calendar__{}")]'
+VALUE_CELLS = ("time", "currency", "impact", "event", "actual", "forecast", "previous")
+
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})(am|pm)")
+# "Sun Jan 5", "SunJan 5", "Mon Dec 30"
+_DAY_BREAKER_RE = re.compile(
+    r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*(\d{1,2})\b",
+    re.IGNORECASE,
+)
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+
+def parse_day_breaker_text(text: str, fallback_date: datetime, tzname: str | None = None) -> datetime | None:
+    """
+    Turn a day-breaker label such as "Sun Jan 5" into a midnight datetime.
+    The label has no year: the candidate closest to fallback_date wins, which
+    handles pages spanning a new year. Returns None if the label is not a date.
+    """
+    m = _DAY_BREAKER_RE.search(text or "")
+    if not m:
+        return None
+    month = _MONTHS.index(m.group(1).lower()) + 1
+    day = int(m.group(2))
+    tz = gettz(tzname) if tzname else fallback_date.tzinfo
+
+    candidates = []
+    for year in (fallback_date.year - 1, fallback_date.year, fallback_date.year + 1):
+        try:
+            candidates.append(datetime(year, month, day, tzinfo=tz))
+        except ValueError:
+            # Feb 29 on a non-leap year, Apr 31, ...
+            continue
+    if not candidates:
+        return None
+    naive_fallback = fallback_date.replace(tzinfo=None)
+    return min(candidates, key=lambda d: abs(d.replace(tzinfo=None) - naive_fallback))
+
+
+def event_datetime(current_day: datetime, time_text: str) -> datetime:
+    """
+    Convert the calendar time cell ("2:30am", "All Day", ...) into a datetime on current_day.
+    "All Day" style cells are mapped to 23:59:59 and "Tentative" to midnight
+    (see normalize.normalize); unknown formats keep current_day as is.
+    """
+    event_dt = current_day
+    t = time_text.lower()
+
+    if "day" in t:
+        hour, minute, second = ALL_DAY_TIME
+        return event_dt.replace(hour=hour, minute=minute, second=second)
+    if "tentative" in t:
+        hour, minute, second = TENTATIVE_TIME
+        return event_dt.replace(hour=hour, minute=minute, second=second)
+
+    m = _TIME_RE.match(t)
+    if m:
+        hh = int(m.group(1))
+        mm = int(m.group(2))
+        ap = m.group(3)
+        if ap == "pm" and hh < 12:
+            hh += 12
+        if ap == "am" and hh == 12:
+            hh = 0
+        event_dt = event_dt.replace(hour=hh, minute=mm, second=0)
+    return event_dt
+
+
+def element_text(el) -> str:
+    """
+    Visible text of an lxml element, whitespace-collapsed like Selenium's .text.
+    """
+    return " ".join(el.text_content().split())
+
+
+def parse_calendar_html(page_source: str, the_date: datetime) -> pd.DataFrame:
+    """
+    Parse a calendar page snapshot (driver.page_source or raw HTTP body) offline.
+    Returns the same DataFrame schema as scraper.parse_calendar_day.
+
+    Rows are dated from the_date until a day-breaker row announces another day,
+    so ?range= and ?month= pages are attributed day by day.
+    """
+    if not page_source or not page_source.strip():
+        return pd.DataFrame(columns=CSV_COLUMNS)
+
+    tree = lxml_html.fromstring(page_source)
+    data_list = []
+    current_day = the_date
+
+    for row in tree.xpath(ROW_XPATH):
+        row_class = row.get("class") or ""
+        if "day-breaker" in row_class:
+            breaker_day = parse_day_breaker_text(element_text(row), current_day)
+            if breaker_day is not None:
+                current_day = breaker_day
+            continue
+        if "no-event" in row_class:
+            continue
+
+        cells = {}
+        for name in VALUE_CELLS:
+            found = row.xpath(CELL_XPATH.format(name))
+            if not found:
+                break
+            cells[name] = found[0]
+        else:
+            impact_spans = cells["impact"].xpath(".//span")
+            if impact_spans:
+                impact_text = impact_spans[0].get("title") or ""
+            else:
+                impact_text = element_text(cells["impact"])
+
+            if impact_text not in ALLOWED_IMPACTS:
+                continue
+
+            event_dt = event_datetime(current_day, element_text(cells["time"]))
+            data_list.append(
+                {
+                    "DateTime": event_dt.isoformat(),
+                    "Currency": element_text(cells["currency"]),
+                    "Impact": impact_text,
+                    "Event": element_text(cells["event"]),
+                    "Actual": element_text(cells["actual"]),
+                    "Forecast": element_text(cells["forecast"]),
+                    "Previous": element_text(cells["previous"]),
+                    "Detail": "",
+                }
+            )
+
+    return pd.DataFrame(data_list, columns=CSV_COLUMNS)
@@ -0,0 +1,175 @@
+# src/forexfactory/calendar_query.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from . import schema
+from .normalize import is_normalized, normalize
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = ["EventTime", "Currency", "Impact", "Event", "Actual", "Forecast", "Previous", "Surprise"]
+
+
+def _to_utc_ns(times) -> np.ndarray:
+    """
+    Timestamps (DatetimeIndex, Series, array, list; naive ones are taken as
+    UTC) -> int64 UTC nanoseconds.
+    """
+    index = pd.DatetimeIndex(times)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").as_unit("ns").asi8
+
+
+class CalendarIndex:
+    """
+    Calendar releases ordered for as-of lookups: rows sorted by UTC time,
+    and for each (Currency, Event) series the positions of its releases in
+    time order, so that one np.searchsorted attaches the latest or next
+    release to any number of timestamps.
+
+    Built once from the cache (any layout: CSV strings, typed, or the Arrow
+    export), with Actual/Forecast/Previous as the numbers and Surprise of
+    normalize.normalize (computed here if the frame is not normalized yet).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        if isinstance(df["DateTime"].dtype, pd.ArrowDtype):
+            df = df.assign(DateTime=df["DateTime"].astype("datetime64[ns, UTC]"))
+        if not is_normalized(df):
+            df = normalize(df)
+        stamps, _ = schema.split_datetimes(df["DateTime"])
+        valid = stamps.notna().to_numpy()
+        times = stamps.dt.tz_localize(None).to_numpy().astype("int64")
+        order = np.flatnonzero(valid)[np.argsort(times[valid], kind="mergesort")]
+
+        self.times = times[order]
+        self.currency = df["Currency"].astype(str).str.strip().to_numpy()[order]
+        self.event = df["Event"].astype(str).str.strip().to_numpy()[order]
+        self.impact = df["Impact"].astype(str).to_numpy()[order]
+
+        def numbers(col):
+            return df[col].to_numpy(dtype=float, na_value=np.nan)[order]
+
+        self.actual = numbers("ActualValue")
+        self.forecast = numbers("ForecastValue")
+        self.previous = numbers("PreviousValue")
+        self.surprise = numbers("Surprise")
+        # Results carry the labels as categoricals: taking codes is cheap
+        self._labels = {
+            "Currency": pd.Categorical(self.currency),
+            "Impact": pd.Categorical(self.impact),
+            "Event": pd.Categorical(self.event),
+        }
+
+        # Per-series time index: rows of each (Currency, Event) in time order
+        codes, uniques = pd.MultiIndex.from_arrays([self.currency, self.event]).factorize()
+        by_series = np.argsort(codes, kind="mergesort")
+        bounds = np.searchsorted(codes[by_series], np.arange(len(uniques) + 1))
+        self._series = {
+            key: by_series[bounds[i]:bounds[i + 1]]
+            for i, key in enumerate(uniques)
+        }
+        self._subsets: dict[tuple, np.ndarray] = {}
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "CalendarIndex":
+        return cls(df)
+
+    @classmethod
+    def from_arrow(cls, arrow_file: str) -> "CalendarIndex":
+        from .arrow_export import read_arrow
+        return cls(read_arrow(arrow_file))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def series_keys(self) -> list[tuple[str, str]]:
+        return list(self._series)
+
+    def rows(self, currency=None, event=None, impact=None) -> np.ndarray:
+        """
+        Positions of the matching releases, in time order. A single
+        (currency, event) series comes from the precomputed index; other
+        filters are computed once and kept.
+        """
+        if currency is not None and event is not None and impact is None \
+                and isinstance(currency, str) and isinstance(event, str):
+            return self._series.get((currency, event), np.empty(0, dtype=np.intp))
+        key = tuple(None if v is None else tuple(np.atleast_1d(v)) for v in (currency, event, impact))
+        rows = self._subsets.get(key)
+        if rows is None:
+            mask = np.ones(len(self.times), dtype=bool)
+            for values, column in zip(key, (self.currency, self.event, self.impact)):
+                if values is not None:
+                    mask &= np.isin(column, values)
+            rows = self._subsets[key] = np.flatnonzero(mask)
+        return rows
+
+    def asof(self, times, currency=None, event=None, impact=None, direction: str = "backward",
+             tolerance=None, allow_exact_matches: bool = True, columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        For each timestamp, the matching release at or before it
+        (direction="backward") or at or after it ("forward"), as one row of
+        RESULT_COLUMNS per timestamp (NaN / NaT where there is none, or when
+        it is further than `tolerance`). Several releases at the same time:
+        the last one backward, the first one forward. `columns` limits the
+        result to some of RESULT_COLUMNS.
+        """
+        if direction not in ("backward", "forward"):
+            raise ValueError(f"direction must be 'backward' or 'forward', not {direction!r}")
+        query = _to_utc_ns(times)
+        rows = self.rows(currency, event, impact)
+        series_times = self.times[rows]
+
+        if direction == "backward":
+            side = "right" if allow_exact_matches else "left"
+            pos = np.searchsorted(series_times, query, side=side) - 1
+            found = pos >= 0
+        else:
+            side = "left" if allow_exact_matches else "right"
+            pos = np.searchsorted(series_times, query, side=side)
+            found = pos < len(series_times)
+        hit = np.full(len(query), -1, dtype=np.intp)
+        hit[found] = rows[pos[found]]
+        if tolerance is not None:
+            far = np.abs(query[found] - self.times[hit[found]]) > pd.Timedelta(tolerance).value
+            hit[np.flatnonzero(found)[far]] = -1
+        return self._take(hit, index=times, columns=columns or RESULT_COLUMNS)
+
+    def latest(self, times, currency=None, event=None, impact=None, **kwargs) -> pd.DataFrame:
+        return self.asof(times, currency, event, impact, direction="backward", **kwargs)
+
+    def next(self, times, currency=None, event=None, impact=None, **kwargs) -> pd.DataFrame:
+        return self.asof(times, currency, event, impact, direction="forward", **kwargs)
+
+    def _take(self, hit: np.ndarray, index, columns: list[str]) -> pd.DataFrame:
+        """
+        Releases at positions `hit` (-1: none) as `columns`.
+        """
+        def take(values, fill):
+            return pd.api.extensions.take(values, hit, allow_fill=True, fill_value=fill)
+
+        numbers = {"Actual": self.actual, "Forecast": self.forecast,
+                   "Previous": self.previous, "Surprise": self.surprise}
+        index = index.index if isinstance(index, pd.Series) else index
+        out = pd.DataFrame(index=index if isinstance(index, pd.Index) else pd.RangeIndex(len(hit)))
+        for col in columns:
+            if col == "EventTime":
+                stamps = take(self.times, pd.NaT.value).view("datetime64[ns]")
+                out[col] = pd.DatetimeIndex(stamps).tz_localize("UTC")
+            elif col in self._labels:
+                out[col] = self._labels[col].take(hit, allow_fill=True)
+            elif col in numbers:
+                out[col] = take(numbers[col], np.nan)
+            else:
+                raise KeyError(f"Unknown column {col!r}, expected some of {RESULT_COLUMNS}")
+        return out
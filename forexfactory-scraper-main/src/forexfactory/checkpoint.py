@@ -0,0 +1,175 @@
+# src/forexfactory/checkpoint.py
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+from dateutil.tz import gettz
+
+from .atomic import atomic_write
+from .date_logic import CalendarPage
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+PROGRESS_VERSION = 1
+
+
+def progress_path(csv_file: str) -> str:
+    """
+    Path of the progress journal that goes with csv_file.
+    """
+    return csv_file + ".progress"
+
+
+class ProgressJournal:
+    """
+    Durable progress of one scrape run, next to the CSV:
+
+      - a checkpoint line: the run's arguments, its page plan, the pages
+        stored so far and the pages in flight at checkpoint time;
+      - then one line when a page starts and one fsync'd line once it is
+        stored, with the coverage manifest entries of its days.
+
+    checkpoint() (with every manifest save) folds the lines into a new
+    checkpoint, written atomically. The file is removed when the run
+    completes; after a crash, incremental.resume_incremental continues the
+    plan where it stopped without looking at the cache. A line torn by the crash is ignored.
+    Thread-safe: fetch workers report starts, the writer thread the rest.
+    """
+
+    def __init__(self, path: str, args: dict | None = None):
+        self.path = path
+        self.args = args or {}
+        self.pages: list[list[str]] = []
+        self.done: set[str] = set()
+        self.started: set[str] = set()
+        # Manifest entries of the pages stored since the last checkpoint
+        self.days: dict[str, dict] = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "ProgressJournal | None":
+        """
+        Progress left by an interrupted run, or None.
+        """
+        if not os.path.exists(path):
+            return None
+        journal = cls(path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().split("\n")
+            head = json.loads(lines[0])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable progress journal {path}, ignoring it: {e}")
+            return None
+        journal.args = head.get("args", {})
+        journal.pages = head.get("pages", [])
+        journal.done = set(head.get("done", []))
+        journal.started = set(head.get("in_flight", []))
+        # The last element follows the last newline: empty, or torn by the crash
+        for line in lines[1:-1]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "start" in record:
+                journal.started.add(record["start"])
+            elif "done" in record:
+                journal.done.add(record["done"])
+                journal.days.update(record.get("days", {}))
+        return journal
+
+    @property
+    def in_flight(self) -> list[str]:
+        return sorted(self.started - self.done)
+
+    def remaining_pages(self) -> list[CalendarPage]:
+        """
+        Pages of the plan not stored yet, dated in the run's timezone.
+        """
+        tz = gettz(self.args.get("tzname"))
+        return [
+            CalendarPage(datetime.fromisoformat(start).replace(tzinfo=tz),
+                         datetime.fromisoformat(end).replace(tzinfo=tz), param)
+            for param, start, end in self.pages
+            if param not in self.done
+        ]
+
+    def plan(self, pages: list[CalendarPage]):
+        """
+        Start recording a run over `pages` (kept if this journal was loaded).
+        """
+        if not self.pages:
+            self.pages = [
+                [page.param, page.start.strftime("%Y-%m-%d"), page.end.strftime("%Y-%m-%d")]
+                for page in pages
+            ]
+        self.checkpoint()
+
+    def _append(self, record: dict, durable: bool):
+        # Caller holds self._lock
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, sort_keys=True) + "\n")
+        self._file.flush()
+        if durable:
+            os.fsync(self._file.fileno())
+
+    def page_started(self, page: CalendarPage):
+        # Not fsync'd: reaches the disk with the next stored page
+        with self._lock:
+            self.started.add(page.param)
+            self._append({"start": page.param}, durable=False)
+
+    def page_done(self, page: CalendarPage, days: dict | None = None):
+        """
+        Call once the page's rows are in the store (and its days in the manifest).
+        """
+        with self._lock:
+            self.done.add(page.param)
+            self.days.update(days or {})
+            self._append({"done": page.param, "days": days or {}}, durable=True)
+
+    def checkpoint(self):
+        """
+        Atomic write of the whole progress as a single line: temp file in
+        the same directory, fsync, rename. The manifest must be saved first:
+        the day entries are not kept.
+        """
+        with self._lock:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        self._close_file()
+        head = {
+            "version": PROGRESS_VERSION,
+            "args": self.args,
+            "pages": self.pages,
+            "done": sorted(self.done),
+            "in_flight": self.in_flight,
+        }
+        atomic_write(self.path, lambda f: f.write(json.dumps(head, sort_keys=True) + "\n"))
+        self.started -= self.done
+        self.days = {}
+
+    def finish(self):
+        """
+        The run completed: nothing left to resume.
+        """
+        with self._lock:
+            self._close_file()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
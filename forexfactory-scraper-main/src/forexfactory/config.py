@@ -0,0 +1,131 @@
+# src/forexfactory/config.py
+
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime
+
+from .checkpoint import ProgressJournal
+from .coverage import CoverageManifest
+from .date_logic import CalendarPage
+from .detail_cache import DEFAULT_MAX_AGE_DAYS
+from .page_cache import PageCache
+from .throttle import AimdThrottle
+
+
+@dataclass
+class FetchOptions:
+    """
+    How pages are fetched.
+    """
+    # Pages fetched in parallel (one Chrome per worker)
+    workers: int = 1
+    # "html": one page_source snapshot parsed with lxml; "selenium": cell by cell
+    engine: str = "html"
+    # "http": pages downloaded without a browser (`fetcher`, HttpFetcher by
+    # default), Chrome only on a challenge or to click Details
+    backend: str = "browser"
+    fetcher: object = None
+    # One page per "day", "week" (?range=) or "month" (?month=)
+    granularity: str = "day"
+    # "default" or "lean" (eager load, images/fonts/ads/trackers blocked)
+    browser_profile: str = "default"
+    headless: bool = False
+    # Pre-warmed drivers taking over from a crashed or recycled one; a driver
+    # is recycled after `recycle_pages` pages or above `max_browser_rss_mb`
+    # MB (0 = no limit)
+    spare_drivers: int = 0
+    recycle_pages: int = 0
+    max_browser_rss_mb: float = 0
+    # Raw pages (without Details) read from here while fresh, archived after
+    # each download
+    page_cache: PageCache | None = None
+    # Adaptive pacing shared by all workers (pages and Detail clicks): at
+    # most `max_rate` req/s (None = no cap); `throttle` passes one already set
+    max_rate: float | None = None
+    throttle: AimdThrottle | None = None
+
+
+@dataclass
+class DetailOptions:
+    """
+    Details clicked open, and their cache.
+    """
+    scrape_details: bool = False
+    # Per-series cache (<csv>.details.json) reused for that many days
+    detail_max_age_days: float | None = DEFAULT_MAX_AGE_DAYS
+    # Write "ref:<id>" in the Detail column instead of the text
+    detail_refs: bool = False
+    # Only expand these rows (DetailIndex.key), for backfills
+    detail_keys: set | None = None
+
+
+@dataclass
+class StorageOptions:
+    """
+    Where the rows go.
+    """
+    # "csv", "parquet" (year/month partitions) or "sqlite", at store_path
+    store: str = "csv"
+    store_path: str | None = None
+    # "rewrite" after each page, or "journal": append-only, compacted every
+    # `compact_every` pages and at the end of the run
+    write_mode: str = "rewrite"
+    compact_every: int = 0
+    # End of run: rewrite the CSV too / export the cache to this Arrow IPC file
+    export_csv: bool = False
+    export_arrow: str | None = None
+
+
+@dataclass
+class MetricsOptions:
+    """
+    Extra instrumentation (timings and counters always go to metrics.current()).
+    """
+    # Run the page of this day under cProfile (<csv>.profile-YYYY-MM-DD.pstats)
+    profile_day: datetime | None = None
+
+
+@dataclass
+class ResumeOptions:
+    """
+    What to scrape within the range, and what tracks it across runs.
+    """
+    # Only these days (default: the whole range), or pages already planned
+    days: list[datetime] | None = None
+    pages: list[CalendarPage] | None = None
+    # Day coverage, updated for every stored page
+    manifest: CoverageManifest | None = None
+    # Progress journal an interrupted run resumes from
+    progress: ProgressJournal | None = None
+
+
+@dataclass
+class ScrapeConfig:
+    """
+    Options of scraper.scrape_range_pandas, one group per concern. Each
+    option keeps the name of the keyword it replaces, so flat keywords can
+    still be given (from_options).
+    """
+    fetch: FetchOptions = field(default_factory=FetchOptions)
+    details: DetailOptions = field(default_factory=DetailOptions)
+    storage: StorageOptions = field(default_factory=StorageOptions)
+    metrics: MetricsOptions = field(default_factory=MetricsOptions)
+    resume: ResumeOptions = field(default_factory=ResumeOptions)
+
+    @classmethod
+    def from_options(cls, config: "ScrapeConfig | None" = None, **options) -> "ScrapeConfig":
+        """
+        Copy of config (default: all defaults) with the flat options
+        (workers=4, store="sqlite", ...) set in their groups.
+        Raises TypeError on an unknown option.
+        """
+        config = config or cls()
+        updates = {}
+        for group in fields(cls):
+            value = getattr(config, group.name)
+            names = {f.name for f in fields(value)}
+            picked = {name: options.pop(name) for name in list(options) if name in names}
+            if picked:
+                updates[group.name] = replace(value, **picked)
+        if options:
+            raise TypeError(f"Unknown scrape option(s): {', '.join(sorted(options))}")
+        return replace(config, **updates)
@@ -0,0 +1,166 @@
+# src/forexfactory/coverage.py
+
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from .atomic import atomic_write
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# A day scraped this long after it ended is final even if some Actuals are
+# still blank (speeches, cancelled releases, ...).
+ACTUALS_GRACE_DAYS = 7
+
+
+def manifest_path(csv_file: str) -> str:
+    """
+    Path of the coverage manifest that goes with csv_file.
+    """
+    return csv_file + ".coverage.json"
+
+
+def _as_date(d) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return date.fromisoformat(str(d)[:10])
+
+
+def actuals_complete(df_day: pd.DataFrame) -> bool:
+    """
+    True when every data release of the day has its Actual. Rows with no
+    Forecast and no Previous either (speeches, meetings) never get one and
+    are not counted.
+    """
+    if df_day.empty:
+        return True
+
+    def filled(col):
+        return df_day[col].fillna("").astype(str).str.strip() != ""
+
+    is_release = filled("Forecast") | filled("Previous")
+    return bool((filled("Actual") | ~is_release).all())
+
+
+def details_complete(df_day: pd.DataFrame) -> bool:
+    if df_day.empty:
+        return True
+    return bool((df_day["Detail"].fillna("").astype(str).str.strip() != "").all())
+
+
+class CoverageManifest:
+    """
+    Per-day record of what the cache already holds: when the day was scraped,
+    its row count, and whether its Actuals (and Details) were all present.
+    Persisted as JSON next to the CSV; scrape_incremental uses it to fetch only
+    the days that are missing or not final yet.
+    """
+
+    def __init__(self, path: str, clock=None):
+        self.path = path
+        self.days: dict[str, dict] = {}
+        # Time source for scraped_at (overridable for reproducible runs)
+        self.clock = clock or (lambda: datetime.now().astimezone())
+
+    @classmethod
+    def load(cls, path: str, clock=None) -> "CoverageManifest":
+        manifest = cls(path, clock)
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                manifest.days = data.get("days", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable coverage manifest {path}, starting empty: {e}")
+        return manifest
+
+    def save(self):
+        """
+        Atomic write: temp file in the same directory, fsync, rename.
+        """
+        payload = {"version": MANIFEST_VERSION, "days": self.days}
+        atomic_write(self.path, lambda f: json.dump(payload, f, sort_keys=True))
+
+    def record_day(self, day, df_day: pd.DataFrame, scraped_at: datetime | None = None):
+        scraped_at = scraped_at or self.clock()
+        self.days[_as_date(day).isoformat()] = {
+            "scraped_at": scraped_at.isoformat(timespec="seconds"),
+            "rows": int(len(df_day)),
+            "actuals_complete": actuals_complete(df_day),
+            "details_complete": details_complete(df_day),
+        }
+
+    def record_page(self, start, end, df_page: pd.DataFrame, scraped_at: datetime | None = None):
+        """
+        Record every day of a scraped page, including days without any row.
+        """
+        scraped_at = scraped_at or self.clock()
+        by_day = df_page["DateTime"].str[:10] if not df_page.empty else pd.Series(dtype=str)
+        day = _as_date(start)
+        while day <= _as_date(end):
+            self.record_day(day, df_page[by_day == day.isoformat()] if not df_page.empty else df_page,
+                            scraped_at)
+            day += timedelta(days=1)
+
+    def bootstrap_from(self, existing_df: pd.DataFrame):
+        """
+        Seed a missing manifest from an existing cache: days that already have
+        rows count as scraped once, at an unknown time after they ended.
+        """
+        if existing_df.empty:
+            return
+        by_day = existing_df["DateTime"].astype(str).str[:10]
+        for day, df_day in existing_df.groupby(by_day, sort=True):
+            self.days.setdefault(day, {
+                "scraped_at": None,
+                "rows": int(len(df_day)),
+                "actuals_complete": actuals_complete(df_day),
+                "details_complete": details_complete(df_day),
+            })
+        logger.info(f"Coverage manifest seeded with {len(self.days)} days from the cache")
+
+    def needs_scrape(self, day, now: datetime, scrape_details: bool = False) -> bool:
+        """
+        A day is (re)scraped when it is missing, was not over when it was
+        scraped (today / future days), still has blank Actuals within the
+        grace period, or lacks Details that were asked for.
+        """
+        d = _as_date(day)
+        entry = self.days.get(d.isoformat())
+        if entry is None:
+            return True
+        if d >= _as_date(now):
+            return True
+        scraped_at = entry.get("scraped_at")
+        scraped_on = _as_date(scraped_at) if scraped_at else None
+        if scraped_on is not None and scraped_on <= d:
+            return True
+        if not entry.get("actuals_complete", False):
+            final = scraped_on is not None and scraped_on > d + timedelta(days=ACTUALS_GRACE_DAYS)
+            if not final:
+                return True
+        if scrape_details and not entry.get("details_complete", False):
+            return True
+        return False
+
+    def days_to_scrape(self, from_date: datetime, to_date: datetime, now: datetime,
+                       scrape_details: bool = False) -> list[datetime]:
+        days = []
+        current = from_date
+        while current <= to_date:
+            if self.needs_scrape(current, now, scrape_details):
+                days.append(current)
+            current += timedelta(days=1)
+        return days
@@ -1,12 +1,17 @@
 # src/forexfactory/csv_util.py
 
 import csv
+import io
 import os
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
 import logging
 
+from . import metrics, schema
+from .atomic import atomic_write
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
@@ -17,6 +22,10 @@ logger = logging.getLogger(__name__)
 # Define the CSV columns
 CSV_COLUMNS = ["DateTime", "Currency", "Impact", "Event", "Actual", "Forecast", "Previous", "Detail"]
 
+# Released or revised after a first scrape: a non-empty new value replaces
+# the stored one (a blank Actual filled in by a later pass, a revised Previous)
+VALUE_COLUMNS = ["Actual", "Forecast", "Previous"]
+
 def ensure_csv_header(csv_file):
     """
     Ensure that the CSV file exists with the proper header.
@@ -26,10 +35,17 @@ def ensure_csv_header(csv_file):
         df.to_csv(csv_file, index=False)
 
 
-def read_existing_data(csv_file):
+@metrics.timed("csv_read")
+def read_existing_data(csv_file, typed=False, tz=None):
     """
     Read the existing CSV data and return a DataFrame with the defined columns.
+    With typed=True, in the compact typed layout (see schema.to_typed).
     """
+    df = _read_csv_strings(csv_file)
+    return schema.to_typed(df, tz) if typed else df
+
+
+def _read_csv_strings(csv_file):
     if os.path.exists(csv_file):
         try:
             df = pd.read_csv(csv_file, dtype=str)
@@ -44,15 +60,211 @@ def read_existing_data(csv_file):
     else:
         return pd.DataFrame(columns=CSV_COLUMNS)
 
+@metrics.timed("csv_write")
+def _atomic_to_csv(df: pd.DataFrame, csv_file: str):
+    """
+    Write df to a temp file next to csv_file, fsync it, then rename it over
+    csv_file, so a crash never leaves a truncated CSV behind.
+    """
+    atomic_write(csv_file, lambda f: df.to_csv(f, index=False))
+
+
 def write_data_to_csv(df: pd.DataFrame, csv_file: str):
     """
-    Write final merged data to CSV, overwriting it.
+    Write final merged data to CSV, overwriting it atomically.
+    Typed frames are written back as the same strings.
+    """
+    # sort the data by DateTime (stable, so rows sharing a timestamp keep
+    # the calendar order and the output is deterministic)
+    df = df.sort_values(by="DateTime", ascending=True, kind="mergesort")
+    _atomic_to_csv(schema.to_strings(df[CSV_COLUMNS]), csv_file)
+
+
+def journal_path(csv_file: str) -> str:
+    """
+    Path of the append-only journal that goes with csv_file.
+    """
+    return csv_file + ".journal"
+
+
+@metrics.timed("journal_append")
+def append_to_journal(df: pd.DataFrame, journal_file: str):
+    """
+    Append rows to the journal in a single fsync'd write.
+    The header is written when the journal is created.
+    """
+    if df.empty:
+        return
+    write_header = not os.path.exists(journal_file) or os.path.getsize(journal_file) == 0
+    buf = io.StringIO()
+    schema.to_strings(df[CSV_COLUMNS]).to_csv(buf, index=False, header=write_header)
+    with open(journal_file, "a", encoding="utf-8", newline="") as f:
+        f.write(buf.getvalue())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_journal(journal_file: str) -> pd.DataFrame:
+    """
+    Read the journal rows. A last line torn by a crash mid-append is dropped.
     """
-    # sort the data by DateTime
-    df = df.sort_values(by="DateTime", ascending=True)
-    df.to_csv(csv_file, index=False)
+    if not os.path.exists(journal_file):
+        return pd.DataFrame(columns=CSV_COLUMNS)
+    with open(journal_file, encoding="utf-8", newline="") as f:
+        text = f.read()
+    # Every append ends with a newline: anything after the last one is torn
+    text = text[:text.rfind("\n") + 1]
+    if not text.strip():
+        return pd.DataFrame(columns=CSV_COLUMNS)
+    df = pd.read_csv(io.StringIO(text), dtype=str, on_bad_lines="skip")
+    for col in CSV_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    return df[CSV_COLUMNS]
+
+
+@metrics.timed("journal_compact")
+def compact_journal(csv_file: str, journal_file: str | None = None) -> pd.DataFrame:
+    """
+    Fold the journal into csv_file: merge, dedupe and sort, write the CSV
+    atomically, then drop the journal. Returns the compacted data.
+    """
+    journal_file = journal_file or journal_path(csv_file)
+    merged = merge_new_data(read_existing_data(csv_file), dedupe_keys(read_journal(journal_file)))
+    write_data_to_csv(merged, csv_file)
+    if os.path.exists(journal_file):
+        os.remove(journal_file)
+    return merged
+
+
+def row_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Merge key of each row, "<DateTime>_<Currency>_<Event>": two rows with
+    the same key are the same release. DateTime may be strings or typed.
+    """
+    return (
+        schema.datetime_keys(df).astype(str) + "_" +
+        df["Currency"].astype(str).str.strip() + "_" +
+        df["Event"].astype(str).str.strip()
+    )
 
 
+def dedupe_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep the first row per (DateTime, Currency, Event), with its Detail taken
+    from the first row that has one and its values from the last row that
+    has them - what successive merges would give. For batches gathered from
+    several sources (journal, replayed pages) before one merge_new_data.
+    """
+    if df.empty:
+        return df
+    keys = row_keys(df)
+    first = ~keys.duplicated(keep="first")
+    out = df[first].copy()
+    for col, keep in [("Detail", "first")] + [(col, "last") for col in VALUE_COLUMNS]:
+        values = clean_text(df[col])
+        kept = values_per_key(values, keys, values != "", keep)
+        out[col] = keys[first].map(kept).fillna(values[first]).values
+    return out
+
+
+def values_per_key(values: pd.Series, keys: pd.Series, mask: pd.Series, keep: str) -> pd.Series:
+    """
+    values[mask] indexed by key (from row_keys), one per key: the "first"
+    or "last" one. Map it over other rows' keys to carry values across.
+    """
+    per_key = pd.Series(values[mask].values, index=keys[mask].values)
+    return per_key[~per_key.index.duplicated(keep=keep)]
+
+
+@metrics.timed("diff")
+def changed_rows(existing_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rows of new_df that merge_new_data would add, whose Detail would fill an
+    empty one or whose values would replace the stored ones: exactly what has
+    to be journaled for this batch. The rows are returned in new_df's layout,
+    whatever the layout of existing_df.
+    """
+    if existing_df.empty or new_df.empty:
+        return new_df
+
+    batch = schema.conform(new_df, existing_df)
+    # Same candidate restriction as merge_new_data
+    existing_dt = schema.datetime_keys(existing_df)
+    candidates = existing_df.iloc[np.flatnonzero(existing_dt.isin(schema.datetime_keys(batch)).to_numpy())]
+    candidate_keys = row_keys(candidates)
+    first = ~candidate_keys.duplicated(keep="first")
+    new_keys = row_keys(batch)
+    known = new_keys.isin(candidate_keys)
+    changed = ~known
+    for col in ["Detail"] + VALUE_COLUMNS:
+        stored = pd.Series(clean_text(candidates[col]).values[first.to_numpy()],
+                           index=candidate_keys[first].values)
+        old = new_keys.map(stored).fillna("")
+        new = clean_text(batch[col])
+        if col == "Detail":
+            changed |= known & (old == "") & (new != "")
+        else:
+            changed |= known & (new != "") & (new != old)
+    return new_df[changed.to_numpy()]
+
+
+class CsvWriter:
+    """
+    Rewrites the whole CSV after every batch (atomic, sorted).
+    """
+
+    def __init__(self, csv_file: str):
+        self.csv_file = csv_file
+
+    def read(self) -> pd.DataFrame:
+        return read_existing_data(self.csv_file)
+
+    def write(self, merged_df: pd.DataFrame, delta_df: pd.DataFrame, batch_df: pd.DataFrame | None = None):
+        write_data_to_csv(merged_df, self.csv_file)
+
+    def close(self, merged_df: pd.DataFrame):
+        write_data_to_csv(merged_df, self.csv_file)
+
+
+class CsvJournalWriter:
+    """
+    Appends only new/changed rows of each batch to csv_file + ".journal" and
+    compacts the journal into the sorted CSV every `compact_every` batches
+    (0 = only at the end of the run). A journal left by an interrupted run
+    is merged in memory by read() and compacted with the new rows.
+    """
+
+    def __init__(self, csv_file: str, compact_every: int = 0):
+        self.csv_file = csv_file
+        self.journal_file = journal_path(csv_file)
+        self.compact_every = compact_every
+        self._batches = 0
+
+    def read(self) -> pd.DataFrame:
+        leftover = read_journal(self.journal_file)
+        if leftover.empty:
+            return read_existing_data(self.csv_file)
+        logger.info(f"Reading leftover journal {self.journal_file} ({len(leftover)} rows)")
+        return merge_new_data(read_existing_data(self.csv_file), dedupe_keys(leftover))
+
+    def write(self, merged_df: pd.DataFrame, delta_df: pd.DataFrame, batch_df: pd.DataFrame | None = None):
+        append_to_journal(delta_df, self.journal_file)
+        self._batches += 1
+        if self.compact_every and self._batches % self.compact_every == 0:
+            self._compact(merged_df)
+
+    def close(self, merged_df: pd.DataFrame):
+        self._compact(merged_df)
+
+    def _compact(self, merged_df: pd.DataFrame):
+        # merged_df already holds CSV + journal, deduped by merge_new_data
+        write_data_to_csv(merged_df, self.csv_file)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+
+
+@metrics.timed("merge")
 def merge_new_data(existing_df, new_df):
     """
     Merge new data into the existing DataFrame.
@@ -62,49 +274,99 @@ def merge_new_data(existing_df, new_df):
       - If the record exists:
           - If the existing record's 'Detail' field is empty and the new record contains details,
             update the 'Detail' field.
+          - A non-empty Actual, Forecast or Previous replaces the existing one
+            (released or revised since the record was scraped).
           - Otherwise, leave the record unchanged.
 
     A unique key is generated by concatenating DateTime, Currency, and Event.
+    The lookup is a vectorized hash join on that key (no per-row Python loop),
+    restricted to the existing rows sharing a DateTime with new_df.
+
+    new_df is brought to the layout of existing_df (CSV strings or the typed
+    layout of schema.to_typed), which the result keeps. Columns beyond
+    CSV_COLUMNS (normalize.NORMALIZED_COLUMNS) are kept when both frames have
+    them, and recomputed for the rows whose values changed.
     """
+    new_df = schema.conform(new_df, existing_df)
     if existing_df.empty:
         return new_df
 
-    def add_unique_key(df):
-        df = df.copy()
-        df['unique_key'] = (
-            df["DateTime"].astype(str).str.strip() + "_" +
-            df["Currency"].astype(str).str.strip() + "_" +
-            df["Event"].astype(str).str.strip()
-        )
-        return df
+    new_keys = row_keys(new_df)
+    # Only rows with a matching DateTime can match the full key: build keys
+    # for those candidates instead of the whole cache.
+    existing_dt = schema.datetime_keys(existing_df)
+    new_dt = schema.datetime_keys(new_df)
+    candidates = np.flatnonzero(existing_dt.isin(new_dt).to_numpy())
+    candidate_keys = row_keys(existing_df.iloc[candidates])
+    known = new_keys.isin(candidate_keys)
 
-    existing_df = add_unique_key(existing_df)
-    new_df = add_unique_key(new_df)
-
-    # Use the unique key as the index for easy lookup
-    existing_df.set_index('unique_key', inplace=True)
-    new_df.set_index('unique_key', inplace=True)
-
-    # Accumulate new rows that are not present in existing_df
-    new_rows_list = []
-    for key, new_row in new_df.iterrows():
-        if key in existing_df.index:
-            # Retrieve the 'Detail' field for comparison
-            existing_detail = str(existing_df.at[key, "Detail"]).strip() if pd.notna(existing_df.at[key, "Detail"]) else ""
-            new_detail = str(new_row["Detail"]).strip() if pd.notna(new_row["Detail"]) else ""
-            # Update the 'Detail' field only if it is missing in the existing record
-            # and if the new row contains detail data.
-            if not existing_detail and new_detail:
-                existing_df.at[key, "Detail"] = new_detail
-        else:
-            new_rows_list.append(new_row)
+    # (column, candidates to update, new value per candidate): the first
+    # non-empty new Detail fills an empty one, the last non-empty value
+    # replaces a different one
+    # Plain Python over the batch and its candidates: a few dozen rows,
+    # where per-column pandas calls cost more than the work itself
+    updates = []
+    known_keys = new_keys[known].tolist()
+    cand_keys = candidate_keys.tolist()
+    for col, keep in [("Detail", "first")] + [(col, "last") for col in VALUE_COLUMNS]:
+        per_key = {}
+        for key, value in zip(known_keys, _text_list(new_df[col][known])):
+            if value and (keep == "last" or key not in per_key):
+                per_key[key] = value
+        if not per_key:
+            continue
+        current = _text_list(existing_df[col].iloc[candidates])
+        values = [per_key.get(key) for key in cand_keys]
+        to_set = np.array([
+            value is not None and (old == "" if col == "Detail" else value != old)
+            for value, old in zip(values, current)
+        ], dtype=bool)
+        if to_set.any():
+            updates.append((col, to_set, np.array(values, dtype=object)))
+
+    merged_df = existing_df
+    if updates:
+        merged_df = existing_df.copy()
+        for col, to_set, values in updates:
+            merged_df.iloc[candidates[to_set], merged_df.columns.get_loc(col)] = values[to_set]
+        revised = [to_set for col, to_set, _ in updates if col in VALUE_COLUMNS]
+        if revised:
+            _renormalize(merged_df, candidates[np.logical_or.reduce(revised)])
 
-    if new_rows_list:
-        new_rows_df = pd.DataFrame(new_rows_list)
-        # Concatenate new rows with the existing DataFrame
-        existing_df = pd.concat([existing_df, new_rows_df])
+    if not known.all():
+        merged_df = schema.concat([merged_df, new_df[~known]])
 
     # Reset the index and ensure the DataFrame has the original column order
-    merged_df = existing_df.reset_index(drop=True)
-    merged_df = merged_df[CSV_COLUMNS]
+    merged_df = merged_df.reset_index(drop=True)
+    extra = [col for col in existing_df.columns if col not in CSV_COLUMNS and col in new_df.columns]
+    merged_df = merged_df[CSV_COLUMNS + extra]
     return merged_df
+
+
+def _renormalize(df: pd.DataFrame, rows: np.ndarray):
+    """
+    Recompute in place the normalized columns df has, for the given positions.
+    """
+    # normalize imports calendar_html, which imports this module
+    from .normalize import NORMALIZED_COLUMNS, normalize
+    columns = [col for col in NORMALIZED_COLUMNS if col in df.columns]
+    if not columns:
+        return
+    fresh = normalize(df.iloc[rows][CSV_COLUMNS])
+    for col in columns:
+        df.iloc[rows, df.columns.get_loc(col)] = fresh[col].to_numpy()
+
+
+def _text_list(values: pd.Series) -> list[str]:
+    """
+    Same as clean_text, as a list (for small batches).
+    """
+    return ["" if pd.isna(v) else str(v).strip() for v in values.to_numpy(dtype=object)]
+
+
+def clean_text(values: pd.Series) -> pd.Series:
+    """
+    Text values stripped, with NaN as "" (how cells are compared when
+    merging: a blank cell is "" whatever the file or store it came from).
+    """
+    return values.fillna("").astype(str).str.strip()
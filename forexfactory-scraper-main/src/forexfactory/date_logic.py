@@ -1,6 +1,8 @@
 # src/forexfactory/date_logic.py
 
-from datetime import datetime
+import calendar
+from collections import namedtuple
+from datetime import datetime, timedelta
 
 def build_url_for_partial_range(start_dt: datetime, end_dt: datetime) -> str:
     """
@@ -18,3 +20,62 @@ def build_url_for_full_month(year: int, month: int) -> str:
     m_str = dt.strftime('%b').lower()
     y_str = dt.strftime('%Y')
     return "month=" + m_str + "." + y_str
+
+CALENDAR_URL = "https://www.forexfactory.com/calendar"
+
+def build_url_for_day(d: datetime) -> str:
+    """
+    Builds a param like: ?day=jan05.2025
+    """
+    return "day=" + d.strftime("%b%d.%Y").lower()
+
+def calendar_url(param: str, base_url: str = CALENDAR_URL) -> str:
+    """
+    Full calendar URL for a param built by one of the helpers above.
+    """
+    return base_url + "?" + param
+
+# One calendar page to load: the days it covers (inclusive) and its URL param
+CalendarPage = namedtuple("CalendarPage", ["start", "end", "param"])
+
+GRANULARITIES = ("day", "week", "month")
+
+def iter_calendar_pages(from_date: datetime, to_date: datetime, granularity: str = "day"):
+    """
+    Split [from_date, to_date] into calendar pages:
+      - day:   one ?day= page per day
+      - week:  ?range= pages of up to 7 days
+      - month: ?month= for whole months, ?range= for the partial months at both ends
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    current = from_date
+    while current <= to_date:
+        if granularity == "day":
+            end = current
+            param = build_url_for_day(current)
+        elif granularity == "week":
+            end = min(current + timedelta(days=6), to_date)
+            param = build_url_for_partial_range(current, end)
+        else:
+            last_day = calendar.monthrange(current.year, current.month)[1]
+            end = min(current.replace(day=last_day), to_date)
+            if current.day == 1 and end.day == last_day:
+                param = build_url_for_full_month(current.year, current.month)
+            else:
+                param = build_url_for_partial_range(current, end)
+        yield CalendarPage(current, end, param)
+        current = end + timedelta(days=1)
+
+def contiguous_runs(days):
+    """
+    Group sorted days into (first, last) runs of consecutive days.
+    """
+    runs = []
+    for d in days:
+        if runs and (d - runs[-1][1]).days == 1:
+            runs[-1][1] = d
+        else:
+            runs.append([d, d])
+    return [(first, last) for first, last in runs]
@@ -0,0 +1,192 @@
+# src/forexfactory/detail_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from .atomic import atomic_write
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# 2: series entries no longer hold OCCURRENCE_SPECS (version 1 entries are dropped)
+DETAIL_CACHE_VERSION = 2
+
+# Specs of a release series (Source, Measures, Usual Effect, ...) rarely
+# change; after this many days they are fetched again.
+DEFAULT_MAX_AGE_DAYS = 30
+
+REF_PREFIX = "ref:"
+
+# Specs that belong to one release rather than to its series: kept in the
+# row's own Detail, never reused for another date from the series cache
+OCCURRENCE_SPECS = ("Next Release",)
+
+
+def detail_cache_path(csv_file: str) -> str:
+    """
+    Path of the detail cache that goes with csv_file.
+    """
+    return csv_file + ".details.json"
+
+
+def text_id(text: str) -> str:
+    """
+    Content id of a Detail string (same text -> same id).
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def series_specs(detail_data: dict) -> dict:
+    """
+    The specs of parse_detail_table() that hold for the whole release series.
+    """
+    return {name: desc for name, desc in detail_data.items() if name.strip() not in OCCURRENCE_SPECS}
+
+
+def has_refs(df: pd.DataFrame) -> pd.Series:
+    """
+    Rows whose Detail is a "ref:<id>" (written with --detail-refs).
+    """
+    return df["Detail"].fillna("").astype(str).str.startswith(REF_PREFIX)
+
+
+def resolve_refs(df: pd.DataFrame, csv_file: str, cache: "DetailCache | None" = None) -> pd.DataFrame:
+    """
+    df with its referenced Details expanded from the detail cache of
+    csv_file (or `cache`); df itself when it has none.
+    """
+    if df.empty or not has_refs(df).any():
+        return df
+    if cache is None:
+        cache = DetailCache.load(detail_cache_path(csv_file), max_age_days=None)
+    return cache.resolve_details(df)
+
+
+class DetailCache:
+    """
+    Detail strings per release series, keyed by (Currency, Event) rather than
+    by occurrence, so a series' specs are fetched once instead of once per
+    date. Texts are stored once by content id; series entries point to them.
+
+    With store_refs=True, value() returns "ref:<id>" to put in the Detail
+    column instead of the full text; resolve()/resolve_details() expand it
+    (storage.read_cache and the Arrow export do). Save the cache before
+    persisting rows that reference a new text (see `dirty`).
+
+    Persisted as JSON next to the CSV. get/put are safe to call from the
+    scraping threads.
+    """
+
+    def __init__(self, path: str, max_age_days: float | None = DEFAULT_MAX_AGE_DAYS,
+                 store_refs: bool = False, clock=None):
+        self.path = path
+        self.max_age = timedelta(days=max_age_days) if max_age_days is not None else None
+        self.store_refs = store_refs
+        self.clock = clock or (lambda: datetime.now().astimezone())
+        self.texts: dict[str, str] = {}
+        self.series: dict[str, dict] = {}
+        # Texts added since the last save()
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, max_age_days: float | None = DEFAULT_MAX_AGE_DAYS,
+             store_refs: bool = False, clock=None) -> "DetailCache":
+        cache = cls(path, max_age_days, store_refs, clock)
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                cache.texts = data.get("texts", {})
+                if data.get("version", 1) >= 2:
+                    cache.series = data.get("series", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable detail cache {path}, starting empty: {e}")
+        return cache
+
+    def save(self):
+        """
+        Atomic write: temp file in the same directory, fsync, rename.
+        """
+        with self._lock:
+            payload = {"version": DETAIL_CACHE_VERSION, "texts": dict(self.texts),
+                       "series": dict(self.series)}
+            self.dirty = False
+        atomic_write(self.path, lambda f: json.dump(payload, f, sort_keys=True))
+
+    @staticmethod
+    def key(currency: str, event: str) -> str:
+        return f"{str(currency).strip()}|{str(event).strip()}"
+
+    def get(self, currency: str, event: str) -> str:
+        """
+        Detail text of the series, or "" if unknown or older than max_age.
+        """
+        entry = self.series.get(self.key(currency, event))
+        if entry is None:
+            return ""
+        if self.max_age is not None:
+            fetched_at = datetime.fromisoformat(entry["fetched_at"])
+            if self.clock() - fetched_at > self.max_age:
+                return ""
+        return self.texts.get(entry["ref"], "")
+
+    def put(self, currency: str, event: str, text: str) -> str:
+        """
+        Store a freshly fetched Detail for the series (see series_specs).
+        Returns its content id.
+        """
+        ref = text_id(text)
+        with self._lock:
+            self.dirty = self.dirty or ref not in self.texts
+            self.texts[ref] = text
+            self.series[self.key(currency, event)] = {
+                "ref": ref,
+                "fetched_at": self.clock().isoformat(timespec="seconds"),
+            }
+        return ref
+
+    def value(self, text: str) -> str:
+        """
+        What goes into the Detail column for text: the text itself, or its
+        reference when store_refs is set.
+        """
+        if not text or not self.store_refs:
+            return text
+        ref = text_id(text)
+        with self._lock:
+            if ref not in self.texts:
+                self.texts[ref] = text
+                self.dirty = True
+        return REF_PREFIX + ref
+
+    def resolve(self, detail) -> str:
+        """
+        Expand a "ref:<id>" Detail; other values are returned unchanged.
+        """
+        if isinstance(detail, str) and detail.startswith(REF_PREFIX):
+            return self.texts.get(detail[len(REF_PREFIX):], "")
+        return detail
+
+    def resolve_details(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Copy of df with every referenced Detail expanded to its text.
+        """
+        refs = has_refs(df).to_numpy()
+        df = df.copy()
+        col = df.columns.get_loc("Detail")
+        df.iloc[refs, col] = df["Detail"][refs].map(self.resolve).to_numpy()
+        return df
+
+    def __len__(self) -> int:
+        return len(self.series)
@@ -0,0 +1,78 @@
+# src/forexfactory/detail_index.py
+
+import logging
+
+import pandas as pd
+
+from .schema import to_strings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+class DetailIndex:
+    """
+    Hashed (DateTime, Currency, Event) -> Detail lookup over the cache.
+
+    Built once per run from the cached DataFrame, then kept up to date with
+    update() as scraped batches are merged. Follows merge_new_data: keys are
+    compared stripped and a known Detail is never overwritten.
+
+    Lookups and updates are single dict operations, so one index can be read
+    by scraping threads while the merge thread updates it.
+    """
+
+    def __init__(self):
+        self._details: dict[tuple[str, str, str], str] = {}
+
+    @staticmethod
+    def key(date_time: str, currency: str, event: str) -> tuple[str, str, str]:
+        return (str(date_time).strip(), str(currency).strip(), str(event).strip())
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame | None) -> "DetailIndex":
+        index = cls()
+        if df is not None:
+            index.update(df)
+        return index
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Index the non-empty Details of df. Returns the number of keys added.
+        """
+        if df is None or df.empty:
+            return 0
+        df = to_strings(df)
+        detail = df["Detail"].fillna("").astype(str).str.strip()
+        with_detail = detail != ""
+        if not with_detail.any():
+            return 0
+        rows = df[with_detail]
+        added = 0
+        for date_time, currency, event, text in zip(
+            rows["DateTime"].astype(str).str.strip(),
+            rows["Currency"].astype(str).str.strip(),
+            rows["Event"].astype(str).str.strip(),
+            detail[with_detail],
+        ):
+            key = (date_time, currency, event)
+            if key not in self._details:
+                self._details[key] = text
+                added += 1
+        return added
+
+    def get(self, date_time: str, currency: str, event: str) -> str:
+        """
+        Cached Detail for the row, or "" if there is none.
+        """
+        return self._details.get(self.key(date_time, currency, event), "")
+
+    def __contains__(self, key) -> bool:
+        return self.key(*key) in self._details
+
+    def __len__(self) -> int:
+        return len(self._details)
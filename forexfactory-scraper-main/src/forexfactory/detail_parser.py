@@ -7,6 +7,8 @@ from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from . import metrics
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
@@ -16,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
 
+@metrics.timed("detail_table")
 def parse_detail_table(driver):
     """
     Parses the detail table when detail row is expanded.
@@ -49,6 +52,7 @@ def parse_detail_table(driver):
         except TimeoutException as e:
             logger.error("Timeout in parse_detail_table: %s", e, exc_info=True)
             if attempt < MAX_RETRIES - 1:
+                metrics.inc("detail_table_retries")
                 logger.info("Retrying parse_detail_table...")
             else:
                 logger.error("Max retries reached.")
@@ -0,0 +1,110 @@
+# src/forexfactory/fetcher.py
+
+import logging
+from urllib.parse import quote
+
+import urllib3
+from urllib3.util.retry import Retry
+
+from .date_logic import CALENDAR_URL, calendar_url
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# Forex Factory shows the calendar in the zone named by this cookie (the
+# timezone setting of the site), its default zone without it
+TIMEZONE_COOKIE = "fftimezone"
+
+# Status codes used by bot protections (Cloudflare & co.) instead of the page
+CHALLENGE_STATUSES = (403, 429, 503)
+CHALLENGE_MARKERS = ("cf-chl", "challenge-platform", "Just a moment...")
+
+
+def timezone_cookie(tzname: str) -> str:
+    """
+    Value of TIMEZONE_COOKIE for an IANA zone name ("Europe/Paris").
+    """
+    return quote(tzname, safe="")
+
+
+class FetchError(Exception):
+    """The calendar page could not be downloaded."""
+
+
+class ChallengeError(FetchError):
+    """The server answered with a bot check instead of the calendar."""
+
+
+def is_challenge_page(status: int, body: str) -> bool:
+    """
+    True when the response is not a usable calendar page: a bot-protection
+    status or marker, or a 200 page without the calendar table.
+    """
+    if status in CHALLENGE_STATUSES:
+        return True
+    if any(marker in body for marker in CHALLENGE_MARKERS):
+        return True
+    return "calendar__table" not in body
+
+
+class HttpFetcher:
+    """
+    Browserless fetch backend: downloads calendar pages over pooled
+    keep-alive HTTP connections. Thread-safe, one instance can serve all workers.
+
+    fetch() takes a calendar param as built by date_logic ("day=jan05.2025",
+    "month=jan.2025", ...) and returns the page HTML. With `tzname` set, the
+    pages are asked for in that zone (TIMEZONE_COOKIE), like the browser
+    profile does.
+    """
+
+    def __init__(self, base_url: str = CALENDAR_URL, pool_size: int = 4,
+                 timeout: float = 30.0, headers: dict | None = None, tzname: str | None = None):
+        self.base_url = base_url
+        self.tzname = tzname
+        self._headers = headers or DEFAULT_HEADERS
+        self._pool = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=pool_size,
+            block=True,
+            headers=self._headers,
+            timeout=urllib3.Timeout(connect=10.0, read=timeout),
+            retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 504),
+                          raise_on_status=False),
+        )
+
+    def fetch(self, param: str) -> str:
+        url = calendar_url(param, self.base_url)
+        logger.info(f"Fetching URL: {url}")
+        headers = None
+        if self.tzname:
+            headers = {**self._headers, "Cookie": f"{TIMEZONE_COOKIE}={timezone_cookie(self.tzname)}"}
+        try:
+            resp = self._pool.request("GET", url, headers=headers)
+        except urllib3.exceptions.HTTPError as e:
+            raise FetchError(f"{url}: {e}") from e
+
+        body = resp.data.decode("utf-8", errors="replace")
+        if resp.status >= 400 and resp.status not in CHALLENGE_STATUSES:
+            raise FetchError(f"{url}: HTTP {resp.status}")
+        if is_challenge_page(resp.status, body):
+            raise ChallengeError(f"{url}: challenged (HTTP {resp.status})")
+        return body
+
+    def close(self):
+        self._pool.clear()
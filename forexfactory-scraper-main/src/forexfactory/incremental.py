@@ -6,8 +6,14 @@ import pandas as pd
 from datetime import datetime, timedelta
 from dateutil.tz import gettz
 
+from .checkpoint import ProgressJournal, progress_path
+from .config import ScrapeConfig
+from .coverage import CoverageManifest, manifest_path
+from .detail_cache import DEFAULT_MAX_AGE_DAYS
+from .page_cache import PageCache
 from .csv_util import ensure_csv_header, read_existing_data, write_data_to_csv, merge_new_data
 from .scraper import scrape_range_pandas
+from .storage import read_cache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,11 +22,119 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def scrape_incremental(from_date, to_date, output_csv, tzname="Asia/Tehran", scrape_details=False):
+def scrape_incremental(from_date, to_date, output_csv, tzname="Asia/Tehran", scrape_details=False, workers=1,
+                       engine="html", backend="browser", granularity="day", write_mode="rewrite",
+                       compact_every=0, now=None, store="csv", store_path=None, export_csv=False,
+                       detail_max_age_days=DEFAULT_MAX_AGE_DAYS, detail_refs=False,
+                       browser_profile="default", headless=False, spare_drivers=0, recycle_pages=0,
+                       max_browser_rss_mb=0, page_cache_path=None, profile_day=None,
+                       export_arrow=None, max_rate=None):
     """
-    Example: day-by-day approach but we only re-scrape if day is missing or incomplete.
-    For simplicity, let's re-scrape entire range. Then we can add logic if needed.
+    Day-by-day approach where we only re-scrape days that are missing or incomplete.
+
+    Coverage is tracked in <output_csv>.coverage.json (see coverage.CoverageManifest).
+    `now` fixes the reference time (defaults to the current time in tzname).
+    A day is fetched again when it is missing, was not over yet when last scraped,
+    still had blank Actuals, or lacks Details when scrape_details is set.
+    With store="parquet" the rows go to the partitioned store at store_path.
+    With page_cache_path, raw pages are read from / archived in a PageCache.
+    With profile_day, the page covering that day is run under cProfile.
+    With export_arrow, the whole cache is exported there as an Arrow IPC file
+    at the end, even when no day needed scraping.
+    max_rate caps the adaptive request rate (see throttle.AimdThrottle).
+
+    Progress is journaled in <output_csv>.progress (checkpoint.ProgressJournal)
+    so that resume_incremental can continue the run if it is interrupted. A
+    journal left by an interrupted run is folded into the manifest first.
+    """
+    clock = (lambda: now) if now is not None else None
+    now = now or datetime.now(gettz(tzname))
+    manifest = CoverageManifest.load(manifest_path(output_csv), clock=clock)
+    leftover = ProgressJournal.load(progress_path(output_csv))
+    if leftover is not None:
+        _recover(manifest, leftover)
+    if not manifest.days and (store != "csv" or os.path.exists(output_csv)):
+        # First incremental run on an existing cache
+        manifest.bootstrap_from(read_cache(output_csv, store, store_path))
+
+    days = manifest.days_to_scrape(from_date, to_date, now, scrape_details=scrape_details)
+    total = (to_date - from_date).days + 1
+    logger.info(f"{len(days)}/{total} days need scraping ({total - len(days)} already complete)")
+    if not days:
+        manifest.save()
+        if leftover is not None:
+            leftover.finish()
+        if export_arrow:
+            from .arrow_export import write_data_to_arrow
+            write_data_to_arrow(read_cache(output_csv, store, store_path), export_arrow)
+        return
+
+    args = dict(
+        start=from_date.strftime("%Y-%m-%d"), end=to_date.strftime("%Y-%m-%d"), tzname=tzname,
+        scrape_details=scrape_details, workers=workers, engine=engine, backend=backend,
+        granularity=granularity, write_mode=write_mode, compact_every=compact_every, store=store,
+        store_path=store_path, export_csv=export_csv, detail_max_age_days=detail_max_age_days,
+        detail_refs=detail_refs, browser_profile=browser_profile, headless=headless,
+        spare_drivers=spare_drivers, recycle_pages=recycle_pages, max_browser_rss_mb=max_browser_rss_mb,
+        page_cache_path=page_cache_path, export_arrow=export_arrow, max_rate=max_rate,
+    )
+    progress = ProgressJournal(progress_path(output_csv), args)
+    _run(output_csv, args, manifest, progress, days=days, profile_day=profile_day)
+
+
+def resume_incremental(output_csv, workers=None) -> bool:
+    """
+    Continue the interrupted run recorded in <output_csv>.progress with its
+    own arguments: only the pages of its plan that were not stored yet are
+    fetched (pages in flight at the crash included), and the cache is not
+    read to find them. `workers` overrides the recorded worker count.
+    Returns False when there is no run to resume.
     """
-    # You can implement a logic that checks existing_df if days are complete or not.
-    # For now, let's just call scrape_range_pandas:
-    scrape_range_pandas(from_date, to_date, output_csv, tzname=tzname, scrape_details=scrape_details)
+    progress = ProgressJournal.load(progress_path(output_csv))
+    if progress is None or not progress.pages:
+        return False
+    args = progress.args
+    if workers is not None:
+        args["workers"] = workers
+    manifest = CoverageManifest.load(manifest_path(output_csv))
+    _recover(manifest, progress)
+
+    pages = progress.remaining_pages()
+    logger.info(
+        f"Resuming {args['start']} -> {args['end']}: {len(progress.done)}/{len(progress.pages)} pages "
+        f"already stored, {len(pages)} to go ({len(progress.in_flight)} were in flight)"
+    )
+    if not pages:
+        progress.finish()
+        return True
+    _run(output_csv, args, manifest, progress, pages=pages)
+    return True
+
+
+def _recover(manifest, progress):
+    """
+    Pages stored since the interrupted run's last checkpoint: their days go
+    into the manifest (saved before the progress journal is rewritten).
+    """
+    if progress.days:
+        logger.info(f"Recovering {len(progress.days)} days stored by an interrupted run")
+        manifest.days.update(progress.days)
+        manifest.save()
+
+
+def _run(output_csv, args, manifest, progress, days=None, pages=None, profile_day=None):
+    run_args = dict(args)
+    tzname = run_args.pop("tzname")
+    tz = gettz(tzname)
+    from_date = datetime.fromisoformat(run_args.pop("start")).replace(tzinfo=tz)
+    to_date = datetime.fromisoformat(run_args.pop("end")).replace(tzinfo=tz)
+    page_cache_path = run_args.pop("page_cache_path")
+    page_cache = PageCache(page_cache_path) if page_cache_path else None
+    # The journaled arguments are the flat option names
+    config = ScrapeConfig.from_options(**run_args, page_cache=page_cache, profile_day=profile_day,
+                                       days=days, pages=pages, manifest=manifest, progress=progress)
+    try:
+        scrape_range_pandas(from_date, to_date, output_csv, tzname, config)
+    finally:
+        if page_cache is not None:
+            page_cache.close()
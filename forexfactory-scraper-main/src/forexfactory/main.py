@@ -2,12 +2,21 @@
 
 import sys
 import os
+import shutil
 import logging
 import argparse
 from datetime import datetime
 from dateutil.tz import gettz
 
-from .incremental import scrape_incremental
+from . import metrics
+from .browser import PROFILES
+from .checkpoint import progress_path
+from .coverage import manifest_path
+from .detail_cache import DEFAULT_MAX_AGE_DAYS
+from .page_cache import page_cache_path
+from .csv_util import journal_path
+from .incremental import resume_incremental, scrape_incremental
+from .storage import STORES, arrow_path, default_store_path
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,32 +28,134 @@ logger = logging.getLogger(__name__)
 
 def main():
     parser = argparse.ArgumentParser(description="Forex Factory Scraper")
-    parser.add_argument('--start', required=True)
-    parser.add_argument('--end', required=True)
+    parser.add_argument('--start')
+    parser.add_argument('--end')
     parser.add_argument('--csv', type=str, default="forex_factory_cache.csv")
-    parser.add_argument('--tz', type=str, default="Asia/Tehran")
+    parser.add_argument('--tz', type=str, default="Asia/Tehran",
+                        help="Timezone the calendar is scraped in (set on the site for both backends)")
     parser.add_argument('--details', action='store_true')
+    parser.add_argument('--detail-max-age', type=float, default=DEFAULT_MAX_AGE_DAYS,
+                        help="With --details, reuse a release series' cached specs for N days before clicking again")
+    parser.add_argument('--detail-refs', action='store_true',
+                        help="With --details, store 'ref:<id>' in the Detail column; texts live in <csv>.details.json")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of Chrome instances scraping days in parallel (default: 1)")
+    parser.add_argument('--browser-profile', choices=tuple(PROFILES), default="default",
+                        help="Chrome launch profile: default, or lean (eager load, images/fonts/ads/trackers blocked)")
+    parser.add_argument('--headless', action='store_true', help="Run Chrome without a window")
+    parser.add_argument('--spare-drivers', type=int, default=0,
+                        help="Chrome instances kept warm to replace a crashed or recycled one instantly")
+    parser.add_argument('--recycle-after', type=int, default=0,
+                        help="Replace a Chrome instance after N pages (0 = never)")
+    parser.add_argument('--max-browser-mb', type=float, default=0,
+                        help="Replace a Chrome instance whose memory exceeds N MB (needs psutil, 0 = no limit)")
+    parser.add_argument('--engine', choices=["html", "selenium"], default="html",
+                        help="Row extraction: parse one page snapshot (html) or query cells via WebDriver (selenium)")
+    parser.add_argument('--backend', choices=["browser", "http"], default="browser",
+                        help="Fetch calendar pages with Chrome or with plain HTTP (Chrome only as fallback)")
+    parser.add_argument('--granularity', choices=["day", "week", "month"], default="day",
+                        help="Calendar page size: one ?day= page per day, or ?range=/?month= pages")
+    parser.add_argument('--journal', action='store_true',
+                        help="Append new rows to <csv>.journal instead of rewriting the CSV after every page")
+    parser.add_argument('--compact-every', type=int, default=0,
+                        help="With --journal, fold the journal into the CSV every N pages (0 = at the end)")
+    parser.add_argument('--store', choices=STORES, default="csv",
+                        help="Cache backend: the CSV file, Parquet partitioned by year/month, or a SQLite database")
+    parser.add_argument('--store-path', type=str, default=None,
+                        help="Parquet directory / SQLite file (default: <csv without .csv>.parquet or .sqlite)")
+    parser.add_argument('--export-csv', action='store_true',
+                        help="With --store parquet/sqlite, also write the whole cache to --csv at the end")
+    parser.add_argument('--page-cache', nargs='?', const=True, default=None, metavar="PATH",
+                        help="Archive raw pages and reuse them while fresh (default path: <csv>.pages.sqlite)")
+    parser.add_argument('--trace', type=str, default=None, metavar="PATH",
+                        help="Append a JSON-lines record per timed stage and per page to PATH")
+    parser.add_argument('--metrics', type=str, default=None, metavar="PATH",
+                        help="Write counters and timing histograms to PATH in Prometheus text format")
+    parser.add_argument('--profile-day', type=str, default=None, metavar="YYYY-MM-DD",
+                        help="Run the page covering this day under cProfile (<csv>.profile-<day>.pstats)")
+    parser.add_argument('--export-arrow', nargs='?', const=True, default=None, metavar="PATH",
+                        help="Also export the whole cache as a memory-mappable Arrow IPC file (default path: <csv>.arrow)")
+    parser.add_argument('--max-rate', type=float, default=None, metavar="REQ_PER_S",
+                        help="Ceiling for the adaptive request rate shared by all workers (default: none)")
+    parser.add_argument('--fresh', action='store_true',
+                        help="Delete the CSV and its coverage manifest first and scrape the whole range again")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the interrupted run recorded in <csv>.progress with its own arguments")
 
     args = parser.parse_args()
+    if not args.resume and (args.start is None or args.end is None):
+        parser.error("--start and --end are required (unless --resume)")
 
     # ---------------------------------------------------------
-    # 🔥 Avant de scraper: si le CSV existe → ON LE SUPPRIME
+    # 🔥 --fresh : si le CSV existe → ON LE SUPPRIME (avec son manifeste)
+    # Sinon on ne scrape que les jours manquants ou incomplets.
     # ---------------------------------------------------------
-    if os.path.exists(args.csv):
-        print(f"[INFO] Removing old CSV: {args.csv}")
-        os.remove(args.csv)
-
-    tz = gettz(args.tz)
-    from_date = datetime.fromisoformat(args.start).replace(tzinfo=tz)
-    to_date = datetime.fromisoformat(args.end).replace(tzinfo=tz)
-
-    scrape_incremental(
-        from_date,
-        to_date,
-        args.csv,
-        tzname=args.tz,
-        scrape_details=args.details
-    )
+    if args.fresh and not args.resume:
+        for path in (args.csv, manifest_path(args.csv), journal_path(args.csv), progress_path(args.csv)):
+            if os.path.exists(path):
+                print(f"[INFO] Removing old file: {path}")
+                os.remove(path)
+        if args.store != "csv":
+            store_path = args.store_path or default_store_path(args.csv, args.store)
+            if os.path.isdir(store_path):
+                print(f"[INFO] Removing old store: {store_path}")
+                shutil.rmtree(store_path)
+            for path in (store_path, store_path + "-wal", store_path + "-shm"):
+                if os.path.isfile(path):
+                    print(f"[INFO] Removing old file: {path}")
+                    os.remove(path)
+
+    # ---------------------------------------------------------
+    # --resume : on reprend le run interrompu (plan des pages et arguments
+    # enregistrés dans <csv>.progress), sans relire le cache pour savoir
+    # où il s'était arrêté. Seul --workers peut être changé.
+    # ---------------------------------------------------------
+    resume = args.resume and os.path.exists(progress_path(args.csv))
+    if args.resume and not resume:
+        if args.start is None or args.end is None:
+            parser.error(f"nothing to resume in {progress_path(args.csv)}, give --start and --end")
+        logger.info(f"Nothing to resume in {progress_path(args.csv)}, running {args.start} -> {args.end}")
+
+    run_metrics = metrics.Metrics(trace_path=args.trace, prometheus_path=args.metrics)
+    previous = metrics.install(run_metrics)
+    try:
+        if resume:
+            resume_incremental(args.csv, workers=args.workers)
+            return
+        tz = gettz(args.tz)
+        from_date = datetime.fromisoformat(args.start).replace(tzinfo=tz)
+        to_date = datetime.fromisoformat(args.end).replace(tzinfo=tz)
+        profile_day = datetime.fromisoformat(args.profile_day).replace(tzinfo=tz) if args.profile_day else None
+        scrape_incremental(
+            from_date,
+            to_date,
+            args.csv,
+            tzname=args.tz,
+            scrape_details=args.details,
+            workers=args.workers or 1,
+            engine=args.engine,
+            backend=args.backend,
+            granularity=args.granularity,
+            write_mode="journal" if args.journal else "rewrite",
+            compact_every=args.compact_every,
+            store=args.store,
+            store_path=args.store_path,
+            export_csv=args.export_csv,
+            detail_max_age_days=args.detail_max_age,
+            detail_refs=args.detail_refs,
+            browser_profile=args.browser_profile,
+            headless=args.headless,
+            spare_drivers=args.spare_drivers,
+            recycle_pages=args.recycle_after,
+            max_browser_rss_mb=args.max_browser_mb,
+            page_cache_path=page_cache_path(args.csv) if args.page_cache is True else args.page_cache,
+            profile_day=profile_day,
+            export_arrow=arrow_path(args.csv) if args.export_arrow is True else args.export_arrow,
+            max_rate=args.max_rate,
+        )
+    finally:
+        metrics.install(previous)
+        run_metrics.close()
 
 
 if __name__ == "__main__":
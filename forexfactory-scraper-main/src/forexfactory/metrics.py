@@ -0,0 +1,319 @@
+# src/forexfactory/metrics.py
+
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from datetime import date, datetime
+
+from .atomic import atomic_write
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+PREFIX = "forexfactory_"
+
+# Upper bounds (seconds) of the histogram buckets: from lxml parses (ms) to
+# page loads hitting the 25 s table wait or the 180 s load timeout.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60, 180)
+
+HELP = {
+    "stage_seconds": "Time spent per stage (page_load, table_wait, extract_*, detail_click, merge, csv_write...).",
+    "page_seconds": "Time from fetching a calendar page to its rows being written.",
+    "pages": "Calendar pages processed, by result.",
+    "rows_scraped": "Rows extracted from calendar pages (High/Medium impact).",
+    "rows_added": "Rows added to the cache.",
+    "webdriver_calls": "WebDriver commands sent to Chrome.",
+    "page_retries": "Pages retried after a driver error.",
+    "driver_launches": "Chrome instances started, cold or pre-warmed.",
+    "driver_restarts": "Drivers replaced after a crash.",
+    "driver_recycles": "Drivers replaced between pages, by reason.",
+    "page_cache": "Page cache lookups, by result.",
+    "http_fetches": "Pages downloaded by the HTTP backend, by result.",
+    "detail_lookups": "Details resolved, by source (index, series cache or click).",
+    "detail_table_retries": "Detail tables that did not show up in time and were waited for again.",
+}
+
+
+def profile_path(csv_file: str, day: date) -> str:
+    """
+    Where the cProfile stats of one profiled day go.
+    """
+    return f"{csv_file}.profile-{day:%Y-%m-%d}.pstats"
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class _Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+
+class Metrics:
+    """
+    Counters and histograms of a scraping run, plus an optional JSON-lines
+    trace (one record per timed stage and per page) and Prometheus textfile
+    (written by flush(), for node_exporter's textfile collector).
+
+    Fields set with context() (e.g. the page being worked on) are added to
+    the trace records of the current thread. Safe to share between threads.
+    """
+
+    def __init__(self, trace_path: str | None = None, prometheus_path: str | None = None,
+                 buckets=DEFAULT_BUCKETS):
+        self.trace_path = trace_path
+        self.prometheus_path = prometheus_path
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], _Histogram] = {}
+        self._trace = open(trace_path, "a", encoding="utf-8") if trace_path else None
+
+    # -- recording ---------------------------------------------------------
+    def inc(self, name: str, n: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(self.buckets)
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str, /, **fields):
+        """
+        Time the block into stage_seconds{stage=...} and the trace (also
+        when it raises, with the exception type as "error").
+        """
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self.observe("stage_seconds", seconds, stage=stage)
+            if error is not None:
+                fields["error"] = error
+            self.trace("stage", stage=stage, seconds=round(seconds, 6), **fields)
+
+    @contextmanager
+    def context(self, **fields):
+        previous = getattr(self._local, "fields", {})
+        self._local.fields = {**previous, **fields}
+        try:
+            yield
+        finally:
+            self._local.fields = previous
+
+    def trace(self, event: str, /, **fields):
+        if self._trace is None:
+            return
+        record = {
+            "ts": datetime.now().astimezone().isoformat(timespec="milliseconds"),
+            "event": event,
+            "thread": threading.current_thread().name,
+            **getattr(self._local, "fields", {}),
+            **fields,
+        }
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._trace.write(line + "\n")
+
+    # -- reading -----------------------------------------------------------
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def histogram(self, name: str, **labels) -> tuple[int, float]:
+        """
+        (count, sum) of a histogram, (0, 0.0) if nothing was observed.
+        """
+        with self._lock:
+            hist = self._histograms.get((name, _label_key(labels)))
+            return (hist.count, hist.sum) if hist else (0, 0.0)
+
+    def prometheus_text(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items(), key=lambda item: item[0])
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+
+        seen = set()
+        for (name, key), value in counters:
+            metric = f"{PREFIX}{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                if name in HELP:
+                    lines.append(f"# HELP {metric} {HELP[name]}")
+                lines.append(f"# TYPE {metric} counter")
+            value = int(value) if float(value).is_integer() else value
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+
+        for (name, key), hist in histograms:
+            metric = f"{PREFIX}{name}"
+            if metric not in seen:
+                seen.add(metric)
+                if name in HELP:
+                    lines.append(f"# HELP {metric} {HELP[name]}")
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_format_labels(key, (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{metric}_bucket{_format_labels(key, (('le', '+Inf'),))} {hist.count}")
+            lines.append(f"{metric}_sum{_format_labels(key)} {hist.sum:.6f}")
+            lines.append(f"{metric}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """
+        One line with the total time per stage, slowest first.
+        """
+        with self._lock:
+            stages = [
+                (dict(key)["stage"], hist.sum, hist.count)
+                for (name, key), hist in self._histograms.items()
+                if name == "stage_seconds"
+            ]
+        stages.sort(key=lambda s: -s[1])
+        return ", ".join(f"{stage} {total:.1f}s/{count}" for stage, total, count in stages)
+
+    # -- output ------------------------------------------------------------
+    def flush(self):
+        """
+        Write the Prometheus textfile (atomically) and flush the trace.
+        """
+        if self.prometheus_path:
+            text = self.prometheus_text()
+            atomic_write(self.prometheus_path, lambda f: f.write(text))
+        if self._trace is not None:
+            with self._lock:
+                self._trace.flush()
+
+    def close(self):
+        self.flush()
+        if self._trace is not None:
+            with self._lock:
+                self._trace.close()
+                self._trace = None
+
+
+class DayProfiler:
+    """
+    cProfile hook around the work on one day: the fetch, parse and write of
+    the page(s) covering `day` run under one profiler, dumped to `path`
+    (open it with pstats or snakeviz). Other pages are not profiled.
+    """
+
+    def __init__(self, day: date, path: str):
+        self.day = day
+        self.path = path
+        self._profile = cProfile.Profile()
+        self._lock = threading.Lock()
+        self.used = False
+
+    @contextmanager
+    def around(self, first_day: date, last_day: date):
+        if not first_day <= self.day <= last_day:
+            yield
+            return
+        with self._lock:
+            self._profile.enable()
+            try:
+                yield
+            finally:
+                self._profile.disable()
+                self.used = True
+
+    def dump(self):
+        if self.used:
+            self._profile.dump_stats(self.path)
+            logger.info(f"Profile of {self.day} written to {self.path}")
+
+
+# The instance the scraper records into. Without install() it only keeps
+# the counters in memory.
+_current = Metrics()
+
+
+def current() -> Metrics:
+    return _current
+
+
+def install(metrics: Metrics) -> Metrics:
+    """
+    Make metrics the recorder for the scraper; returns the previous one.
+    """
+    global _current
+    previous, _current = _current, metrics
+    return previous
+
+
+def inc(name: str, n: float = 1, **labels):
+    _current.inc(name, n, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    _current.observe(name, value, **labels)
+
+
+def timer(stage: str, /, **fields):
+    return _current.timer(stage, **fields)
+
+
+def timed(stage: str):
+    """
+    Decorator: time every call of the function as `stage`.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _current.timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def context(**fields):
+    return _current.context(**fields)
+
+
+def trace(event: str, /, **fields):
+    _current.trace(event, **fields)
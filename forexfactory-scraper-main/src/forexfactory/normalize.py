@@ -0,0 +1,79 @@
+# src/forexfactory/normalize.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .schema import ALL_DAY_TIME, TENTATIVE_TIME, at_wall_time
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+VALUE_COLUMNS = ["Actual", "Forecast", "Previous"]
+
+# Added next to the CSV columns (never written to the CSV):
+#   <col>Value      float, the number with its magnitude applied ("-12K" -> -12000)
+#   <col>Unit       "%" or "" (a level), NaN when the cell is not a number
+#   <col>Magnitude  power of ten of the K/M/B/T suffix (0, 3, 6, 9, 12)
+#   Surprise        ActualValue - ForecastValue when both are in the same unit
+#   AllDay, Tentative  the row is stamped at ALL_DAY_TIME / TENTATIVE_TIME: the
+#                      time cell said "All Day" / "Tentative" (or "12:00am")
+NORMALIZED_COLUMNS = [
+    f"{col}{part}" for col in VALUE_COLUMNS for part in ("Value", "Unit", "Magnitude")
+] + ["Surprise", "AllDay", "Tentative"]
+
+UNIT_DTYPE = pd.CategoricalDtype(["", "%"])
+
+# "55.3", "1.8%", "-12K", "<0.25%", "3.62|2.3" (auctions: first figure).
+# Votes ("0-0-9"), "Pass" and empty cells are not numbers.
+_NUMBER = r"^\s*[<>]?(?P<number>[-+]?\d+(?:\.\d+)?)\s*(?P<suffix>[%KMBT]?)(?:\|.*)?\s*$"
+_MAGNITUDES = {"": 0, "%": 0, "K": 3, "M": 6, "B": 9, "T": 12}
+
+
+def parse_values(values: pd.Series) -> pd.DataFrame:
+    """
+    Calendar value cells -> Value, Unit, Magnitude columns (same index).
+    Each distinct string is parsed once: a cache has a few thousand of them.
+    """
+    codes, uniques = pd.factorize(values.astype(object))
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(_NUMBER)
+    is_number = parts["number"].notna()
+    magnitude = parts["suffix"].map(_MAGNITUDES).where(is_number)
+    value = parts["number"].astype(float) * 10.0 ** magnitude
+    unit = np.where(parts["suffix"] == "%", "%", "")
+
+    def take(array, fill):
+        return pd.api.extensions.take(np.asarray(array), codes, allow_fill=True, fill_value=fill)
+
+    return pd.DataFrame({
+        "Value": take(value, np.nan),
+        "Unit": pd.Categorical(take(np.where(is_number, unit, None), None), dtype=UNIT_DTYPE),
+        "Magnitude": pd.array(take(magnitude, np.nan), dtype="Int8"),
+    }, index=values.index)
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df with NORMALIZED_COLUMNS added (or recomputed), in either layout
+    (CSV strings or schema.to_typed). Vectorized: run it on each batch
+    before it is merged, and once on the cache when it is loaded.
+    """
+    out = df.copy(deep=False)
+    for col in VALUE_COLUMNS:
+        parsed = parse_values(df[col])
+        for part in ("Value", "Unit", "Magnitude"):
+            out[f"{col}{part}"] = parsed[part].to_numpy() if part == "Value" else parsed[part].array
+    same_unit = (out["ActualUnit"] == out["ForecastUnit"]).to_numpy(dtype=bool, na_value=False)
+    out["Surprise"] = np.where(same_unit, out["ActualValue"] - out["ForecastValue"], np.nan)
+    out["AllDay"] = at_wall_time(df["DateTime"], ALL_DAY_TIME)
+    out["Tentative"] = at_wall_time(df["DateTime"], TENTATIVE_TIME)
+    return out
+
+
+def is_normalized(df: pd.DataFrame) -> bool:
+    return all(col in df.columns for col in NORMALIZED_COLUMNS)
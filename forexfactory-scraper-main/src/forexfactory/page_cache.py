@@ -0,0 +1,199 @@
+# src/forexfactory/page_cache.py
+
+import logging
+import sqlite3
+import threading
+import zlib
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from .calendar_html import parse_calendar_html
+from .coverage import ACTUALS_GRACE_DAYS, actuals_complete
+from .date_logic import CALENDAR_URL, CalendarPage, calendar_url
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# A page fetched more than this long after its last day is final: kept forever
+# (with blank Actuals, only once fetched ACTUALS_GRACE_DAYS after it).
+SETTLED_AFTER = timedelta(days=1)
+# A page fetched before that (today, yesterday) is only reused for a few minutes.
+RECENT_TTL = timedelta(minutes=15)
+
+# actuals_complete: 1 when every release on the page had its Actual, NULL until checked
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS pages (
+    url        TEXT PRIMARY KEY,
+    param      TEXT NOT NULL,
+    first_day  TEXT NOT NULL,
+    last_day   TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    body       BLOB NOT NULL,
+    actuals_complete INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_pages_first_day ON pages (first_day);
+"""
+
+
+def page_cache_path(csv_file: str) -> str:
+    """
+    Default location of the page cache that goes with csv_file.
+    """
+    return csv_file + ".pages.sqlite"
+
+
+def _actuals_complete(page: CalendarPage, html: str) -> bool:
+    """
+    True when every release on the archived page has its Actual.
+    """
+    try:
+        return actuals_complete(parse_calendar_html(html, page.start))
+    except Exception:
+        logger.warning(f"Could not parse archived page {page.param}, treating its Actuals as blank")
+        return False
+
+
+CachedPage = namedtuple("CachedPage", ["param", "first_day", "last_day", "fetched_at"])
+
+
+def is_fresh(last_day: date, fetched_at: datetime, now: datetime, complete: bool = True) -> bool:
+    """
+    TTL by the age of the page: pages reaching today or the future are always
+    refetched, a page fetched once its days were over is kept forever, and
+    one fetched while they were recent lives RECENT_TTL. A page with blank
+    Actuals (complete=False) is only over once fetched ACTUALS_GRACE_DAYS
+    after its last day, like a day of the coverage manifest.
+    """
+    if last_day >= now.date():
+        return False
+    settled_after = SETTLED_AFTER if complete else timedelta(days=ACTUALS_GRACE_DAYS)
+    if fetched_at.date() > last_day + settled_after:
+        return True
+    return now - fetched_at <= RECENT_TTL
+
+
+class PageCache:
+    """
+    Raw HTML of fetched calendar pages (?day=, ?range=, ?month=), keyed by URL,
+    zlib-compressed in a single SQLite file with an index on the first day.
+
+    get() only returns pages that are still fresh (see is_fresh); entries()
+    and read() give access to the whole archive for offline re-parsing.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str, base_url: str = CALENDAR_URL, clock=None):
+        self.path = path
+        self.base_url = base_url
+        self.clock = clock or (lambda: datetime.now().astimezone())
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA_SQL)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(pages)")}
+        if "actuals_complete" not in columns:
+            # Archive written before the column: its pages are checked on read
+            with self.conn:
+                self.conn.execute("ALTER TABLE pages ADD COLUMN actuals_complete INTEGER")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def _url(self, param: str) -> str:
+        return calendar_url(param, self.base_url)
+
+    def get(self, page: CalendarPage) -> str | None:
+        """
+        Cached HTML of the page if it is still fresh, else None.
+        """
+        url = self._url(page.param)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT fetched_at, body, actuals_complete FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is not None:
+            fetched_at = datetime.fromisoformat(row[0])
+            now = self.clock().astimezone(fetched_at.tzinfo)
+            html = zlib.decompress(row[1]).decode("utf-8")
+            complete = row[2]
+            if complete is None:
+                complete = _actuals_complete(page, html)
+                with self._lock, self.conn:
+                    self.conn.execute("UPDATE pages SET actuals_complete = ? WHERE url = ?",
+                                      (int(complete), url))
+            if is_fresh(page.end.date(), fetched_at, now, bool(complete)):
+                self.hits += 1
+                return html
+        self.misses += 1
+        return None
+
+    def put(self, page: CalendarPage, html: str):
+        """
+        Archive a fetched page. Whether its Actuals are complete is checked
+        by the first get() that needs it.
+        """
+        fetched_at = self.clock().astimezone(page.end.tzinfo)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, param, first_day, last_day, fetched_at, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self._url(page.param),
+                    page.param,
+                    page.start.date().isoformat(),
+                    page.end.date().isoformat(),
+                    fetched_at.isoformat(timespec="seconds"),
+                    zlib.compress(html.encode("utf-8"), 6),
+                ),
+            )
+
+    def read(self, param: str) -> str | None:
+        """
+        Archived HTML for a calendar param, whatever its age.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT body FROM pages WHERE url = ?", (self._url(param),)
+            ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def entries(self, from_day: date | None = None, to_day: date | None = None) -> list[CachedPage]:
+        """
+        Archived pages (without their body), by first day.
+        """
+        clauses, params = [], []
+        if from_day is not None:
+            clauses.append("last_day >= ?")
+            params.append(from_day.isoformat())
+        if to_day is not None:
+            clauses.append("first_day <= ?")
+            params.append(to_day.isoformat())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT param, first_day, last_day, fetched_at FROM pages{where} "
+                f"ORDER BY first_day, last_day, url",
+                params,
+            ).fetchall()
+        return [
+            CachedPage(param, date.fromisoformat(first), date.fromisoformat(last),
+                       datetime.fromisoformat(fetched))
+            for param, first, last, fetched in rows
+        ]
@@ -0,0 +1,290 @@
+# src/forexfactory/parquet_store.py
+
+import logging
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .atomic import atomic_write
+from .csv_util import CSV_COLUMNS, merge_new_data, write_data_to_csv
+from .schema import to_strings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+VALUE_COLUMNS = ["Event", "Actual", "Forecast", "Previous", "Detail"]
+
+# DateTime is stored as a UTC instant plus the original UTC offset (minutes),
+# so CSV export gives back exactly the strings that were scraped.
+SCHEMA = pa.schema([
+    ("DateTime", pa.timestamp("us", tz="UTC")),
+    ("UtcOffset", pa.int16()),
+    ("Currency", pa.dictionary(pa.int8(), pa.string())),
+    ("Impact", pa.dictionary(pa.int8(), pa.string())),
+    ("Event", pa.string()),
+    ("Actual", pa.string()),
+    ("Forecast", pa.string()),
+    ("Previous", pa.string()),
+    ("Detail", pa.string()),
+])
+
+PART_FILE = "part-0.parquet"
+
+
+def _as_date(d) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return date.fromisoformat(str(d)[:10])
+
+
+def _day_us(d: date) -> int:
+    """
+    Midnight of d as microseconds since the epoch, on a naive (local) clock.
+    """
+    return (d - date(1970, 1, 1)).days * 86_400_000_000
+
+
+def _partition_dir(root: str, year: int, month: int) -> str:
+    return os.path.join(root, f"year={year}", f"month={month:02d}")
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    """
+    CSV-shaped string DataFrame -> typed Arrow table (SCHEMA).
+    """
+    dt = df["DateTime"].astype(str).str.strip()
+    offset = dt.str.extract(r"([+-])(\d{2}):(\d{2})$")
+    minutes = (offset[1].astype(float) * 60 + offset[2].astype(float)) * np.where(offset[0] == "-", -1, 1)
+    stamps = pd.to_datetime(dt, utc=True, format="ISO8601")
+
+    def strings(col):
+        values = df[col].astype(object)
+        return values.where(values.notna() & (values.astype(str) != ""), None)
+
+    data = {
+        "DateTime": stamps,
+        "UtcOffset": pd.array(minutes, dtype="Int16"),
+        "Currency": strings("Currency"),
+        "Impact": strings("Impact"),
+    }
+    for col in VALUE_COLUMNS:
+        data[col] = strings(col)
+    return pa.Table.from_pandas(pd.DataFrame(data), schema=SCHEMA, preserve_index=False)
+
+
+def _to_strings(table: pa.Table) -> pd.DataFrame:
+    """
+    Typed Arrow table -> CSV-shaped DataFrame (strings, NaN for empty),
+    as read_existing_data returns it.
+    """
+    if table.num_rows == 0:
+        return pd.DataFrame(columns=CSV_COLUMNS)
+    df = table.select([f.name for f in SCHEMA]).to_pandas()
+    offset = df["UtcOffset"].astype("Float64")
+    local = df["DateTime"].dt.tz_localize(None) + pd.to_timedelta(offset.fillna(0).astype(float), unit="m")
+    sign = np.where(offset.fillna(0) < 0, "-", "+")
+    absolute = offset.fillna(0).abs().astype(int)
+    suffix = pd.Series(sign, index=df.index) + (absolute // 60).map("{:02d}".format) + ":" + \
+        (absolute % 60).map("{:02d}".format)
+    suffix = suffix.where(offset.notna(), "")
+
+    out = pd.DataFrame({"DateTime": local.dt.strftime("%Y-%m-%dT%H:%M:%S") + suffix})
+    for col in CSV_COLUMNS[1:]:
+        values = df[col].astype(object)
+        out[col] = values.where(values.notna(), np.nan)
+    return out[CSV_COLUMNS]
+
+
+def _local_year_month(df: pd.DataFrame) -> pd.Series:
+    """
+    Partition of each row, from the calendar date as scraped (before any UTC shift).
+    """
+    dt = df["DateTime"].astype(str).str.strip()
+    return dt.str[:4].astype(int) * 100 + dt.str[5:7].astype(int)
+
+
+class ParquetStore:
+    """
+    Calendar cache as Parquet files partitioned by year/month
+    (root/year=2025/month=01/part-0.parquet) with typed columns.
+
+    read() pushes date range, currency and impact filters down to the
+    dataset scan (partition pruning + row-group statistics); upsert() only
+    rewrites the partitions touched by the new rows.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _dataset(self):
+        return ds.dataset(self.root, format="parquet", partitioning="hive", schema=SCHEMA.append(
+            pa.field("year", pa.int32())).append(pa.field("month", pa.int32())))
+
+    def read_table(self, start: datetime | None = None, end: datetime | None = None,
+                   currencies=None, impacts=None, columns=None) -> pa.Table:
+        """
+        Filtered rows as a typed Arrow table. start/end are inclusive
+        calendar days, taken on the local date as scraped (like partitions
+        and SqliteStore.read).
+        """
+        if not os.path.isdir(self.root):
+            return SCHEMA.empty_table()
+        expr = None
+
+        def add(e):
+            return e if expr is None else expr & e
+
+        # Local midnight of the first day kept and of the day after the last
+        # one, in microseconds, compared with DateTime + UtcOffset
+        bounds = []
+        ym = ds.field("year") * 100 + ds.field("month")
+        stamp = SCHEMA.field("DateTime").type
+        if start is not None:
+            start = _as_date(start)
+            expr = add(ym >= start.year * 100 + start.month)
+            # UTC pushdown with a day of margin: offsets are under 24 h
+            lower = pd.Timestamp(start - timedelta(days=1), tz="UTC")
+            expr = add(ds.field("DateTime") >= pa.scalar(lower, stamp))
+            bounds.append((pc.greater_equal, _day_us(start)))
+        if end is not None:
+            end = _as_date(end) + timedelta(days=1)
+            last = end - timedelta(days=1)
+            expr = add(ym <= last.year * 100 + last.month)
+            upper = pd.Timestamp(end + timedelta(days=1), tz="UTC")
+            expr = add(ds.field("DateTime") < pa.scalar(upper, stamp))
+            bounds.append((pc.less, _day_us(end)))
+        if currencies:
+            expr = add(ds.field("Currency").isin(list(currencies)))
+        if impacts:
+            expr = add(ds.field("Impact").isin(list(impacts)))
+
+        columns = columns or [f.name for f in SCHEMA]
+        scanned = list(columns)
+        if bounds:
+            scanned += [c for c in ("DateTime", "UtcOffset") if c not in scanned]
+        table = self._dataset().to_table(columns=scanned, filter=expr)
+        if bounds:
+            local = pc.add(
+                pc.cast(table["DateTime"], pa.int64()),
+                pc.multiply(pc.cast(pc.fill_null(table["UtcOffset"], 0), pa.int64()), 60_000_000),
+            )
+            mask = None
+            for compare, bound in bounds:
+                m = compare(local, bound)
+                mask = m if mask is None else pc.and_(mask, m)
+            table = table.filter(mask).select(columns)
+        if "DateTime" in columns:
+            table = table.sort_by([("DateTime", "ascending")])
+        return table
+
+    def read(self, start=None, end=None, currencies=None, impacts=None) -> pd.DataFrame:
+        """
+        Typed DataFrame (UTC datetime64, categoricals) for the filtered rows.
+        """
+        return self.read_table(start, end, currencies, impacts).to_pandas()
+
+    def read_strings(self, **filters) -> pd.DataFrame:
+        """
+        Same rows as read(), shaped like read_existing_data (CSV strings).
+        """
+        return _to_strings(self.read_table(**filters))
+
+    def _read_partition(self, year: int, month: int) -> pd.DataFrame:
+        path = os.path.join(_partition_dir(self.root, year, month), PART_FILE)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        return _to_strings(pq.read_table(path, schema=SCHEMA))
+
+    def _write_partition(self, year: int, month: int, df: pd.DataFrame):
+        directory = _partition_dir(self.root, year, month)
+        os.makedirs(directory, exist_ok=True)
+        df = df.sort_values(by="DateTime", kind="mergesort")
+        table = _to_table(df)
+        atomic_write(os.path.join(directory, PART_FILE), lambda f: pq.write_table(table, f), binary=True)
+
+    def upsert(self, new_df: pd.DataFrame) -> int:
+        """
+        Merge CSV-shaped rows with merge_new_data semantics, rewriting only the
+        touched year/month partitions. Returns the number of rows added.
+        """
+        if new_df is None or new_df.empty:
+            return 0
+        new_df = to_strings(new_df)
+        added = 0
+        for ym, part in new_df.groupby(_local_year_month(new_df), sort=True):
+            year, month = divmod(int(ym), 100)
+            existing = self._read_partition(year, month)
+            merged = merge_new_data(existing, part[CSV_COLUMNS])
+            added += len(merged) - len(existing)
+            self._write_partition(year, month, merged)
+        return added
+
+    def replace_days(self, days, new_df: pd.DataFrame) -> int:
+        """
+        Replace every row of the given calendar days (local dates of DateTime)
+        with new_df, rewriting only their partitions. Returns the number of
+        rows written.
+        """
+        days = {str(day)[:10] for day in days}
+        new_df = to_strings(new_df[CSV_COLUMNS]) if new_df is not None else pd.DataFrame(columns=CSV_COLUMNS)
+        new_ym = _local_year_month(new_df) if not new_df.empty else pd.Series(dtype=int)
+        months = {int(day[:4]) * 100 + int(day[5:7]) for day in days} | set(new_ym.unique())
+        for ym in sorted(months):
+            year, month = divmod(int(ym), 100)
+            existing = self._read_partition(year, month)
+            kept = existing[~existing["DateTime"].astype(str).str.strip().str[:10].isin(days)]
+            part = new_df[new_ym == ym] if not new_df.empty else new_df
+            merged = merge_new_data(kept, part) if not kept.empty else part
+            if merged.empty:
+                path = os.path.join(_partition_dir(self.root, year, month), PART_FILE)
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            self._write_partition(year, month, merged)
+        return len(new_df)
+
+    def export_csv(self, csv_file: str, **filters):
+        """
+        Write the (filtered) store as a classic CSV cache.
+        """
+        write_data_to_csv(self.read_strings(**filters), csv_file)
+
+    @classmethod
+    def from_csv(cls, csv_file: str, root: str) -> "ParquetStore":
+        from .csv_util import read_existing_data
+        store = cls(root)
+        store.upsert(read_existing_data(csv_file))
+        return store
+
+
+class ParquetWriter:
+    """
+    Scraper writer backed by a ParquetStore: each batch is upserted into its
+    partitions; the CSV is exported at the end when export_csv is set.
+    """
+
+    def __init__(self, root: str, csv_file: str | None = None):
+        self.store = ParquetStore(root)
+        self.csv_file = csv_file
+
+    def read(self) -> pd.DataFrame:
+        return self.store.read_strings()
+
+    def write(self, merged_df: pd.DataFrame, delta_df: pd.DataFrame, batch_df: pd.DataFrame | None = None):
+        self.store.upsert(delta_df)
+
+    def close(self, merged_df: pd.DataFrame):
+        if self.csv_file:
+            write_data_to_csv(merged_df, self.csv_file)
@@ -0,0 +1,125 @@
+# src/forexfactory/pipeline.py
+
+import asyncio
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# func(item, previous_result) -> result, run on `workers` threads of its own.
+# A None result skips the following stages (the sink still sees it).
+# pool: name of an earlier stage whose threads run this one instead (for work
+# tied to per-thread resources, e.g. one browser per fetch thread).
+Stage = namedtuple("Stage", ["name", "func", "workers", "pool"], defaults=(None,))
+
+
+class _Failure:
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def run_pipeline(items, stages, sink, max_in_flight: int | None = None):
+    """
+    Push items through the stages and hand each result to sink(item, result)
+    in item order, with every stage working on a different item at the same
+    time (fetch N+1 while parsing N while writing N-1).
+
+    Each stage and the sink run on their own thread pools, coordinated by an
+    asyncio event loop. At most `max_in_flight` items (default: two per
+    stage worker) are between the input and the sink at any time, reorder
+    buffer included: a slow sink holds back the fetchers, so memory stays
+    flat over long ranges. An exception in a stage or in the sink stops the
+    pipeline and is raised here; items not started yet are dropped.
+
+    Called from a thread that already runs an event loop (a notebook, an
+    async application), the pipeline's own loop runs on a separate thread
+    and this call blocks until it is done.
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * sum(max(1, s.workers) for s in stages if s.pool is None) + 1
+    run = _run(iter(items), list(stages), sink, max(1, max_in_flight))
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(run)
+        return
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-loop") as executor:
+        executor.submit(asyncio.run, run).result()
+
+
+async def _run(items, stages, sink, max_in_flight):
+    loop = asyncio.get_running_loop()
+    by_name = {}
+    executors = []
+    for s in stages:
+        if s.pool is None:
+            by_name[s.name] = ThreadPoolExecutor(
+                max_workers=max(1, s.workers), thread_name_prefix=f"pipeline-{s.name}"
+            )
+            executors.append(by_name[s.name])
+        else:
+            executors.append(by_name[s.pool])
+    sink_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-sink")
+    in_flight = asyncio.Semaphore(max_in_flight)
+    queues = [asyncio.Queue() for _ in range(len(stages) + 1)]
+    total = None
+
+    async def produce():
+        nonlocal total
+        n = 0
+        for item in items:
+            await in_flight.acquire()
+            await queues[0].put((n, item, None))
+            n += 1
+        total = n
+        # Wake the sink up in case everything is already written
+        await queues[-1].put(None)
+
+    async def work(i, stage):
+        while True:
+            seq, item, value = await queues[i].get()
+            if i == 0 or (value is not None and not isinstance(value, _Failure)):
+                try:
+                    value = await loop.run_in_executor(executors[i], stage.func, item, value)
+                except Exception as e:
+                    value = _Failure(e)
+            await queues[i + 1].put((seq, item, value))
+
+    tasks = [asyncio.create_task(produce())]
+    for i, stage in enumerate(stages):
+        tasks.extend(asyncio.create_task(work(i, stage)) for _ in range(max(1, stage.workers)))
+
+    try:
+        done = {}
+        next_seq = 0
+        while total is None or next_seq < total:
+            for task in tasks:
+                # A crashed producer/worker would leave the sink waiting forever
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            entry = await queues[-1].get()
+            if entry is None:
+                continue
+            seq, item, value = entry
+            if isinstance(value, _Failure):
+                raise value.exc
+            done[seq] = (item, value)
+            while next_seq in done:
+                item, value = done.pop(next_seq)
+                await loop.run_in_executor(sink_executor, sink, item, value)
+                next_seq += 1
+                in_flight.release()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for executor in list(by_name.values()) + [sink_executor]:
+            # Running calls cannot be interrupted; queued ones are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,212 @@
+# src/forexfactory/replay.py
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from .calendar_html import parse_calendar_html
+from .coverage import CoverageManifest, manifest_path
+from .csv_util import CSV_COLUMNS, clean_text, dedupe_keys, row_keys, values_per_key
+from .page_cache import PageCache, page_cache_path
+from .storage import STORES, default_store_path, open_writer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# One read-only archive connection per worker process
+_archive: PageCache | None = None
+
+
+def _init_worker(archive_path: str):
+    global _archive
+    _archive = PageCache(archive_path)
+
+
+def _parse_archived(task) -> pd.DataFrame:
+    """
+    Parse one archived page in a worker process, keeping only its owned days.
+    """
+    param, first_day, owned_days, tzname = task
+    html = _archive.read(param)
+    the_date = datetime.combine(first_day, datetime.min.time()).replace(tzinfo=gettz(tzname))
+    df = parse_calendar_html(html, the_date)
+    if df.empty:
+        return df
+    return df[df["DateTime"].str[:10].isin(owned_days)]
+
+
+def plan_replay(entries, from_day: date | None = None, to_day: date | None = None):
+    """
+    Assign every archived day to one page: the most recently fetched page that
+    covers it (ties broken by URL order). Returns (param, first_day, owned days)
+    tasks in calendar order; pages that own no day are left out.
+    """
+    owner = {}
+    for entry in entries:
+        day = entry.first_day
+        while day <= entry.last_day:
+            if (from_day is None or day >= from_day) and (to_day is None or day <= to_day):
+                current = owner.get(day)
+                if current is None or entry.fetched_at > current.fetched_at:
+                    owner[day] = entry
+            day += timedelta(days=1)
+
+    owned = {}
+    for day in sorted(owner):
+        owned.setdefault(owner[day].param, []).append(day.isoformat())
+    return [(e.param, e.first_day, owned[e.param]) for e in entries if e.param in owned]
+
+
+def _plan(archive_path: str, from_day: date | None, to_day: date | None):
+    """
+    plan_replay over the archive, and the fetch time of each planned page.
+    """
+    if not os.path.exists(archive_path):
+        raise FileNotFoundError(f"No page archive at {archive_path}")
+    with PageCache(archive_path) as archive:
+        entries = archive.entries(from_day, to_day)
+    fetched_at = {entry.param: entry.fetched_at for entry in entries}
+    return plan_replay(entries, from_day, to_day), fetched_at
+
+
+def _parse_pages(archive_path: str, tasks, tzname: str, processes: int | None) -> pd.DataFrame:
+    logger.info(f"Replaying {len(tasks)} archived pages from {archive_path}")
+    if not tasks:
+        return pd.DataFrame(columns=CSV_COLUMNS)
+
+    tasks = [(param, first_day, owned, tzname) for param, first_day, owned in tasks]
+    if processes == 1:
+        _init_worker(archive_path)
+        frames = [_parse_archived(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(archive_path,)) as pool:
+            frames = list(pool.map(_parse_archived, tasks, chunksize=max(1, len(tasks) // 64)))
+
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=CSV_COLUMNS)
+    df = dedupe_keys(pd.concat(frames, ignore_index=True))
+    return df.sort_values(by="DateTime", kind="mergesort").reset_index(drop=True)[CSV_COLUMNS]
+
+
+def replay_archive(archive_path: str, tzname: str = "Asia/Tehran", from_day: date | None = None,
+                   to_day: date | None = None, processes: int | None = None) -> pd.DataFrame:
+    """
+    Rebuild the calendar rows from archived pages only (no browser, no
+    network), parsing pages on a process pool. The result only depends on the
+    archive content: same archive, same rows in the same order.
+    tzname must be the timezone the pages were scraped in.
+    """
+    tasks, _ = _plan(archive_path, from_day, to_day)
+    return _parse_pages(archive_path, tasks, tzname, processes)
+
+
+def _carry_details(existing_df: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df with the Details the cache already holds for its keys: archived pages
+    never have them.
+    """
+    if existing_df.empty or df.empty:
+        return df
+    detail = clean_text(existing_df["Detail"])
+    known = values_per_key(detail, row_keys(existing_df), detail != "", "first")
+    if known.empty:
+        return df
+    new_detail = clean_text(df["Detail"])
+    out = df.copy()
+    out["Detail"] = new_detail.where(new_detail != "", row_keys(df).map(known).fillna("")).values
+    return out
+
+
+def replay(archive_path: str, output_csv: str, tzname: str = "Asia/Tehran", from_day: date | None = None,
+           to_day: date | None = None, processes: int | None = None, store: str = "csv",
+           store_path: str | None = None, export_csv: bool = False) -> int:
+    """
+    Replace the rows of the replayed days in the cache (CSV, or the
+    Parquet/SQLite store) with the rows parsed from the archive; other days
+    are kept, and so are the Details of the replayed rows. The coverage
+    manifest, when there is one, records the replayed days as scraped when
+    their page was fetched. Returns the number of rows replayed.
+    """
+    tasks, fetched_at = _plan(archive_path, from_day, to_day)
+    df = _parse_pages(archive_path, tasks, tzname, processes)
+    days = sorted(day for _, _, owned in tasks for day in owned)
+    if not days:
+        return 0
+
+    if store == "csv":
+        # Rewrite mode folds a journal left by an interrupted run into the CSV
+        writer = open_writer(output_csv)
+        existing = writer.read()
+        df = _carry_details(existing, df)
+        kept = existing[~existing["DateTime"].astype(str).str.strip().str[:10].isin(days)]
+        writer.close(pd.concat([kept, df], ignore_index=True)[CSV_COLUMNS])
+    elif store == "parquet":
+        from .parquet_store import ParquetStore
+        target = ParquetStore(store_path or default_store_path(output_csv, store))
+        df = _carry_details(target.read_strings(), df)
+        target.replace_days(days, df)
+        if export_csv:
+            target.export_csv(output_csv)
+    elif store == "sqlite":
+        from .sqlite_store import SqliteStore
+        with SqliteStore(store_path or default_store_path(output_csv, store)) as target:
+            df = _carry_details(target.read(), df)
+            target.replace_days(days, df)
+            if export_csv:
+                target.export_csv(output_csv)
+    else:
+        raise ValueError(f"Unknown store {store!r}, expected one of {STORES}")
+
+    if os.path.exists(manifest_path(output_csv)):
+        manifest = CoverageManifest.load(manifest_path(output_csv))
+        by_day = df["DateTime"].astype(str).str[:10]
+        for param, _, owned in tasks:
+            for day in owned:
+                manifest.record_day(day, df[by_day == day], fetched_at[param])
+        manifest.save()
+    logger.info(f"Replay wrote {len(df)} rows over {len(days)} days")
+    return len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the Forex Factory cache from archived pages")
+    parser.add_argument('--csv', type=str, default="forex_factory_cache.csv")
+    parser.add_argument('--archive', type=str, default=None,
+                        help="Page cache to replay (default: <csv>.pages.sqlite)")
+    parser.add_argument('--tz', type=str, default="Asia/Tehran",
+                        help="Timezone the pages were scraped in")
+    parser.add_argument('--start', default=None, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument('--end', default=None, help="Last day to rebuild (YYYY-MM-DD)")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="Parser processes (default: one per CPU)")
+    parser.add_argument('--store', choices=STORES, default="csv")
+    parser.add_argument('--store-path', type=str, default=None)
+    parser.add_argument('--export-csv', action='store_true')
+
+    args = parser.parse_args()
+    replay(
+        args.archive or page_cache_path(args.csv),
+        args.csv,
+        tzname=args.tz,
+        from_day=date.fromisoformat(args.start) if args.start else None,
+        to_day=date.fromisoformat(args.end) if args.end else None,
+        processes=args.processes,
+        store=args.store,
+        store_path=args.store_path,
+        export_csv=args.export_csv
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# src/forexfactory/schema.py
+
+import logging
+from datetime import timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Typed in-memory layout of the calendar cache (the CSV stays all strings):
+#   DateTime                          tz-aware datetime64[ns]
+#   Currency, Impact, Event           category (a handful to a few thousand values)
+#   Actual, Forecast, Previous, Detail nullable strings (Arrow-backed when
+#                                     pyarrow is installed)
+CATEGORY_COLUMNS = ["Currency", "Impact", "Event"]
+STRING_COLUMNS = ["Actual", "Forecast", "Previous", "Detail"]
+
+# Wall times standing for a time cell that is not a time: "All Day" (also
+# "Day 1", ...) and "Tentative" rows keep their day with these. Tentative is
+# midnight, the stamp such rows always had: a 12:00am release shares it.
+ALL_DAY_TIME = (23, 59, 59)
+TENTATIVE_TIME = (0, 0, 0)
+
+
+def string_dtype() -> pd.StringDtype:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.StringDtype("python")
+    return pd.StringDtype("pyarrow")
+
+
+def is_typed(df: pd.DataFrame) -> bool:
+    return "DateTime" in df.columns and isinstance(df["DateTime"].dtype, pd.DatetimeTZDtype)
+
+
+def _offset(suffix: str) -> timedelta | None:
+    """
+    "+03:30" / "-05:00" / "Z" / "" -> UTC offset, None if not an offset.
+    """
+    if suffix in ("", "Z"):
+        return timedelta(0)
+    if len(suffix) != 6 or suffix[0] not in "+-" or suffix[3] != ":":
+        return None
+    try:
+        delta = timedelta(hours=int(suffix[1:3]), minutes=int(suffix[4:6]))
+    except ValueError:
+        return None
+    return -delta if suffix[0] == "-" else delta
+
+
+def _parse_datetimes(datetimes: pd.Series) -> tuple[pd.Series, np.ndarray]:
+    """
+    ISO DateTime strings ("YYYY-MM-DDTHH:MM:SS+HH:MM") -> UTC datetimes and
+    the UTC offset of each string in minutes (0 when missing). The wall time
+    is parsed by numpy and the offset is mapped per distinct suffix, much
+    faster than a generic ISO parser; anything else falls back to
+    pd.to_datetime (invalid -> NaT).
+    """
+    text = datetimes.astype(object).where(datetimes.notna(), "").astype(str).str.strip()
+    missing = (text == "").to_numpy()
+    suffix = text.str[19:]
+    offsets = {sfx: _offset(sfx) for sfx in suffix[~missing].unique()}
+    minutes = suffix.map({sfx: v // timedelta(minutes=1) for sfx, v in offsets.items() if v is not None})
+    minutes = minutes.fillna(0).to_numpy().astype("int64")
+    try:
+        if any(v is None for v in offsets.values()):
+            raise ValueError("not plain ISO offsets")
+        wall = text.str[:19].to_numpy()
+        wall[missing] = "NaT"
+        wall = wall.astype("datetime64[s]")
+    except ValueError:
+        stamps = pd.to_datetime(text.where(~missing), utc=True, format="ISO8601", errors="coerce")
+        return stamps, np.where(stamps.notna().to_numpy(), minutes, 0)
+    utc = (wall - minutes.astype("timedelta64[m]")).astype("datetime64[ns]")
+    return pd.Series(utc, index=datetimes.index).dt.tz_localize("UTC"), minutes
+
+
+def split_datetimes(datetimes: pd.Series) -> tuple[pd.Series, np.ndarray]:
+    """
+    DateTime column (ISO strings or tz-aware) -> UTC datetimes and the UTC
+    offset of each row in minutes: together they give back the exact strings
+    (format_local), whatever the mix of offsets.
+    """
+    if isinstance(datetimes.dtype, pd.DatetimeTZDtype):
+        return datetimes.dt.tz_convert("UTC"), utc_offsets(datetimes)
+    return _parse_datetimes(datetimes)
+
+
+def infer_tz(datetimes: pd.Series):
+    """
+    Timezone reproducing the UTC offsets of ISO DateTime strings: their
+    common offset, or UTC when they carry several (pass the scrape's
+    timezone to to_typed() to keep those exact).
+    """
+    return _tz_for(*_parse_datetimes(datetimes))
+
+
+def _tz_for(stamps: pd.Series, minutes: np.ndarray):
+    found = np.unique(minutes[stamps.notna().to_numpy()])
+    if len(found) != 1 or not found[0]:
+        return timezone.utc
+    return timezone(timedelta(minutes=int(found[0])))
+
+
+def to_typed(df: pd.DataFrame, tz=None) -> pd.DataFrame:
+    """
+    CSV-shaped string DataFrame -> typed layout, DateTime converted to tz
+    (default: infer_tz). Other columns are kept as they are.
+    """
+    if is_typed(df):
+        return df if tz is None else df.assign(DateTime=df["DateTime"].dt.tz_convert(tz))
+    out = df.copy(deep=False)
+    stamps, minutes = _parse_datetimes(df["DateTime"])
+    out["DateTime"] = stamps.dt.tz_convert(tz if tz is not None else _tz_for(stamps, minutes))
+    for col in CATEGORY_COLUMNS:
+        if col in out.columns:
+            out[col] = out[col].astype("category")
+    dtype = string_dtype()
+    for col in STRING_COLUMNS:
+        if col in out.columns:
+            out[col] = out[col].astype(dtype)
+    return out
+
+
+def utc_offsets(stamps: pd.Series) -> np.ndarray:
+    """
+    UTC offset of each tz-aware datetime, in minutes (0 for NaT).
+    """
+    local = stamps.dt.tz_localize(None).to_numpy()
+    utc = stamps.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+    offset = np.where(stamps.notna().to_numpy(), local - utc, np.timedelta64(0, "m"))
+    return (offset // np.timedelta64(1, "m")).astype("int64")
+
+
+def format_local(utc: np.ndarray, minutes: np.ndarray) -> np.ndarray:
+    """
+    UTC datetime64 values and their offsets (minutes) -> "YYYY-MM-DDTHH:MM:SS+HH:MM"
+    strings (what datetime.isoformat() gives for the scraped rows), NaT -> NaN.
+    """
+    minutes = np.asarray(minutes, dtype="int64")
+    local = utc.astype("datetime64[s]") + minutes.astype("timedelta64[m]")
+    text = np.datetime_as_string(local, unit="s").astype(object)
+    suffix = np.empty(len(minutes), dtype=object)
+    for m in np.unique(minutes):
+        sign = "-" if m < 0 else "+"
+        suffix[minutes == m] = f"{sign}{abs(m) // 60:02d}:{abs(m) % 60:02d}"
+    return np.where(np.isnat(utc), np.nan, text + suffix)
+
+
+def format_datetimes(stamps: pd.Series) -> pd.Series:
+    """
+    tz-aware datetimes -> ISO strings with their local offset, NaT -> NaN.
+    """
+    utc = stamps.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+    return pd.Series(format_local(utc, utc_offsets(stamps)), index=stamps.index, dtype=object)
+
+
+def to_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Typed layout -> the all-string layout of read_existing_data (missing
+    values as NaN), the inverse of to_typed. String frames are returned as is.
+    """
+    if not is_typed(df):
+        return df
+    out = df.copy(deep=False)
+    out["DateTime"] = format_datetimes(df["DateTime"]).to_numpy()
+    for col in CATEGORY_COLUMNS + STRING_COLUMNS:
+        if col in out.columns and not out[col].dtype == object:
+            out[col] = out[col].to_numpy(dtype=object, na_value=np.nan)
+    return out
+
+
+def conform(df: pd.DataFrame, like: pd.DataFrame) -> pd.DataFrame:
+    """
+    df in the same layout (typed or strings, same timezone) as `like`.
+    """
+    if is_typed(like):
+        return to_typed(df, like["DateTime"].dt.tz)
+    return to_strings(df)
+
+
+def at_wall_time(datetimes: pd.Series, hms: tuple[int, int, int]) -> np.ndarray:
+    """
+    Rows of the DateTime column (strings or tz-aware) whose local wall time is hms.
+    """
+    if isinstance(datetimes.dtype, pd.DatetimeTZDtype):
+        return ((datetimes.dt.hour == hms[0]) & (datetimes.dt.minute == hms[1]) &
+                (datetimes.dt.second == hms[2])).to_numpy(dtype=bool, na_value=False)
+    text = datetimes.astype(object).where(datetimes.notna(), "").astype(str).str.strip()
+    return (text.str[11:19] == "{:02d}:{:02d}:{:02d}".format(*hms)).to_numpy()
+
+
+def datetime_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Comparable DateTime key: UTC nanoseconds for the typed layout, the
+    stripped string otherwise.
+    """
+    if is_typed(df):
+        return pd.Series(df["DateTime"].array.asi8, index=df.index)
+    return df["DateTime"].astype(str).str.strip()
+
+
+def concat(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    pd.concat that keeps the category columns categorical (pd.concat falls
+    back to object when the categories differ).
+    """
+    frames = [f for f in frames if len(f.columns)]
+    if not frames or not is_typed(frames[0]):
+        return pd.concat(frames)
+    out = pd.concat(frames)
+    for col in CATEGORY_COLUMNS:
+        if col in out.columns and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            parts = [f[col].astype("category") for f in frames]
+            out[col] = union_categoricals(parts, ignore_order=True)
+    return out
+
+
+def memory_usage(df: pd.DataFrame) -> int:
+    """
+    Bytes held by df, strings included.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
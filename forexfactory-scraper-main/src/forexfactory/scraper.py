@@ -1,12 +1,15 @@
 # src/forexfactory/scraper.py
 
 import time
-import re
+import queue
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 
 import pandas as pd
-import undetected_chromedriver as uc
+from dateutil.tz import gettz
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -21,13 +24,43 @@ from selenium.common.exceptions import (
 
 from urllib3.exceptions import ReadTimeoutError, MaxRetryError
 
+from . import metrics
+from .config import ScrapeConfig
+from .normalize import normalize
+from .schema import to_typed
 from .csv_util import (
-    ensure_csv_header,
-    read_existing_data,
-    write_data_to_csv,
+    CSV_COLUMNS,
+    changed_rows,
     merge_new_data,
 )
 from .detail_parser import parse_detail_table, detail_data_to_string
+from .detail_index import DetailIndex
+from .detail_cache import (
+    DetailCache,
+    detail_cache_path,
+    resolve_refs,
+    series_specs,
+)
+from .calendar_html import (
+    ALLOWED_IMPACTS,
+    event_datetime,
+    parse_calendar_html,
+    parse_day_breaker_text,
+)
+from .coverage import CoverageManifest
+from .date_logic import (
+    CalendarPage,
+    build_url_for_day,
+    calendar_url,
+    contiguous_runs,
+    iter_calendar_pages,
+)
+from .browser import BrowserProfile, chrome_rss, get_profile, launch_chrome, rss_supported
+from .fetcher import ChallengeError, FetchError, HttpFetcher
+from .metrics import DayProfiler, profile_path
+from .pipeline import Stage, run_pipeline
+from .storage import open_writer
+from .throttle import AimdThrottle
 
 logging.basicConfig(
     level=logging.INFO,
@@ -36,71 +69,359 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# --------------------------------------------------------------------
-# 🔥 On garde UNIQUEMENT ces impacts
-# --------------------------------------------------------------------
-ALLOWED_IMPACTS = ["High Impact Expected", "Medium Impact Expected"]
+# Erreurs pour lesquelles on relance le driver et on réessaie la journée
+DRIVER_ERRORS = (
+    InvalidSessionIdException,
+    WebDriverException,
+    ReadTimeoutError,
+    MaxRetryError,
+)
+MAX_DAY_ATTEMPTS = 3
+
+# Après ce nombre de challenges consécutifs, on abandonne le backend HTTP
+# pour le reste du run et on passe par le navigateur.
+MAX_HTTP_CHALLENGES = 3
+
+# Fréquence de sauvegarde du manifeste de couverture (en pages)
+MANIFEST_SAVE_EVERY = 20
+
+# Marqueur de l'étage de parsing : page illisible, à refaire via le navigateur
+_BROWSER_FALLBACK = object()
+
+
+class CalendarLoadError(Exception):
+    """La table du calendrier n'est pas apparue dans le temps imparti."""
+
+
+# undetected_chromedriver patche le binaire chromedriver au lancement :
+# deux lancements simultanés peuvent se marcher dessus.
+_launch_lock = threading.Lock()
 
 
 # --------------------------------------------------------------------
 # Helper : créer un driver Chrome UC
 # --------------------------------------------------------------------
-def _launch_driver():
+def _launch_driver(profile: BrowserProfile | None = None):
+    """
+    Lance un nouveau Chrome undetected_chromedriver selon le profil
+    (par défaut : chargement complet, fenêtre 1400x1000).
+    """
+    profile = profile or get_profile("default")
+    logger.info(f"Starting new undetected_chromedriver instance ({profile.name} profile)...")
+    with _launch_lock, metrics.timer("driver_launch"):
+        return launch_chrome(profile)
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _driver_alive(driver) -> bool:
     """
-    Lance un nouveau Chrome undetected_chromedriver avec une taille de fenêtre fixe.
+    Bilan de santé entre deux pages : la session répond-elle encore ?
     """
-    logger.info("Starting new undetected_chromedriver instance...")
-    driver = uc.Chrome()
-    driver.set_window_size(1400, 1000)
-    return driver
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+class _DriverPool:
+    """
+    Un driver par thread worker, plus `spares` drivers lancés d'avance en
+    arrière-plan (pré-chauffés).
+
+    À chaque page, le driver du thread est contrôlé : s'il ne répond plus,
+    s'il a servi `max_pages` pages ou si son Chrome dépasse `max_rss_mb` Mo
+    (mesuré avec psutil, ignoré s'il n'est pas installé), il est fermé et
+    remplacé par un driver chaud (sinon lancé à froid). Un driver chaud est
+    lui aussi contrôlé avant d'être confié à un worker.
+    relaunch() (après un crash) fait de même, sans attendre s'il reste un
+    driver chaud. Garde la trace de tous les drivers pour les fermer à la fin.
+    """
+
+    def __init__(
+        self,
+        profile: BrowserProfile | None = None,
+        spares: int = 0,
+        max_pages: int = 0,
+        max_rss_mb: float = 0,
+    ):
+        self.profile = profile
+        self.spares = spares
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        if max_rss_mb and not rss_supported():
+            logger.warning("psutil is not installed: the Chrome memory limit "
+                           f"({max_rss_mb:g} MB) will not be checked.")
+            self.max_rss_mb = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._drivers = set()
+        self._warm = queue.Queue()
+        self._closed = False
+        self._warmer = ThreadPoolExecutor(max_workers=1) if spares > 0 else None
+        for _ in range(spares):
+            self._warmer.submit(self._launch_spare)
+
+    # -- lancement -------------------------------------------------------
+    def _launch_spare(self):
+        if self._closed:
+            return
+        try:
+            driver = _launch_driver(self.profile)
+        except Exception:
+            logger.exception("Could not pre-warm a driver.")
+            return
+        metrics.inc("driver_launches", kind="warm")
+        with self._lock:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._drivers.add(driver)
+        if closed:
+            _quit_driver(driver)
+        else:
+            self._warm.put(driver)
+
+    def _take(self):
+        """
+        Driver chaud si disponible et encore vivant (et on en relance un en
+        arrière-plan), sinon lancement à froid.
+        """
+        while True:
+            try:
+                driver = self._warm.get_nowait()
+            except queue.Empty:
+                driver = None
+                break
+            self._warmer.submit(self._launch_spare)
+            if _driver_alive(driver):
+                break
+            # Chrome d'un driver chaud mort pendant l'attente
+            logger.info("Discarding pre-warmed driver: session does not respond.")
+            metrics.inc("driver_recycles", reason="spare_unresponsive")
+            with self._lock:
+                self._drivers.discard(driver)
+            _quit_driver(driver)
+        if driver is None:
+            driver = _launch_driver(self.profile)
+            metrics.inc("driver_launches", kind="cold")
+            with self._lock:
+                self._drivers.add(driver)
+        self._local.driver = driver
+        self._local.pages = 0
+        return driver
+
+    def _retire(self, driver):
+        with self._lock:
+            self._drivers.discard(driver)
+        _quit_driver(driver)
+        self._local.driver = None
+
+    # -- contrôle entre deux pages -----------------------------------------
+    def _recycle_reason(self, driver) -> tuple[str, str] | None:
+        """
+        (raison courte pour les métriques, message) si le driver doit être remplacé.
+        """
+        pages = getattr(self._local, "pages", 0)
+        if self.max_pages and pages >= self.max_pages:
+            return "pages", f"{pages} pages served"
+        if self.max_rss_mb:
+            rss = chrome_rss(driver)
+            if rss is not None and rss > self.max_rss_mb * 2**20:
+                return "memory", f"Chrome uses {rss / 2**20:.0f} MB"
+        if pages and not _driver_alive(driver):
+            return "unresponsive", "session does not respond"
+        return None
+
+    def get(self):
+        driver = getattr(self._local, "driver", None)
+        if driver is not None:
+            reason = self._recycle_reason(driver)
+            if reason is not None:
+                kind, message = reason
+                logger.info(f"Recycling driver: {message}.")
+                metrics.inc("driver_recycles", reason=kind)
+                self._retire(driver)
+                driver = None
+        if driver is None:
+            driver = self._take()
+        self._local.pages += 1
+        return driver
+
+    def relaunch(self):
+        """
+        Ferme le driver du thread courant et le remplace (chaud si possible).
+        """
+        metrics.inc("driver_restarts")
+        old = getattr(self._local, "driver", None)
+        if old is not None:
+            self._retire(old)
+        # La pause avant de réessayer la page est celle du throttle, qui a
+        # compté l'erreur (plus de délai fixe avant la relance)
+        return self._take()
+
+    def quit_all(self):
+        with self._lock:
+            self._closed = True
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        if self._warmer is not None:
+            self._warmer.shutdown(wait=False, cancel_futures=True)
+        for driver in drivers:
+            _quit_driver(driver)
 
 
 # --------------------------------------------------------------------
-# Parsing d'une journée
+# Parsing d'une page (journée, semaine ou mois)
 # --------------------------------------------------------------------
-def parse_calendar_day(
-    driver,
-    the_date: datetime,
-    scrape_details: bool = False,
-    existing_df: pd.DataFrame | None = None,
-) -> pd.DataFrame:
+def get_day_from_day_breaker(row, fallback_date: datetime, tzname: str) -> datetime | None:
     """
-    Scrape une seule journée et renvoie un DataFrame filtré sur:
-      - High Impact Expected
-      - Medium Impact Expected
-    Colonnes : DateTime, Currency, Impact, Event, Actual, Forecast, Previous, Detail
+    Lit la date d'une ligne "day-breaker" (ex. "Sun Jan 5") via Selenium.
+    L'année est déduite de fallback_date. Renvoie None si la ligne n'est pas une date.
     """
+    try:
+        cell = row.find_element(By.XPATH, ".//td")
+        text = cell.get_attribute("textContent") or ""
+    except (NoSuchElementException, StaleElementReferenceException):
+        return None
+    return parse_day_breaker_text(text, fallback_date, tzname)
 
-    date_str = the_date.strftime("%b%d.%Y").lower()
-    url = f"https://www.forexfactory.com/calendar?day={date_str}"
 
+def _load_calendar_page(driver, url: str, the_date: datetime) -> bool:
+    """
+    Charge la page et attend la table du calendrier.
+    Renvoie False si la table n'apparaît pas.
+    """
     logger.info(f"Scraping URL: {url}")
 
     # Sécurité : timeout de chargement de page
     driver.set_page_load_timeout(180)
-    driver.get(url)
+    with metrics.timer("page_load", url=url):
+        driver.get(url)
 
     try:
-        WebDriverWait(driver, 25).until(
-            EC.visibility_of_element_located(
-                (By.XPATH, '//table[contains(@class,"calendar__table")]')
+        with metrics.timer("table_wait", url=url):
+            WebDriverWait(driver, 25).until(
+                EC.visibility_of_element_located(
+                    (By.XPATH, '//table[contains(@class,"calendar__table")]')
+                )
             )
-        )
     except TimeoutException:
         logger.warning(f"Calendar did not load for {the_date.date()}")
-        return pd.DataFrame(
-            columns=[
-                "DateTime",
-                "Currency",
-                "Impact",
-                "Event",
-                "Actual",
-                "Forecast",
-                "Previous",
-                "Detail",
-            ]
+        return False
+    return True
+
+
+def parse_calendar_page(
+    driver,
+    param: str,
+    the_date: datetime,
+    scrape_details: bool = False,
+    existing_df: pd.DataFrame | None = None,
+    engine: str = "html",
+    detail_index: DetailIndex | None = None,
+    raise_on_timeout: bool = False,
+    detail_cache: DetailCache | None = None,
+    detail_keys: set | None = None,
+    throttle: AimdThrottle | None = None,
+) -> pd.DataFrame:
+    """
+    Charge la page calendar?<param> (day=, range= ou month=) et renvoie ses
+    lignes filtrées sur High/Medium impact. the_date est le premier jour de la
+    page ; les lignes suivantes sont datées grâce aux lignes "day-breaker".
+
+    engine="html" : un seul driver.page_source, parsé hors ligne avec lxml.
+    engine="selenium" : extraction cellule par cellule via WebDriver.
+    Les détails nécessitent des clics, ils passent donc toujours par Selenium.
+    Les détails déjà connus sont pris dans detail_index (construit à partir
+    de existing_df s'il n'est pas fourni), puis dans detail_cache (specs par
+    série Currency/Event) avant tout clic.
+    Si la table n'apparaît pas : DataFrame vide, ou CalendarLoadError avec
+    raise_on_timeout=True (pour distinguer une page vide d'un échec).
+    Chaque clic de détail prend un jeton de `throttle` (rythme global).
+    """
+
+    url = calendar_url(param)
+
+    if not _load_calendar_page(driver, url, the_date):
+        if raise_on_timeout:
+            raise CalendarLoadError(url)
+        return pd.DataFrame(columns=CSV_COLUMNS)
+
+    if engine == "html" and not scrape_details:
+        try:
+            page_source = driver.page_source
+            with metrics.timer("extract_html"):
+                return parse_calendar_html(page_source, the_date)
+        except Exception:
+            # On retombe sur l'extraction Selenium si le snapshot est inexploitable
+            logger.exception(
+                f"HTML snapshot parsing failed for {url}, "
+                f"falling back to Selenium extraction."
+            )
+
+    if scrape_details and detail_index is None:
+        detail_index = DetailIndex.from_dataframe(existing_df)
+
+    with metrics.timer("extract_selenium", details=scrape_details):
+        return _extract_rows_selenium(
+            driver,
+            the_date,
+            scrape_details=scrape_details,
+            detail_index=detail_index,
+            detail_cache=detail_cache,
+            detail_keys=detail_keys,
+            throttle=throttle,
         )
 
+
+def parse_calendar_day(
+    driver,
+    the_date: datetime,
+    scrape_details: bool = False,
+    existing_df: pd.DataFrame | None = None,
+    engine: str = "html",
+    detail_index: DetailIndex | None = None,
+    detail_cache: DetailCache | None = None,
+) -> pd.DataFrame:
+    """
+    Scrape une seule journée et renvoie un DataFrame filtré sur:
+      - High Impact Expected
+      - Medium Impact Expected
+    Colonnes : DateTime, Currency, Impact, Event, Actual, Forecast, Previous, Detail
+    """
+    return parse_calendar_page(
+        driver,
+        build_url_for_day(the_date),
+        the_date,
+        scrape_details=scrape_details,
+        existing_df=existing_df,
+        engine=engine,
+        detail_index=detail_index,
+        detail_cache=detail_cache,
+    )
+
+
+def _extract_rows_selenium(
+    driver,
+    the_date: datetime,
+    scrape_details: bool = False,
+    detail_index: DetailIndex | None = None,
+    detail_cache: DetailCache | None = None,
+    detail_keys: set | None = None,
+    throttle: AimdThrottle | None = None,
+) -> pd.DataFrame:
+    """
+    Extraction des lignes de la page déjà chargée via des appels WebDriver.
+    Avec detail_keys (clés DetailIndex.key), seules ces lignes sont dépliées.
+    """
     rows = driver.find_elements(
         By.XPATH, '//tr[contains(@class,"calendar__row")]'
     )
@@ -113,8 +434,15 @@ def parse_calendar_day(
         except StaleElementReferenceException:
             continue
 
-        # On ignore les séparateurs, lignes sans event, etc.
-        if "day-breaker" in row_class or "no-event" in row_class:
+        # Séparateur de jours : on met à jour la date courante
+        if "day-breaker" in row_class:
+            breaker_day = get_day_from_day_breaker(row, current_day, None)
+            if breaker_day is not None:
+                current_day = breaker_day
+            continue
+
+        # On ignore les lignes sans event
+        if "no-event" in row_class:
             continue
 
         try:
@@ -169,81 +497,82 @@ def parse_calendar_day(
         # ----------------------------------------------------------------
         # Conversion heure → datetime
         # ----------------------------------------------------------------
-        event_dt = current_day
-        t = time_text.lower()
-
-        if "day" in t:
-            # "All Day" ou similaire
-            event_dt = event_dt.replace(hour=23, minute=59, second=59)
-        else:
-            m = re.match(r"(\d{1,2}):(\d{2})(am|pm)", t)
-            if m:
-                hh = int(m.group(1))
-                mm = int(m.group(2))
-                ap = m.group(3)
-                if ap == "pm" and hh < 12:
-                    hh += 12
-                if ap == "am" and hh == 12:
-                    hh = 0
-                event_dt = event_dt.replace(hour=hh, minute=mm, second=0)
+        event_dt = event_datetime(current_day, time_text)
 
         # ----------------------------------------------------------------
         # Gestion des détails
         # ----------------------------------------------------------------
         detail_str = ""
         if scrape_details:
-            # 1) On regarde d'abord dans le CSV existant
-            if existing_df is not None and not existing_df.empty:
-                try:
-                    matched = existing_df[
-                        (existing_df["DateTime"] == event_dt.isoformat())
-                        & (existing_df["Currency"].str.strip() == currency_text)
-                        & (existing_df["Event"].str.strip() == event_text)
-                    ]
-                    if not matched.empty:
-                        existing_detail = matched.iloc[0].get("Detail", "")
-                        if isinstance(existing_detail, str) and existing_detail.strip():
-                            detail_str = existing_detail.strip()
-                except Exception:
-                    # On ne bloque pas si problème sur existing_df
-                    pass
-
-            # 2) Si aucun détail trouvé → on tente de les récupérer
-            if not detail_str:
-                try:
-                    detail_link = row.find_element(
-                        By.XPATH,
-                        './/td[contains(@class,"calendar__detail")]/a',
-                    )
-                    driver.execute_script(
-                        "arguments[0].scrollIntoView({behavior:'instant',block:'center'});",
-                        detail_link,
-                    )
-                    time.sleep(0.5)
-                    detail_link.click()
-
-                    WebDriverWait(driver, 7).until(
-                        EC.visibility_of_element_located(
-                            (
-                                By.XPATH,
-                                '//tr[contains(@class,"calendar__details--detail")]',
-                            )
-                        )
-                    )
-                    detail_data = parse_detail_table(driver)
-                    detail_str = detail_data_to_string(detail_data)
-                except Exception:
-                    # Si erreur sur les détails, on laisse vide
-                    detail_str = ""
-                finally:
-                    # Fermer la ligne de détail si possible
+            # 1) On regarde d'abord dans l'index des détails déjà connus (O(1))
+            if detail_index is not None:
+                detail_str = detail_index.get(
+                    event_dt.isoformat(), currency_text, event_text
+                )
+                if detail_str:
+                    metrics.inc("detail_lookups", source="index")
+
+            # 2) Puis dans le cache par série (Currency, Event), toutes dates
+            #    confondues : pas de clic si les specs sont déjà connues
+            if not detail_str and detail_cache is not None:
+                detail_str = detail_cache.value(
+                    detail_cache.get(currency_text, event_text)
+                )
+                if detail_str:
+                    metrics.inc("detail_lookups", source="series_cache")
+
+            # 3) Si aucun détail trouvé → on tente de les récupérer
+            #    (uniquement pour les lignes demandées si detail_keys est fourni)
+            wanted = detail_keys is None or DetailIndex.key(
+                event_dt.isoformat(), currency_text, event_text
+            ) in detail_keys
+            if not detail_str and wanted:
+                metrics.inc("detail_lookups", source="click")
+                with metrics.timer("detail_click", currency=currency_text, calendar_event=event_text):
                     try:
-                        close_btn = row.find_element(
-                            By.XPATH, './/a[@title="Close Detail"]'
+                        detail_link = row.find_element(
+                            By.XPATH,
+                            './/td[contains(@class,"calendar__detail")]/a',
                         )
-                        close_btn.click()
+                        driver.execute_script(
+                            "arguments[0].scrollIntoView({behavior:'instant',block:'center'});",
+                            detail_link,
+                        )
+                        # Un clic = une requête vers le site : même rythme
+                        # que les pages (au lieu d'une pause fixe)
+                        if throttle is not None:
+                            throttle.wait()
+                        detail_link.click()
+
+                        WebDriverWait(driver, 7).until(
+                            EC.visibility_of_element_located(
+                                (
+                                    By.XPATH,
+                                    '//tr[contains(@class,"calendar__details--detail")]',
+                                )
+                            )
+                        )
+                        detail_data = parse_detail_table(driver)
+                        detail_str = detail_data_to_string(detail_data)
+                        if detail_str and detail_cache is not None:
+                            # Le cache par série ne garde pas ce qui est propre
+                            # à cette publication (« Next Release »)
+                            series_str = detail_data_to_string(series_specs(detail_data))
+                            if series_str:
+                                detail_cache.put(currency_text, event_text, series_str)
+                            detail_str = detail_cache.value(detail_str)
                     except Exception:
-                        pass
+                        # Si erreur sur les détails, on laisse vide
+                        detail_str = ""
+                    finally:
+                        # Fermer la ligne de détail si possible
+                        try:
+                            close_btn = row.find_element(
+                                By.XPATH, './/a[@title="Close Detail"]'
+                            )
+                            close_btn.click()
+                        except Exception:
+                            pass
 
         data_list.append(
             {
@@ -258,23 +587,222 @@ def parse_calendar_day(
             }
         )
 
-    return pd.DataFrame(data_list)
+    return pd.DataFrame(data_list, columns=CSV_COLUMNS)
 
 
 # --------------------------------------------------------------------
-# Wrapper pour scrapper une journée
+# Wrappers pour scrapper une page / une journée
 # --------------------------------------------------------------------
+def scrape_page(
+    driver,
+    page: CalendarPage,
+    existing_df: pd.DataFrame,
+    scrape_details: bool = False,
+    engine: str = "html",
+    detail_index: DetailIndex | None = None,
+    detail_cache: DetailCache | None = None,
+    detail_keys: set | None = None,
+    throttle: AimdThrottle | None = None,
+) -> pd.DataFrame:
+    return parse_calendar_page(
+        driver,
+        page.param,
+        page.start,
+        scrape_details=scrape_details,
+        existing_df=existing_df,
+        engine=engine,
+        detail_index=detail_index,
+        raise_on_timeout=True,
+        detail_cache=detail_cache,
+        detail_keys=detail_keys,
+        throttle=throttle,
+    )
+
+
+def snapshot_page(driver, page: CalendarPage) -> str:
+    """
+    Charge la page et renvoie son HTML (driver.page_source) sans l'analyser.
+    """
+    url = calendar_url(page.param)
+    if not _load_calendar_page(driver, url, page.start):
+        raise CalendarLoadError(url)
+    return driver.page_source
+
+
 def scrape_day(
     driver,
     the_date: datetime,
     existing_df: pd.DataFrame,
     scrape_details: bool = False,
+    engine: str = "html",
 ) -> pd.DataFrame:
     return parse_calendar_day(
-        driver, the_date, scrape_details=scrape_details, existing_df=existing_df
+        driver,
+        the_date,
+        scrape_details=scrape_details,
+        existing_df=existing_df,
+        engine=engine,
     )
 
 
+# --------------------------------------------------------------------
+# Une page avec relance du driver en cas de crash
+# --------------------------------------------------------------------
+def _throttle_signal(exc: Exception) -> str | None:
+    """
+    Signal transmis au throttle pour une requête qui a levé `exc` :
+    challenge, timeout, erreur réseau/driver, ou None (bug de parsing, etc.,
+    sans rapport avec le rythme des requêtes).
+    """
+    if isinstance(exc, (ChallengeError, CalendarLoadError)):
+        return "challenge"
+    if isinstance(exc, (TimeoutException, ReadTimeoutError)):
+        return "timeout"
+    if isinstance(exc, DRIVER_ERRORS + (FetchError,)):
+        return "error"
+    return None
+
+
+def _scrape_page_with_retries(
+    slots: _DriverPool,
+    page: CalendarPage,
+    existing_df: pd.DataFrame,
+    scrape_details: bool = False,
+    engine: str = "html",
+    detail_index: DetailIndex | None = None,
+    detail_cache: DetailCache | None = None,
+    detail_keys: set | None = None,
+    snapshot: bool = False,
+    throttle: AimdThrottle | None = None,
+) -> pd.DataFrame | str | None:
+    """
+    Scrape une page avec le driver du thread courant.
+    Avec snapshot=True, renvoie le HTML brut de la page (snapshot_page).
+    Chaque tentative passe par `throttle` (créneau + jeton) et lui rapporte
+    son issue : après un crash, la tentative suivante attend son rythme.
+    Renvoie None si la page n'a pas pu être récupérée.
+    """
+    throttle = throttle or AimdThrottle()
+    # Latences comparées entre pages du même type (les clics allongent la page)
+    kind = "browser_details" if scrape_details and not snapshot else "browser"
+    attempts = 0
+    while attempts < MAX_DAY_ATTEMPTS:
+        try:
+            driver = slots.get()
+            with throttle.request(kind, classify=_throttle_signal):
+                if snapshot:
+                    return snapshot_page(driver, page)
+                return scrape_page(
+                    driver,
+                    page,
+                    existing_df,
+                    scrape_details=scrape_details,
+                    engine=engine,
+                    detail_index=detail_index,
+                    detail_cache=detail_cache,
+                    detail_keys=detail_keys,
+                    throttle=throttle,
+                )
+
+        except DRIVER_ERRORS as e:
+            attempts += 1
+            metrics.inc("page_retries")
+            logger.error(
+                f"Driver error on {page.param} "
+                f"(attempt {attempts}/{MAX_DAY_ATTEMPTS}): {e}"
+            )
+            # On tente de relancer le driver puis on réessaie la même page
+            slots.relaunch()
+
+        except CalendarLoadError:
+            logger.warning(f"Calendar did not load for {page.param}, skipping this page.")
+            return None
+
+        except Exception:
+            # Erreur inattendue : on log et on passe à la page suivante
+            logger.exception(
+                f"Unexpected error on {page.param}, skipping this page."
+            )
+            return None
+
+    logger.warning(
+        f"Failed to scrape {page.param} after {MAX_DAY_ATTEMPTS} attempts, skipping."
+    )
+    return None
+
+
+class _HttpBackend:
+    """
+    Backend HTTP sans navigateur, avec repli sur Chrome quand la page
+    est protégée (challenge) ou indisponible.
+    """
+
+    def __init__(self, fetcher, throttle: AimdThrottle | None = None):
+        self.fetcher = fetcher
+        self.throttle = throttle or AimdThrottle()
+        self._lock = threading.Lock()
+        self._challenges = 0
+        self.disabled = False
+
+    def fetch_html(self, page: CalendarPage) -> str | None:
+        """
+        HTML brut de la page, ou None si elle doit être récupérée via le navigateur.
+        """
+        if self.disabled:
+            return None
+        try:
+            with metrics.timer("http_fetch"), \
+                    self.throttle.request("http", classify=_throttle_signal):
+                html = self.fetcher.fetch(page.param)
+        except ChallengeError as e:
+            metrics.inc("http_fetches", result="challenge")
+            with self._lock:
+                self._challenges += 1
+                if self._challenges >= MAX_HTTP_CHALLENGES and not self.disabled:
+                    self.disabled = True
+                    logger.warning(
+                        "HTTP backend challenged repeatedly, using the browser for the rest of the run."
+                    )
+            logger.warning(f"{e} -> browser fallback for {page.param}")
+            return None
+        except FetchError as e:
+            metrics.inc("http_fetches", result="error")
+            logger.warning(f"{e} -> browser fallback for {page.param}")
+            return None
+
+        metrics.inc("http_fetches", result="ok")
+        with self._lock:
+            self._challenges = 0
+        return html
+
+
+def _manifest_days(manifest: CoverageManifest | None, page: CalendarPage) -> dict:
+    """
+    Entrées du manifeste pour les jours de la page (journal de progression).
+    """
+    if manifest is None:
+        return {}
+    days = {}
+    day = page.start
+    while day.date() <= page.end.date():
+        key = day.strftime("%Y-%m-%d")
+        if key in manifest.days:
+            days[key] = manifest.days[key]
+        day += timedelta(days=1)
+    return days
+
+
+def _in_range(df: pd.DataFrame, from_date: datetime, to_date: datetime) -> pd.DataFrame:
+    """
+    Garde les lignes dont la date (préfixe AAAA-MM-JJ de DateTime) est dans la plage.
+    """
+    if df.empty:
+        return df
+    day = df["DateTime"].str[:10]
+    mask = (day >= from_date.strftime("%Y-%m-%d")) & (day <= to_date.strftime("%Y-%m-%d"))
+    return df[mask]
+
+
 # --------------------------------------------------------------------
 # Boucle principale sur la plage de dates
 # --------------------------------------------------------------------
@@ -283,102 +811,302 @@ def scrape_range_pandas(
     to_date: datetime,
     output_csv: str,
     tzname: str = "Africa/Casablanca",
-    scrape_details: bool = False,
+    config: ScrapeConfig | None = None,
+    **options,
 ):
     """
-    Scrape de from_date à to_date (inclus) avec :
+    Scrape de from_date à to_date (inclus). Les options sont regroupées dans
+    `config` (config.ScrapeConfig : fetch, details, storage, metrics, resume,
+    chaque option y est décrite) ; `options` les donne à plat sous leur nom
+    (workers=4, store="sqlite"...) par-dessus `config`.
+
+      - Dates lues comme des jours calendaires dans `tzname` : les pages
+        et les heures des événements sont datées dans ce fuseau (heure
+        d'été comprise), quel que soit le tzinfo de from_date/to_date/days.
+        Le site est réglé sur ce fuseau (cookie de fuseau du site, sur les
+        requêtes HTTP comme dans Chrome) : pages HTTP et pages du navigateur
+        arrivent dans le même fuseau
+      - Normalisation (normalize.normalize) de chaque page au merge :
+        valeurs numériques, unités, surprise, drapeaux All Day/Tentative
       - Filtrage High/Medium impact
       - Driver UC qui se relance en cas de crash
-      - Écriture CSV incrémentale
+      - `workers` drivers en parallèle (un par thread), les journées étant
+        fusionnées dans l'ordre chronologique par un seul thread d'écriture
+      - Pipeline par étages (pipeline.run_pipeline) : téléchargement de la
+        page N+1, parsing de la page N et écriture de la page N-1 en même
+        temps, avec un nombre borné de pages en vol ; une page illisible
+        repart vers le navigateur sur un thread de téléchargement. Utilisable
+        depuis une boucle asyncio déjà active (notebook)
+      - Écriture incrémentale après chaque page, dans le cache choisi
+      - `progress` : plan des pages, pages en cours et pages enregistrées
+        (fsync après chaque page), checkpoint atomique à chaque sauvegarde
+        du manifeste, supprimé à la fin d'un run complet ; un run
+        interrompu reprend là où il s'est arrêté
+      - Rythme adaptatif (throttle.AimdThrottle) : une page lente, un
+        timeout ou un challenge réduit concurrence et débit de moitié ;
+        les succès les font remonter progressivement
+      - Mesures (metrics.current()) : temps par étage et par page, compteurs
     """
 
-    ensure_csv_header(output_csv)
-    existing_df = read_existing_data(output_csv)
+    config = ScrapeConfig.from_options(config, **options)
+    fetch, details, storage = config.fetch, config.details, config.storage
+    # Réaffectés plus bas (jours dans le fuseau, découpage en pages, fetcher
+    # et throttle par défaut, pas de cache de pages avec les détails)
+    days, pages = config.resume.days, config.resume.pages
+    manifest, progress = config.resume.manifest, config.resume.progress
+    fetcher, throttle, page_cache = fetch.fetcher, fetch.throttle, fetch.page_cache
+    profile_day = config.metrics.profile_day
 
-    driver = _launch_driver()
+    # Le site affiche les heures dans ce fuseau (épinglé sur chaque backend)
+    tz = gettz(tzname)
+    from_date, to_date = from_date.replace(tzinfo=tz), to_date.replace(tzinfo=tz)
+    if days is not None:
+        days = [d.replace(tzinfo=tz) for d in days]
+
+    # Le journal de progression marque une page enregistrée dès write() :
+    # elle doit être sur disque à ce moment-là
+    writer = open_writer(output_csv, store=storage.store, store_path=storage.store_path,
+                         write_mode=storage.write_mode, compact_every=storage.compact_every,
+                         export_csv=storage.export_csv, durable=progress is not None)
+    existing_df = writer.read()
+    # Index clé -> Detail partagé par les workers, construit une seule fois
+    # puis tenu à jour à chaque merge.
+    detail_index = DetailIndex.from_dataframe(existing_df) if details.scrape_details else None
+    # Cache gardé en mémoire sous forme typée (dates, catégories), bien plus
+    # compacte, et normalisée ; les lignes scrapées y sont converties au merge
+    existing_df = normalize(to_typed(existing_df, tz))
+    detail_cache = None
+    if details.scrape_details:
+        detail_cache = DetailCache.load(
+            detail_cache_path(output_csv),
+            max_age_days=details.detail_max_age_days,
+            store_refs=details.detail_refs,
+        )
+
+    slots = _DriverPool(
+        get_profile(fetch.browser_profile, headless=fetch.headless, timezone=tzname),
+        spares=fetch.spare_drivers,
+        max_pages=fetch.recycle_pages,
+        max_rss_mb=fetch.max_browser_rss_mb,
+    )
+    if throttle is None:
+        throttle = AimdThrottle(max_concurrency=max(1, fetch.workers), max_rate=fetch.max_rate)
+    http = None
+    own_fetcher = None
+    if fetch.backend == "http" and not details.scrape_details:
+        if fetcher is None:
+            fetcher = own_fetcher = HttpFetcher(pool_size=max(1, fetch.workers))
+        # Même fuseau que les pages de repli du navigateur
+        fetcher.tzname = tzname
+        http = _HttpBackend(fetcher, throttle)
     total_new = 0
-    current = from_date
-    day_count = (to_date - from_date).days + 1
+    if pages is not None:
+        pages = [
+            CalendarPage(page.start.replace(tzinfo=tz), page.end.replace(tzinfo=tz), page.param)
+            for page in pages
+        ]
+        day_count = sum((page.end - page.start).days + 1 for page in pages)
+    elif days is None:
+        day_count = (to_date - from_date).days + 1
+        pages = list(iter_calendar_pages(from_date, to_date, fetch.granularity))
+    else:
+        day_count = len(days)
+        pages = [
+            page
+            for first, last in contiguous_runs(sorted(days))
+            for page in iter_calendar_pages(first, last, fetch.granularity)
+        ]
 
     logger.info(
         f"Scraping from {from_date.date()} to {to_date.date()} "
-        f"({day_count} days) into {output_csv}"
+        f"({day_count} days, {len(pages)} pages, {fetch.workers} worker(s)) into {output_csv}"
     )
 
-    try:
-        while current <= to_date:
-            logger.info(f"Day: {current.strftime('%Y-%m-%d')}")
-
-            # On autorise plusieurs tentatives pour cette journée
-            attempts = 0
-            max_attempts = 3
-            df_new = pd.DataFrame()
-
-            while attempts < max_attempts:
-                try:
-                    df_new = scrape_day(
-                        driver,
-                        current,
-                        existing_df,
-                        scrape_details=scrape_details,
-                    )
-                    break  # succès → on sort de la boucle de retry
-
-                except (
-                    InvalidSessionIdException,
-                    WebDriverException,
-                    ReadTimeoutError,
-                    MaxRetryError,
-                ) as e:
-                    attempts += 1
-                    logger.error(
-                        f"Driver error on {current.date()} "
-                        f"(attempt {attempts}/{max_attempts}): {e}"
-                    )
-                    # On tente de relancer le driver
-                    try:
-                        driver.quit()
-                    except Exception:
-                        pass
-                    time.sleep(2)
-                    driver = _launch_driver()
-                    # On réessaie la même journée
-                    continue
-
-                except Exception as e:
-                    # Erreur inattendue : on log et on passe au jour suivant
-                    logger.exception(
-                        f"Unexpected error on {current.date()}, skipping this day."
-                    )
-                    df_new = pd.DataFrame()
-                    break
+    if progress is not None:
+        progress.plan(pages)
 
-            if attempts == max_attempts and df_new.empty:
-                logger.warning(
-                    f"Failed to scrape {current.date()} after {max_attempts} attempts, skipping."
-                )
-                current += timedelta(days=1)
-                continue
-
-            # Merge et écriture CSV
-            if not df_new.empty:
-                merged = merge_new_data(existing_df, df_new)
-                new_rows = len(merged) - len(existing_df)
-                if new_rows > 0:
-                    logger.info(f"Added {new_rows} rows")
-                existing_df = merged
-                write_data_to_csv(existing_df, output_csv)
-                total_new += new_rows
-
-            # Jour suivant
-            current += timedelta(days=1)
+    # Avec le cache de pages, le navigateur renvoie le HTML brut (parsé à
+    # l'étage suivant) pour pouvoir l'archiver
+    snapshots = page_cache is not None and fetch.engine == "html" and not details.scrape_details
+    if details.scrape_details:
+        page_cache = None
 
-    finally:
+    profiler = None
+    if profile_day is not None:
+        profiler = DayProfiler(profile_day.date(), profile_path(output_csv, profile_day))
+    # Début du traitement de chaque page, pour sa durée totale
+    page_started = {}
+
+    def instrumented(stage):
+        def run(page, value):
+            with metrics.context(page=page.param), \
+                    (profiler.around(page.start.date(), page.end.date()) if profiler else nullcontext()):
+                return stage(page, value)
+        return run
+
+    def browser_page(page, snapshot=False):
+        return _scrape_page_with_retries(
+            slots,
+            page,
+            None,
+            scrape_details=details.scrape_details,
+            engine=fetch.engine,
+            detail_index=detail_index,
+            detail_cache=detail_cache,
+            detail_keys=details.detail_keys,
+            snapshot=snapshot,
+            throttle=throttle,
+        )
+
+    # Étage 1 : téléchargement (HTTP) ou chargement + extraction (navigateur,
+    # les clics et l'extraction Selenium ont besoin de la page vivante)
+    def fetch_one(page, _):
+        page_started[page.param] = time.perf_counter()
+        if progress is not None:
+            progress.page_started(page)
+        if page.start == page.end:
+            logger.info(f"Day: {page.start.strftime('%Y-%m-%d')}")
+        else:
+            logger.info(
+                f"Days: {page.start.strftime('%Y-%m-%d')} -> {page.end.strftime('%Y-%m-%d')}"
+            )
+        if page_cache is not None:
+            html = page_cache.get(page)
+            metrics.inc("page_cache", result="miss" if html is None else "hit")
+            if html is not None:
+                logger.info(f"Page cache hit for {page.param}")
+                return html
+        if http is not None:
+            html = http.fetch_html(page)
+            if html is not None:
+                if page_cache is not None:
+                    page_cache.put(page, html)
+                return html
+        fetched = browser_page(page, snapshot=snapshots)
+        if isinstance(fetched, str):
+            page_cache.put(page, fetched)
+        return fetched
+
+    # Étage 2 : parsing des pages HTML (HTTP, cache, snapshots navigateur) ;
+    # les pages extraites via Selenium arrivent déjà parsées
+    def parse_one(page, fetched):
+        if not isinstance(fetched, str):
+            return fetched
         try:
-            driver.quit()
+            with metrics.timer("extract_html"):
+                return parse_calendar_html(fetched, page.start)
         except Exception:
-            pass
+            logger.exception(f"Could not parse fetched page for {page.param}, browser fallback.")
+            return _BROWSER_FALLBACK
+
+    # Étage 2 bis : repli navigateur des pages illisibles, sur les threads de
+    # téléchargement (leurs drivers du pool : pas de Chrome en plus des
+    # workers, recyclage et limite mémoire compris)
+    def fallback_one(page, parsed):
+        if parsed is _BROWSER_FALLBACK:
+            return browser_page(page)
+        return parsed
+
+    # Étage 3 : merge et écriture (un seul thread, dans l'ordre des pages)
+    n_page = 0
+
+    def persist(page, df_new):
+        nonlocal existing_df, total_new, n_page
+        n_page += 1
+        if df_new is None:
+            # Échec : ni merge ni couverture, la page sera retentée au prochain run
+            metrics.inc("pages", result="failed")
+            _page_done(page, rows=0, added=0, ok=False)
+            return
+        # Une page ?month= peut déborder de la plage demandée
+        df_new = _in_range(df_new, page.start, page.end)
+        new_rows = 0
+        if not df_new.empty:
+            delta = changed_rows(existing_df, df_new)
+            merged = merge_new_data(existing_df, normalize(df_new))
+            new_rows = len(merged) - len(existing_df)
+            if new_rows > 0:
+                logger.info(f"Added {new_rows} rows for {page.param}")
+            existing_df = merged
+            if detail_index is not None:
+                detail_index.update(delta)
+            if detail_cache is not None and detail_cache.store_refs and detail_cache.dirty:
+                # Les textes référencés (ref:<id>) sont sur disque avant les
+                # lignes qui y renvoient
+                detail_cache.save()
+            with metrics.timer("store_write", store=storage.store, write_mode=storage.write_mode):
+                writer.write(existing_df, delta, df_new)
+            total_new += new_rows
+        metrics.inc("pages", result="ok")
+        metrics.inc("rows_scraped", len(df_new))
+        metrics.inc("rows_added", max(new_rows, 0))
+        _page_done(page, rows=len(df_new), added=new_rows, ok=True)
+
+        if manifest is not None:
+            manifest.record_page(page.start, page.end, df_new)
+        if progress is not None:
+            # La page est dans le cache : elle ne sera plus refaite
+            progress.page_done(page, _manifest_days(manifest, page))
+        if manifest is not None and n_page % MANIFEST_SAVE_EVERY == 0:
+            manifest.save()
+        if progress is not None and n_page % MANIFEST_SAVE_EVERY == 0:
+            progress.checkpoint()
+        if detail_cache is not None and n_page % MANIFEST_SAVE_EVERY == 0:
+            detail_cache.save()
+        if n_page % MANIFEST_SAVE_EVERY == 0:
+            metrics.current().flush()
+
+    def _page_done(page, rows, added, ok):
+        seconds = time.perf_counter() - page_started.pop(page.param, time.perf_counter())
+        metrics.observe("page_seconds", seconds)
+        metrics.trace(
+            "page",
+            first_day=page.start.strftime("%Y-%m-%d"),
+            last_day=page.end.strftime("%Y-%m-%d"),
+            rows=rows,
+            added=added,
+            ok=ok,
+            seconds=round(seconds, 6),
+        )
+
+    try:
+        # Les étages travaillent en parallèle sur des pages différentes ; au
+        # plus 2 pages par worker en vol (contre-pression sur le téléchargement)
+        run_pipeline(
+            pages,
+            [
+                Stage("fetch", instrumented(fetch_one), max(1, fetch.workers)),
+                Stage("parse", instrumented(parse_one), 1),
+                Stage("fallback", instrumented(fallback_one), max(1, fetch.workers), pool="fetch"),
+            ],
+            instrumented(persist),
+            max_in_flight=2 * max(1, fetch.workers) + 2,
+        )
+
+    finally:
+        slots.quit_all()
+        if own_fetcher is not None:
+            own_fetcher.close()
+        if manifest is not None:
+            manifest.save()
+        if progress is not None:
+            progress.checkpoint()
+        if detail_cache is not None:
+            detail_cache.save()
+        if profiler is not None:
+            profiler.dump()
 
-    # Sauvegarde finale de sécurité
-    write_data_to_csv(existing_df, output_csv)
+    # Sauvegarde finale de sécurité (compaction du journal le cas échéant)
+    with metrics.timer("store_close", store=storage.store):
+        writer.close(existing_df)
+    if progress is not None:
+        # Run complet : plus rien à reprendre
+        progress.finish()
+    if storage.export_arrow:
+        # pyarrow n'est nécessaire que pour cet export
+        from .arrow_export import write_data_to_arrow
+        write_data_to_arrow(resolve_refs(existing_df, output_csv, detail_cache), storage.export_arrow)
+    metrics.current().flush()
     logger.info(f"FINISHED. Total new/updated rows: {total_new}")
+    logger.info(f"Stage timings: {metrics.current().summary()}")
+    logger.info(f"Throttle at the end of the run: {throttle.describe()}")
@@ -0,0 +1,214 @@
+# src/forexfactory/sqlite_store.py
+
+import logging
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .csv_util import CSV_COLUMNS, write_data_to_csv
+from .schema import to_strings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ["DateTime", "Currency", "Event"]
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS events (
+    DateTime TEXT NOT NULL,
+    Currency TEXT NOT NULL,
+    Impact   TEXT,
+    Event    TEXT NOT NULL,
+    Actual   TEXT,
+    Forecast TEXT,
+    Previous TEXT,
+    Detail   TEXT,
+    PRIMARY KEY (DateTime, Currency, Event)
+);
+CREATE INDEX IF NOT EXISTS idx_events_datetime ON events (DateTime);
+CREATE INDEX IF NOT EXISTS idx_events_currency ON events (Currency, DateTime);
+"""
+
+# Same rules as merge_new_data: an empty Detail is filled, a known one is
+# kept; a non-empty Actual, Forecast or Previous replaces the stored one so
+# re-scraped days pick up releases and revisions published after the first pass.
+UPSERT_SQL = """
+INSERT INTO events (DateTime, Currency, Impact, Event, Actual, Forecast, Previous, Detail)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (DateTime, Currency, Event) DO UPDATE SET
+    Detail = CASE WHEN COALESCE(events.Detail, '') = '' THEN excluded.Detail ELSE events.Detail END,
+    Actual = CASE WHEN COALESCE(excluded.Actual, '') <> '' THEN excluded.Actual ELSE events.Actual END,
+    Forecast = CASE WHEN COALESCE(excluded.Forecast, '') <> '' THEN excluded.Forecast ELSE events.Forecast END,
+    Previous = CASE WHEN COALESCE(excluded.Previous, '') <> '' THEN excluded.Previous ELSE events.Previous END
+"""
+
+
+def _day_bound(d) -> str:
+    if isinstance(d, datetime):
+        d = d.date()
+    if isinstance(d, date):
+        return d.isoformat()
+    return str(d)[:10]
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stripped keys, empty strings as NULL, first row per key (like merge_new_data).
+    """
+    df = to_strings(df[CSV_COLUMNS]).astype(object)
+    df = df.where(df.notna(), None)
+    for col in KEY_COLUMNS:
+        df[col] = df[col].map(lambda v: "" if v is None else str(v).strip())
+    for col in ("Impact", "Actual", "Forecast", "Previous", "Detail"):
+        df[col] = df[col].map(lambda v: None if v is None or str(v) == "" else str(v))
+    return df.drop_duplicates(subset=KEY_COLUMNS, keep="first")
+
+
+class SqliteStore:
+    """
+    Calendar cache in a SQLite database keyed on (DateTime, Currency, Event),
+    with indexes on DateTime and Currency.
+
+    upsert() touches only the rows of the batch, so merging a day costs
+    O(rows in the day) instead of O(cache). The database runs in WAL mode:
+    other processes can read it while a scrape is writing.
+
+    In WAL mode, synchronous=NORMAL can lose the last commits on a power
+    loss. durable=True syncs every commit (synchronous=FULL): needed when
+    a progress journal records the pages as stored once upsert() returns.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0, durable: bool = False):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        self.conn.executescript(SCHEMA_SQL)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def upsert(self, new_df: pd.DataFrame) -> int:
+        """
+        Insert unseen rows, fill empty Details and update values in one
+        transaction. Returns the number of rows added.
+        """
+        if new_df is None or new_df.empty:
+            return 0
+        batch = _prepare(new_df)
+        with self.conn:
+            before = self.conn.total_changes
+            known = self._count_known(batch)
+            self.conn.executemany(UPSERT_SQL, batch[CSV_COLUMNS].itertuples(index=False, name=None))
+            logger.debug(f"Upserted {len(batch)} rows ({self.conn.total_changes - before} changes)")
+        return len(batch) - known
+
+    def replace_days(self, days, new_df: pd.DataFrame) -> int:
+        """
+        Replace every row of the given calendar days (local dates of DateTime)
+        with new_df, in one transaction. Returns the number of rows written.
+        """
+        batch = _prepare(new_df) if new_df is not None and not new_df.empty else None
+        bounds = [
+            (_day_bound(day), (date.fromisoformat(_day_bound(day)) + timedelta(days=1)).isoformat())
+            for day in days
+        ]
+        with self.conn:
+            self.conn.executemany("DELETE FROM events WHERE DateTime >= ? AND DateTime < ?", bounds)
+            if batch is not None:
+                self.conn.executemany(UPSERT_SQL, batch[CSV_COLUMNS].itertuples(index=False, name=None))
+        return 0 if batch is None else len(batch)
+
+    def _count_known(self, batch: pd.DataFrame) -> int:
+        # Uses the DateTime index: only the batch's timestamps are looked at
+        datetimes = batch["DateTime"].unique().tolist()
+        keys = set(zip(batch["DateTime"], batch["Currency"], batch["Event"]))
+        known = 0
+        for i in range(0, len(datetimes), 500):
+            chunk = datetimes[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT DateTime, Currency, Event FROM events "
+                f"WHERE DateTime IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            known += sum(1 for row in rows if row in keys)
+        return known
+
+    def read(self, start=None, end=None, currencies=None, impacts=None) -> pd.DataFrame:
+        """
+        Rows shaped like read_existing_data (strings, NaN for empty), sorted by
+        DateTime. start/end are inclusive calendar days; the filters use the
+        DateTime and Currency indexes.
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("DateTime >= ?")
+            params.append(_day_bound(start))
+        if end is not None:
+            clauses.append("DateTime < ?")
+            params.append((date.fromisoformat(_day_bound(end)) + timedelta(days=1)).isoformat())
+        for col, values in (("Currency", currencies), ("Impact", impacts)):
+            if values:
+                values = list(values)
+                clauses.append(f"{col} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(CSV_COLUMNS)} FROM events{where} ORDER BY DateTime, rowid",
+            self.conn,
+            params=params,
+        )
+        return df.astype(object).where(df.notna(), np.nan)
+
+    def export_csv(self, csv_file: str, **filters):
+        """
+        Write the (filtered) store as a classic CSV cache.
+        """
+        write_data_to_csv(self.read(**filters), csv_file)
+
+    @classmethod
+    def from_csv(cls, csv_file: str, path: str) -> "SqliteStore":
+        from .csv_util import read_existing_data
+        store = cls(path)
+        store.upsert(read_existing_data(csv_file))
+        return store
+
+
+class SqliteWriter:
+    """
+    Scraper writer backed by a SqliteStore: each page batch is upserted as is
+    (so updated values are kept); the CSV is exported at the end when
+    csv_file is set. durable: see SqliteStore.
+    """
+
+    def __init__(self, path: str, csv_file: str | None = None, durable: bool = False):
+        self.store = SqliteStore(path, durable=durable)
+        self.csv_file = csv_file
+
+    def read(self) -> pd.DataFrame:
+        return self.store.read()
+
+    def write(self, merged_df: pd.DataFrame, delta_df: pd.DataFrame, batch_df: pd.DataFrame | None = None):
+        self.store.upsert(batch_df if batch_df is not None else delta_df)
+
+    def close(self, merged_df: pd.DataFrame):
+        try:
+            if self.csv_file:
+                self.store.export_csv(self.csv_file)
+        finally:
+            self.store.close()
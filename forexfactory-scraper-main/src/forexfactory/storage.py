@@ -0,0 +1,94 @@
+# src/forexfactory/storage.py
+
+import logging
+import os
+
+import pandas as pd
+
+from .csv_util import (
+    CsvJournalWriter,
+    CsvWriter,
+    compact_journal,
+    ensure_csv_header,
+    journal_path,
+    read_existing_data,
+)
+from .detail_cache import resolve_refs
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+STORES = ("csv", "parquet", "sqlite")
+
+
+def default_store_path(output_csv: str, store: str) -> str:
+    """
+    Where a non-CSV store lives when no path is given: next to the CSV.
+    """
+    base, _ = os.path.splitext(output_csv)
+    return f"{base}.{store}"
+
+
+def arrow_path(output_csv: str) -> str:
+    """
+    Where the Arrow export (arrow_export.write_data_to_arrow) goes by default.
+    """
+    return default_store_path(output_csv, "arrow")
+
+
+def open_writer(output_csv: str, store: str = "csv", store_path: str | None = None,
+                write_mode: str = "rewrite", compact_every: int = 0, export_csv: bool = False,
+                durable: bool = False):
+    """
+    Writer for the chosen cache backend. All writers expose read() (the whole
+    cache, CSV-shaped), write(merged_df, delta_df) and close(merged_df).
+    durable=True when a progress journal relies on each write() being on
+    disk once it returns (only the SQLite store relaxes its syncing otherwise).
+    """
+    if store == "csv":
+        ensure_csv_header(output_csv)
+        if write_mode == "journal":
+            # A journal left by an interrupted run is read with the CSV and
+            # appended to: no rewrite of the whole CSV before the run resumes
+            return CsvJournalWriter(output_csv, compact_every=compact_every)
+        if os.path.exists(journal_path(output_csv)):
+            # Journal left by an interrupted run: fold it into the CSV first
+            logger.info(f"Compacting leftover journal {journal_path(output_csv)}")
+            compact_journal(output_csv)
+        return CsvWriter(output_csv)
+
+    if store == "parquet":
+        # pyarrow is only needed for this backend
+        from .parquet_store import ParquetWriter
+        return ParquetWriter(store_path or default_store_path(output_csv, store),
+                             csv_file=output_csv if export_csv else None)
+
+    if store == "sqlite":
+        from .sqlite_store import SqliteWriter
+        return SqliteWriter(store_path or default_store_path(output_csv, store),
+                            csv_file=output_csv if export_csv else None, durable=durable)
+
+    raise ValueError(f"Unknown store {store!r}, expected one of {STORES}")
+
+
+def read_cache(output_csv: str, store: str = "csv", store_path: str | None = None) -> pd.DataFrame:
+    """
+    Whole cache as read_existing_data returns it, whatever the backend, with
+    the Details written as references (--detail-refs) expanded.
+    """
+    if store == "csv":
+        df = read_existing_data(output_csv)
+    elif store == "parquet":
+        from .parquet_store import ParquetStore
+        df = ParquetStore(store_path or default_store_path(output_csv, store)).read_strings()
+    elif store == "sqlite":
+        from .sqlite_store import SqliteStore
+        with SqliteStore(store_path or default_store_path(output_csv, store)) as sqlite_store:
+            df = sqlite_store.read()
+    else:
+        raise ValueError(f"Unknown store {store!r}, expected one of {STORES}")
+    return resolve_refs(df, output_csv)
@@ -0,0 +1,251 @@
+# src/forexfactory/throttle.py
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from . import metrics
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Outcome of a request as seen by the throttle. Anything but "ok" is a sign
+# that the site is pushing back: the throttle slows down.
+SIGNALS = ("slow", "timeout", "challenge", "error")
+
+# Successful requests of one kind needed before their latency is trusted
+# as a baseline for the "slow" signal
+LATENCY_WARMUP = 5
+
+
+class TokenBucket:
+    """
+    Request budget shared by all workers: `rate` tokens per second, at most
+    `burst` saved up while idle. rate=None means no limit.
+
+    A token can be borrowed: callers queue up behind each other instead of
+    racing for the next refill.
+    """
+
+    def __init__(self, rate: float | None = None, burst: float = 1.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float | None, drain: bool = False):
+        """
+        Change the rate; drain=True also drops the saved-up tokens.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = rate
+            if drain:
+                self.tokens = min(self.tokens, 0.0)
+
+    def reserve(self) -> float:
+        """
+        Take a token and return how long to wait before using it.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            if self.rate is None:
+                return 0.0
+            self.tokens -= 1.0
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Take a token, sleeping until it is due. Returns the time slept.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class Request:
+    """
+    One request going through AimdThrottle.request(). Set `outcome` to one
+    of SIGNALS to report a failure that did not raise.
+    """
+
+    def __init__(self, kind: str, started: float):
+        self.kind = kind
+        self.started = started
+        self.outcome: str | None = None
+
+
+class AimdThrottle:
+    """
+    Scheduler between the page loop and the fetch layer: bounds the number
+    of requests in flight (`concurrency`, up to `max_concurrency`) and their
+    rate (a TokenBucket shared by all workers), and adapts both to what the
+    site answers (additive increase, multiplicative decrease):
+
+      - every success adds `increase` req/s per second of successes to the
+        rate, and one request in flight per `concurrency` successes;
+      - a challenge, a timeout, an error, or a latency over `slow_factor`
+        times the usual latency of that kind of request (and over
+        `min_slow` seconds) multiplies both by `decrease` and empties the
+        bucket. Requests started before, or less than `cooldown` seconds
+        after, the last back-off do not back off again: sites count
+        requests over a window, the first ones after a back-off are still
+        refused for what was sent before it.
+
+    The rate starts at `rate` (default: `max_rate`, None = unlimited). An
+    unlimited rate gets its first value from the throughput observed before
+    the first back-off. Thread-safe: one instance is shared by all workers.
+    """
+
+    def __init__(self, max_concurrency: int = 1, rate: float | None = None,
+                 max_rate: float | None = None, min_rate: float = 0.05,
+                 increase: float = 0.05, decrease: float = 0.5,
+                 slow_factor: float = 4.0, min_slow: float = 1.0, cooldown: float = 1.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = self.max_concurrency
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.min_slow = min_slow
+        self.cooldown = cooldown
+        if rate is None:
+            rate = max_rate
+        self.bucket = TokenBucket(rate, burst=self.max_concurrency, clock=clock, sleep=sleep)
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._active = 0
+        self._successes = 0
+        self._last_backoff = float("-inf")
+        # kind -> [moving average of successful latencies, samples]
+        self._latency: dict[str, list] = {}
+
+    @property
+    def rate(self) -> float | None:
+        return self.bucket.rate
+
+    def describe(self) -> str:
+        rate = "unlimited" if self.rate is None else f"{self.rate:.2f} req/s"
+        return f"concurrency {self.concurrency}/{self.max_concurrency}, {rate}"
+
+    def wait(self) -> float:
+        """
+        Take a token without a concurrency slot (e.g. a detail click on a
+        page whose worker already holds one).
+        """
+        return self.bucket.acquire()
+
+    @contextmanager
+    def request(self, kind: str = "page", classify=None, slot: bool = True):
+        """
+        Wait for a concurrency slot (unless slot=False) and a token, then
+        time the body and report its outcome: "ok", the `outcome` set on the
+        yielded Request, or classify(exception) for an exception going
+        through (default "error"; None ignores it).
+        """
+        if slot:
+            with self._cond:
+                while self._active >= self.concurrency:
+                    self._cond.wait()
+                self._active += 1
+        try:
+            waited = self.bucket.acquire()
+            if waited:
+                metrics.observe("throttle_wait_seconds", waited)
+            req = Request(kind, self._clock())
+            try:
+                yield req
+            except Exception as e:
+                if req.outcome is None and classify is not None:
+                    req.outcome = classify(e)
+                elif req.outcome is None:
+                    req.outcome = "error"
+                raise
+            else:
+                if req.outcome is None:
+                    req.outcome = "ok"
+            finally:
+                if req.outcome is not None:
+                    self.record(req)
+        finally:
+            if slot:
+                with self._cond:
+                    self._active -= 1
+                    self._cond.notify()
+
+    def record(self, req: Request):
+        """
+        Adapt concurrency and rate to the outcome of a finished request.
+        """
+        latency = self._clock() - req.started
+        with self._cond:
+            outcome = req.outcome
+            if outcome == "ok" and self._is_slow(req.kind, latency):
+                outcome = "slow"
+            if outcome in ("ok", "slow"):
+                self._observe_latency(req.kind, latency)
+            metrics.inc("throttle_requests", kind=req.kind, outcome=outcome)
+            if outcome == "ok":
+                self._speed_up()
+            elif req.started >= self._last_backoff + self.cooldown:
+                # Earlier requests were sent at the old pace (or are still
+                # counted against it): the last back-off already answers them
+                self._back_off(outcome, req.kind, latency)
+
+    def _is_slow(self, kind: str, latency: float) -> bool:
+        average, samples = self._latency.get(kind, (0.0, 0))
+        return samples >= LATENCY_WARMUP and latency > max(self.slow_factor * average, self.min_slow)
+
+    def _observe_latency(self, kind: str, latency: float):
+        stats = self._latency.setdefault(kind, [latency, 0])
+        stats[0] += 0.2 * (latency - stats[0])
+        stats[1] += 1
+
+    def _speed_up(self):
+        self._successes += 1
+        if self._successes >= self.concurrency:
+            self._successes = 0
+            if self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._cond.notify()
+        rate = self.rate
+        if rate is not None:
+            rate += self.increase / rate
+            if self.max_rate is not None:
+                rate = min(rate, self.max_rate)
+            self.bucket.set_rate(rate)
+
+    def _back_off(self, signal: str, kind: str, latency: float):
+        self._last_backoff = self._clock()
+        self._successes = 0
+        rate = self.rate
+        if rate is None:
+            # First back-off: start from the throughput the workers were getting
+            average = self._latency.get(kind, (latency, 0))[0]
+            rate = self.concurrency / max(average, 0.05)
+        self.concurrency = max(1, int(self.concurrency * self.decrease))
+        rate = max(self.min_rate, rate * self.decrease)
+        if self.max_rate is not None:
+            rate = min(rate, self.max_rate)
+        self.bucket.set_rate(rate, drain=True)
+        metrics.inc("throttle_backoffs", signal=signal)
+        metrics.trace("throttle", signal=signal, kind=kind, concurrency=self.concurrency,
+                      rate=round(rate, 4))
+        logger.warning(f"Backing off after {signal} ({kind}): {self.describe()}")
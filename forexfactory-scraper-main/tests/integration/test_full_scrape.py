@@ -1,51 +1,54 @@
-import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import unittest
 import shutil
+import tempfile
+import unittest
 from datetime import datetime
+from unittest.mock import patch
+
 from dateutil.tz import gettz
 
-# فرض می‌کنیم این توابع/کلاس‌ها در ماژول‌های جدا موجود هستند:
-from src.forexfactory.main import scrape_range_with_details
+from src.forexfactory import scraper
+from src.forexfactory.csv_util import read_existing_data
+from src.forexfactory.incremental import scrape_incremental
+from tests.selenium_fakes import AlwaysVisible, FakeDriver, read_fixture
+
 
 class TestFullScrape(unittest.TestCase):
+    """
+    End-to-end run of what main.py calls (scrape_incremental with --details),
+    with Chrome replaced by a driver serving the saved calendar page.
+    """
 
     def setUp(self):
-        # در صورت نیاز، محیط تست را آماده می‌کنیم
-        self.output_file = "test_integration_output.csv"
-        if os.path.exists(self.output_file):
-            os.remove(self.output_file)
+        self.tmpdir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.tmpdir, "test_integration_output.csv")
 
     def tearDown(self):
-        # پاکسازی نهایی اگر لازم باشد
-        if os.path.exists(self.output_file):
-            os.remove(self.output_file)
+        shutil.rmtree(self.tmpdir)
 
     def test_scrape_small_range(self):
-        """
-        یک تست انتها به انتها که یک بازه کوچک را اسکرپ می‌کند
-        و بررسی می‌کند آیا فایل CSV تولید شده و حاوی سطر(های) مورد انتظار هست یا خیر.
-        """
         tz = gettz("Asia/Tehran")
-        start_dt = datetime(2025, 1, 5, tzinfo=tz)
-        end_dt   = datetime(2025, 1, 5, tzinfo=tz)
-        scrape_range_with_details(
-            start_date=start_dt,
-            end_date=end_dt,
-            output_csv=self.output_file,
-            tzname="Asia/Tehran"
-        )
-
-        # حالا بررسی می‌کنیم آیا فایل تولید شده و آیا حداقل یک رویداد ثبت شده است
+        start_dt = datetime(2025, 1, 6, tzinfo=tz)
+        end_dt = datetime(2025, 1, 6, tzinfo=tz)
+        page = read_fixture("calendar_day_jan06_2025.html")
+
+        with patch.object(scraper, "_launch_driver", lambda profile=None: FakeDriver(page)), \
+                patch.object(scraper, "WebDriverWait", AlwaysVisible), \
+                patch.object(scraper, "parse_detail_table", lambda driver: {"Source": "Destatis"}), \
+                patch.object(scraper.time, "sleep"):
+            scrape_incremental(
+                start_dt, end_dt, self.output_file,
+                tzname="Asia/Tehran",
+                scrape_details=True,
+                now=datetime(2025, 2, 1, tzinfo=tz),
+            )
+
         self.assertTrue(os.path.exists(self.output_file), "CSV output file should be created.")
+        df = read_existing_data(self.output_file)
+        self.assertGreater(len(df), 0, "Should have at least one row of data.")
+        self.assertIn("EUR", set(df["Currency"]))
+        self.assertTrue((df["Detail"] == "Source: Destatis").all())
 
-        with open(self.output_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            self.assertGreater(len(lines), 1, "Should have at least one row of data (plus header).")
-            # می‌توانید سطرها را پارس کنید و مطمئن شوید که بعضی اطلاعات کلیدی داریم
-            # e.g. lines[1] must contain "USD" or "FOMC"
-            # یا اینکه بسنجید که Detail خالی نباشد.
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,146 @@
+# tests/local_server.py
+"""
+Local stand-in for the ForexFactory calendar, served over HTTP/1.1 keep-alive.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHALLENGE_PAGE = (
+    "<html><head><title>Just a moment...</title></head>"
+    "<body><div id='cf-chl-widget'></div></body></html>"
+)
+
+# Assets a real calendar page drags along: what the lean browser profile blocks.
+# Tracker hosts are kept as paths so everything stays on the local server.
+HEAVY_ASSETS = [
+    "/static/logo.png",
+    "/static/banner.jpg?v=3",
+    "/static/chart.webp",
+    "/static/icons.svg",
+    "/fonts/roboto.woff2",
+    "/fonts/roboto.ttf",
+    "/media/promo.mp4",
+    "/www.googletagmanager.com/gtm.js",
+    "/securepubads.doubleclick.net/tag.js",
+]
+SITE_SCRIPTS = ["/assets/calendar.js"]
+ASSET_BYTES = 200_000
+
+
+def heavy_page(page):
+    """
+    Calendar page with images, fonts, media and trackers added to its <head>/<body>.
+    """
+    tags = "".join(
+        f'<link rel="preload" href="{a}">' if a.startswith("/fonts/")
+        else f'<script src="{a}"></script>' if a.endswith(".js")
+        else f'<img src="{a}">'
+        for a in HEAVY_ASSETS + SITE_SCRIPTS
+    )
+    return page.replace("<body>", "<body>" + tags, 1)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.paths.append(self.path)
+            server.cookies.append(self.headers.get("Cookie"))
+        status, body = server.respond(self.path)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CalendarServer:
+    """
+    Serves `page` for every /calendar request unless `respond` is replaced.
+    Usage: with CalendarServer(html) as srv: HttpFetcher(base_url=srv.calendar_url)
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.paths = []
+        self.httpd.cookies = []
+        self.httpd.connections = 0
+        self.httpd.respond = self.respond
+        self.challenge = False
+        # Latency of every non-calendar request (heavy assets)
+        self.asset_delay = 0.0
+        # Throttling like the real site: more than `max_rate` calendar
+        # requests over the last second get a 429 challenge page
+        self.max_rate = None
+        self.calendar_delay = 0.0
+        self.throttled = 0
+        self._recent = []
+
+    def _over_rate(self):
+        now = time.monotonic()
+        with self.httpd.lock:
+            self._recent = [t for t in self._recent if now - t < 1.0]
+            self._recent.append(now)
+            over = len(self._recent) > self.max_rate
+            self.throttled += over
+        return over
+
+    def respond(self, path):
+        if self.challenge:
+            return 403, CHALLENGE_PAGE
+        if path.startswith("/calendar"):
+            if self.max_rate is not None and self._over_rate():
+                return 429, CHALLENGE_PAGE
+            time.sleep(self.calendar_delay)
+            return 200, self.page
+        if path in HEAVY_ASSETS or path in SITE_SCRIPTS:
+            time.sleep(self.asset_delay)
+            return 200, "x" * (ASSET_BYTES if path in HEAVY_ASSETS else 100)
+        return 404, "not found"
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def calendar_url(self):
+        return self.base_url + "/calendar"
+
+    @property
+    def paths(self):
+        return list(self.httpd.paths)
+
+    @property
+    def cookies(self):
+        """Cookie header of each request, in order (None when absent)."""
+        return list(self.httpd.cookies)
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
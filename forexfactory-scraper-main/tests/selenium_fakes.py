@@ -0,0 +1,143 @@
+# tests/selenium_fakes.py
+"""
+Minimal stand-ins for a Selenium driver backed by a saved HTML fixture,
+so the Selenium extraction path can run without a browser, plus the other
+fakes shared by the test modules (calendar rows, WebDriverWait, no browser).
+"""
+
+import os
+
+import pandas as pd
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+
+from src.forexfactory.csv_util import CSV_COLUMNS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+HIGH = "High Impact Expected"
+MEDIUM = "Medium Impact Expected"
+
+
+def make_rows(specs, fields=("DateTime", "Currency", "Event", "Detail"), **defaults):
+    """
+    Calendar rows in CSV_COLUMNS order. Each spec is a tuple of the `fields`
+    values; the other columns take `defaults` (keyword per column), else
+    High impact and blank text.
+    """
+    base = dict.fromkeys(CSV_COLUMNS, "")
+    base["Impact"] = HIGH
+    base.update(defaults)
+    return pd.DataFrame([{**base, **dict(zip(fields, spec))} for spec in specs], columns=CSV_COLUMNS)
+
+
+class AlwaysVisible:
+    """WebDriverWait replacement: the fixture table is always there."""
+
+    def __init__(self, driver, timeout):
+        pass
+
+    def until(self, condition):
+        return True
+
+
+def no_browser(profile=None):
+    """_launch_driver replacement for runs that must not start Chrome."""
+    raise AssertionError("the browser should not be launched")
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def calendar_page_for(days, name="calendar_day_jan06_2025.html"):
+    """
+    Build a multi-day calendar page (like ?range= / ?month=) by repeating the
+    fixture's rows once per day, with the day-breaker relabelled ("Jan 6" -> day).
+    """
+    page = read_fixture(name)
+    head, rest = page.split("<tbody>", 1)
+    body, tail = rest.split("</tbody>", 1)
+    bodies = [body.replace("Jan 6", f"{d:%b} {d.day}") for d in days]
+    return head + "<tbody>" + "".join(bodies) + "</tbody>" + tail
+
+
+class FakeElement:
+    """
+    Element over an lxml node. Like Selenium's, each call goes through the
+    driver's execute(), so counting wrappers see it.
+    """
+
+    def __init__(self, el, driver=None):
+        self._el = el
+        self._driver = driver
+
+    def _execute(self, command):
+        if self._driver is not None:
+            self._driver.execute(command)
+
+    @property
+    def text(self):
+        self._execute("getElementText")
+        return " ".join(self._el.text_content().split())
+
+    def get_attribute(self, name):
+        self._execute("getElementAttribute")
+        if name == "textContent":
+            return self._el.text_content()
+        return self._el.get(name)
+
+    def find_elements(self, by, locator):
+        self._execute("findChildElements")
+        return [FakeElement(e, self._driver) for e in self._el.xpath(locator)]
+
+    def find_element(self, by, locator):
+        self._execute("findChildElement")
+        found = self._el.xpath(locator)
+        if not found:
+            raise NoSuchElementException(locator)
+        return FakeElement(found[0], self._driver)
+
+    def is_displayed(self):
+        self._execute("isElementDisplayed")
+        return True
+
+    def click(self):
+        self._execute("clickElement")
+
+
+class FakeDriver(FakeElement):
+    """
+    Serves the same fixture for every URL; records the URLs requested and
+    the commands sent.
+    """
+
+    def __init__(self, page_source):
+        super().__init__(lxml_html.fromstring(page_source), self)
+        self._page_source = page_source
+        self.urls = []
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        return {"value": None}
+
+    @property
+    def page_source(self):
+        self._execute("getPageSource")
+        return self._page_source
+
+    def set_page_load_timeout(self, seconds):
+        self._execute("setTimeouts")
+
+    def get(self, url):
+        self._execute("get")
+        self.urls.append(url)
+
+    def execute_script(self, script, *args):
+        self._execute("executeScript")
+        return None
+
+    def quit(self):
+        pass
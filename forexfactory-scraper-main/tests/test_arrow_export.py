@@ -0,0 +1,87 @@
+# tests/test_arrow_export.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper, schema
+from src.forexfactory.arrow_export import ARROW_SCHEMA, open_arrow, read_arrow, write_data_to_arrow
+from src.forexfactory.csv_util import read_existing_data
+from src.forexfactory.fetcher import HttpFetcher
+from src.forexfactory.storage import arrow_path
+from tests.local_server import CalendarServer
+from tests.selenium_fakes import calendar_page_for, make_rows, no_browser
+
+# make_rows layout for these tests
+ROW = {"Actual": "1"}
+
+UTC = gettz("UTC")
+
+
+class TestArrowExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.arrow")
+        self.cache = make_rows([
+            ("2025-03-03T14:30:00+00:00", "USD", "ISM PMI", np.nan),
+            ("2025-01-06T09:00:00+01:00", "EUR", "German CPI", "Source: Destatis"),
+            ("2025-01-06T02:00:00+03:30", "IRR", "Some Event", ""),
+        ], **ROW)
+        self.cache["Forecast"] = ["48.9", np.nan, "0.3%"]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip(self):
+        write_data_to_arrow(self.cache, self.path)
+        # Sorted by instant, offsets kept per row, empty strings as NaN
+        expected = self.cache.iloc[[2, 1, 0]].reset_index(drop=True)
+        expected = expected.where(expected != "", np.nan).astype(object)
+        pd.testing.assert_frame_equal(read_arrow(self.path, strings=True), expected)
+
+        write_data_to_arrow(schema.to_typed(self.cache, "UTC"), self.path)
+        self.assertEqual(read_arrow(self.path, strings=True)["DateTime"].tolist(),
+                         ["2025-01-05T22:30:00+00:00", "2025-01-06T08:00:00+00:00", "2025-03-03T14:30:00+00:00"])
+
+    def test_memory_mapped_read(self):
+        write_data_to_arrow(self.cache, self.path)
+        allocated = pa.total_allocated_bytes()
+        table = open_arrow(self.path)
+        self.assertEqual(table.schema, ARROW_SCHEMA)
+        self.assertEqual(pa.total_allocated_bytes(), allocated)
+
+        df = read_arrow(self.path, columns=["DateTime", "Currency", "Actual"])
+        self.assertEqual(list(df.columns), ["DateTime", "Currency", "Actual"])
+        self.assertIsInstance(df["Actual"].dtype, pd.ArrowDtype)
+        self.assertEqual(df["DateTime"].iloc[0], pd.Timestamp("2025-01-05T22:30:00Z"))
+        self.assertEqual(df["Currency"].tolist(), ["IRR", "EUR", "USD"])
+
+    def test_empty_cache(self):
+        write_data_to_arrow(read_existing_data(os.path.join(self.tmpdir, "missing.csv")), self.path)
+        self.assertEqual(open_arrow(self.path).num_rows, 0)
+        self.assertTrue(read_arrow(self.path, strings=True).empty)
+
+    def test_scrape_exports_the_cache(self):
+        csv = os.path.join(self.tmpdir, "cache.csv")
+        start, end = datetime(2025, 1, 6, tzinfo=UTC), datetime(2025, 1, 7, tzinfo=UTC)
+        with CalendarServer(calendar_page_for([start, end])) as srv, \
+                patch.object(scraper, "_launch_driver", no_browser):
+            scraper.scrape_range_pandas(start, end, csv, backend="http",
+                                        fetcher=HttpFetcher(base_url=srv.calendar_url),
+                                        export_arrow=arrow_path(csv))
+
+        self.assertEqual(arrow_path(csv), os.path.join(self.tmpdir, "cache.arrow"))
+        pd.testing.assert_frame_equal(read_arrow(self.path, strings=True), read_existing_data(csv))
+
+
+if __name__ == "__main__":
+    unittest.main()
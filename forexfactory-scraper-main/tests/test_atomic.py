@@ -0,0 +1,42 @@
+# tests/test_atomic.py
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.forexfactory.atomic import atomic_write
+
+
+class TestAtomicWrite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_replaces_the_file(self):
+        atomic_write(self.path, lambda f: f.write("old"))
+        atomic_write(self.path, lambda f: f.write(b"new\r\n"), binary=True)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"new\r\n")
+        self.assertEqual(os.listdir(self.tmpdir), ["cache.json"])
+
+    def test_failed_write_keeps_the_old_file(self):
+        atomic_write(self.path, lambda f: f.write("old"))
+
+        def crash(f):
+            f.write("half")
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            atomic_write(self.path, crash)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.tmpdir), ["cache.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# tests/test_backfill.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.backfill import backfill_details, rows_missing_details
+from src.forexfactory.calendar_html import parse_calendar_html
+from src.forexfactory.coverage import CoverageManifest, manifest_path
+from src.forexfactory.csv_util import read_existing_data, write_data_to_csv
+from tests.selenium_fakes import AlwaysVisible, FakeDriver, read_fixture
+
+UTC = gettz("UTC")
+PAGE = read_fixture("calendar_day_jan06_2025.html")
+
+
+class TestBackfillDetails(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "cache.csv")
+        rows = parse_calendar_html(PAGE, datetime(2025, 1, 6, tzinfo=UTC))
+        rows.loc[0, "Detail"] = "Source: Destatis"
+        self.n_rows = len(rows)
+        write_data_to_csv(rows, self.csv)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_rows_missing_details(self):
+        df = read_existing_data(self.csv)
+        self.assertEqual(len(rows_missing_details(df)), self.n_rows - 1)
+        self.assertTrue(rows_missing_details(df, from_date=datetime(2025, 1, 7)).empty)
+
+    def test_only_missing_rows_are_expanded(self):
+        drivers = []
+        clicks = []
+
+        def launch(profile=None):
+            drivers.append(FakeDriver(PAGE))
+            return drivers[-1]
+
+        def fake_parse_detail_table(driver):
+            clicks.append(1)
+            return {"Source": f"Clicked {len(clicks)}"}
+
+        with patch.object(scraper, "_launch_driver", launch), \
+                patch.object(scraper, "WebDriverWait", AlwaysVisible), \
+                patch.object(scraper, "parse_detail_table", fake_parse_detail_table), \
+                patch.object(scraper.time, "sleep"):
+            self.assertEqual(backfill_details(self.csv, tzname="UTC", detail_max_age_days=None),
+                             self.n_rows - 1)
+
+        self.assertEqual([d.urls for d in drivers],
+                         [["https://www.forexfactory.com/calendar?day=jan06.2025"]])
+        self.assertEqual(len(clicks), self.n_rows - 1)
+        df = read_existing_data(self.csv)
+        self.assertEqual(len(df), self.n_rows)
+        details = df.set_index("Event")["Detail"]
+        self.assertEqual(details["German Prelim CPI m/m"], "Source: Destatis")
+        self.assertTrue(df["Detail"].notna().all())
+        self.assertTrue(CoverageManifest.load(manifest_path(self.csv)).days["2025-01-06"]["details_complete"])
+
+        # Nothing left to do on a second run
+        self.assertEqual(backfill_details(self.csv, tzname="UTC"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# tests/test_browser.py
+
+import os
+import unittest
+from unittest.mock import patch
+from urllib.parse import urljoin
+
+import urllib3
+from lxml import html as lxml_html
+
+from src.forexfactory import browser, metrics
+from src.forexfactory.browser import (
+    BLOCKED_URL_PATTERNS,
+    chrome_options,
+    chrome_rss,
+    get_profile,
+    launch_chrome,
+    url_is_blocked,
+)
+from tests.local_server import HEAVY_ASSETS, SITE_SCRIPTS, CalendarServer, heavy_page
+from tests.selenium_fakes import read_fixture
+
+
+class FakeChrome:
+
+    def __init__(self, options=None, headless=False):
+        self.options = options
+        self.headless = headless
+        self.window = None
+        self.cdp = []
+
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+    def set_window_size(self, width, height):
+        self.window = (width, height)
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.execute("executeCdpCommand", {"cmd": cmd, "params": params})
+        self.cdp.append((cmd, params))
+
+
+class TestProfiles(unittest.TestCase):
+
+    def test_get_profile(self):
+        self.assertEqual(get_profile("lean").page_load_strategy, "eager")
+        self.assertTrue(get_profile("lean", headless=True).headless)
+        self.assertFalse(get_profile("default").block_resources)
+        with self.assertRaises(ValueError):
+            get_profile("turbo")
+
+    def test_lean_options(self):
+        options = chrome_options(get_profile("lean"))
+        self.assertEqual(options.page_load_strategy, "eager")
+        self.assertIn("--window-size=1024,768", options.arguments)
+        self.assertIn("--blink-settings=imagesEnabled=false", options.arguments)
+
+    def test_default_launch_is_unchanged(self):
+        with patch.object(browser.uc, "Chrome", FakeChrome):
+            driver = launch_chrome(get_profile("default"))
+        self.assertEqual(driver.window, (1400, 1000))
+        self.assertEqual(driver.options.page_load_strategy, "normal")
+        self.assertEqual(driver.cdp, [])
+
+    def test_lean_launch_blocks_resources(self):
+        with patch.object(browser.uc, "Chrome", FakeChrome):
+            driver = launch_chrome(get_profile("lean", headless=True))
+        self.assertTrue(driver.headless)
+        self.assertEqual(driver.window, (1024, 768))
+        self.assertEqual(driver.cdp[-1], ("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}))
+
+    def test_timezone_is_pinned(self):
+        with patch.object(browser.uc, "Chrome", FakeChrome):
+            driver = launch_chrome(get_profile("default", timezone="Europe/Paris"))
+        self.assertEqual(driver.cdp, [
+            ("Network.setCookie", {"name": "fftimezone", "value": "Europe%2FParis",
+                                   "url": "https://www.forexfactory.com/calendar"}),
+            ("Emulation.setTimezoneOverride", {"timezoneId": "Europe/Paris"}),
+        ])
+
+    def test_every_command_is_counted(self):
+        previous = metrics.install(metrics.Metrics())
+        try:
+            with patch.object(browser.uc, "Chrome", FakeChrome):
+                driver = launch_chrome(get_profile("lean"))
+            # Network.enable and Network.setBlockedURLs
+            self.assertEqual(metrics.current().counter("webdriver_calls"), 2)
+            driver.execute("getPageSource")
+            self.assertEqual(metrics.current().counter("webdriver_calls"), 3)
+        finally:
+            metrics.install(previous)
+
+    def test_chrome_rss(self):
+        try:
+            import psutil  # noqa: F401
+        except ImportError:
+            self.skipTest("psutil not installed")
+        driver = FakeChrome()
+        driver.browser_pid = os.getpid()
+        self.assertGreater(chrome_rss(driver), 0)
+        self.assertIsNone(chrome_rss(FakeChrome()))
+
+
+class TestBlockedUrlsOnHeavyPage(unittest.TestCase):
+
+    def test_heavy_assets_blocked_calendar_kept(self):
+        with CalendarServer(heavy_page(read_fixture("calendar_day_jan06_2025.html"))) as srv:
+            http = urllib3.PoolManager()
+            page_url = srv.calendar_url + "?day=jan06.2025"
+            body = http.request("GET", page_url).data.decode("utf-8")
+            tree = lxml_html.fromstring(body)
+            assets = [urljoin(page_url, u) for u in tree.xpath("//img/@src | //script/@src | //link/@href")]
+            # The stand-in really serves them
+            self.assertEqual(http.request("GET", assets[0]).status, 200)
+
+        blocked = [a for a in assets if url_is_blocked(a)]
+        self.assertEqual(len(blocked), len(HEAVY_ASSETS))
+        self.assertFalse(url_is_blocked(page_url))
+        self.assertFalse(any(url_is_blocked(urljoin(page_url, s)) for s in SITE_SCRIPTS))
+        self.assertTrue(url_is_blocked("https://www.google-analytics.com/analytics.js"))
+
+
+if __name__ == "__main__":
+    unittest.main()
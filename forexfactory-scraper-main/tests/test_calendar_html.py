@@ -0,0 +1,94 @@
+# tests/test_calendar_html.py
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.calendar_html import event_datetime, parse_calendar_html
+from src.forexfactory.csv_util import CSV_COLUMNS
+from tests.selenium_fakes import AlwaysVisible, FakeDriver, calendar_page_for, read_fixture
+
+FIXTURE = "calendar_day_jan06_2025.html"
+
+
+class TestEventDatetime(unittest.TestCase):
+
+    def setUp(self):
+        self.day = datetime(2025, 1, 6, tzinfo=gettz("UTC"))
+
+    def test_am_pm(self):
+        self.assertEqual(event_datetime(self.day, "12:00am").hour, 0)
+        self.assertEqual(event_datetime(self.day, "12:00pm").hour, 12)
+        self.assertEqual(event_datetime(self.day, "11:30pm").strftime("%H:%M"), "23:30")
+
+    def test_all_day_and_unknown(self):
+        self.assertEqual(event_datetime(self.day, "All Day").strftime("%H:%M:%S"), "23:59:59")
+        self.assertEqual(event_datetime(self.day, "Tentative").strftime("%H:%M:%S"), "00:00:00")
+        self.assertEqual(event_datetime(self.day, "24th-26th"), self.day)
+
+
+class TestHtmlEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.day = datetime(2025, 1, 6, tzinfo=gettz("UTC"))
+        self.page = read_fixture(FIXTURE)
+
+    def test_schema_and_filter(self):
+        df = parse_calendar_html(self.page, self.day)
+        self.assertEqual(list(df.columns), CSV_COLUMNS)
+        # Low impact and non-economic rows are dropped
+        self.assertEqual(len(df), 6)
+        self.assertNotIn("Construction PMI", set(df["Event"]))
+        self.assertNotIn("Bank Holiday", set(df["Event"]))
+        first = df.iloc[0]
+        self.assertEqual(first["DateTime"], "2025-01-06T02:00:00+00:00")
+        self.assertEqual(first["Event"], "German Prelim CPI m/m")
+        self.assertEqual(first["Previous"], "-0.2%")
+
+    def test_empty_page(self):
+        df = parse_calendar_html("", self.day)
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), CSV_COLUMNS)
+
+    def test_html_and_selenium_engines_agree(self):
+        with patch.object(scraper, "WebDriverWait", AlwaysVisible):
+            html_df = scraper.parse_calendar_day(FakeDriver(self.page), self.day, engine="html")
+            selenium_df = scraper.parse_calendar_day(FakeDriver(self.page), self.day, engine="selenium")
+        self.assertFalse(html_df.empty)
+        pd.testing.assert_frame_equal(html_df, selenium_df)
+
+    def test_falls_back_to_selenium_when_snapshot_fails(self):
+        with patch.object(scraper, "WebDriverWait", AlwaysVisible), \
+                patch.object(scraper, "parse_calendar_html", side_effect=ValueError("bad snapshot")):
+            df = scraper.parse_calendar_day(FakeDriver(self.page), self.day, engine="html")
+        self.assertEqual(len(df), 6)
+
+
+class TestMultiDayPage(unittest.TestCase):
+
+    def setUp(self):
+        tz = gettz("UTC")
+        self.days = [datetime(2024, 12, 30, tzinfo=tz), datetime(2024, 12, 31, tzinfo=tz),
+                     datetime(2025, 1, 1, tzinfo=tz)]
+        self.page = calendar_page_for(self.days)
+
+    def test_rows_attributed_to_day_breakers(self):
+        df = parse_calendar_html(self.page, self.days[0])
+        self.assertEqual(len(df), 18)
+        self.assertEqual(sorted(df["DateTime"].str[:10].unique()),
+                         ["2024-12-30", "2024-12-31", "2025-01-01"])
+
+    def test_engines_agree_on_multi_day_page(self):
+        with patch.object(scraper, "WebDriverWait", AlwaysVisible):
+            html_df = scraper.parse_calendar_page(FakeDriver(self.page), "range=x", self.days[0])
+            selenium_df = scraper.parse_calendar_page(FakeDriver(self.page), "range=x", self.days[0],
+                                                      engine="selenium")
+        pd.testing.assert_frame_equal(html_df, selenium_df)
+
+
+if __name__ == '__main__':
+    unittest.main()
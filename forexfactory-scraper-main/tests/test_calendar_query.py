@@ -0,0 +1,82 @@
+# tests/test_calendar_query.py
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.forexfactory import schema
+from src.forexfactory.arrow_export import write_data_to_arrow
+from src.forexfactory.calendar_query import CalendarIndex
+from src.forexfactory.csv_util import CSV_COLUMNS
+
+
+def releases(rows):
+    """rows: (DateTime, Currency, Event, Actual, Forecast) tuples"""
+    return pd.DataFrame([
+        {"DateTime": dt, "Currency": cur, "Impact": "High Impact Expected", "Event": ev,
+         "Actual": actual, "Forecast": forecast, "Previous": np.nan, "Detail": np.nan}
+        for dt, cur, ev, actual, forecast in rows
+    ], columns=CSV_COLUMNS)
+
+
+class TestCalendarIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = releases([
+            ("2025-02-07T17:00:00+03:30", "USD", "Non-Farm Employment Change", "143K", "169K"),
+            ("2025-01-10T17:00:00+03:30", "USD", "Non-Farm Employment Change", "256K", "164K"),
+            ("2025-01-10T17:00:00+03:30", "USD", "Unemployment Rate", "4.1%", "4.2%"),
+            ("2025-01-15T12:30:00+00:00", "GBP", "CPI y/y", "2.5%", np.nan),
+            ("2025-03-05T15:00:00+00:00", "EUR", "Main Refinancing Rate", "0-0-9", np.nan),
+        ])
+        self.index = CalendarIndex(self.cache)
+
+    def test_latest_release_of_a_series(self):
+        bars = pd.DatetimeIndex(["2025-01-01", "2025-01-10T13:30", "2025-02-01", "2025-03-01"], tz="UTC")
+        got = self.index.latest(bars, "USD", "Non-Farm Employment Change")
+        self.assertIs(got.index, bars)
+        self.assertTrue(pd.isna(got["EventTime"].iloc[0]))
+        self.assertEqual(got["EventTime"].iloc[1], pd.Timestamp("2025-01-10T13:30Z"))
+        self.assertEqual(got["Actual"].tolist()[1:], [256_000, 256_000, 143_000])
+        self.assertEqual(got["Surprise"].tolist()[1:], [92_000, 92_000, -26_000])
+
+        strict = self.index.latest(bars, "USD", "Non-Farm Employment Change", allow_exact_matches=False)
+        self.assertTrue(pd.isna(strict["Actual"].iloc[1]))
+        near = self.index.latest(bars, "USD", "Non-Farm Employment Change", tolerance="7D")
+        self.assertEqual(near["Actual"].notna().tolist(), [False, True, False, False])
+
+    def test_next_release_with_filters(self):
+        bars = pd.Series(pd.to_datetime(["2025-01-01", "2025-01-12", "2025-04-01"]), index=[10, 11, 12])
+        got = self.index.next(bars, currency=["USD", "GBP"], columns=["EventTime", "Event", "Surprise"])
+        self.assertEqual(list(got.index), [10, 11, 12])
+        self.assertEqual(list(got.columns), ["EventTime", "Event", "Surprise"])
+        self.assertEqual(got["Event"].tolist()[:2], ["Non-Farm Employment Change", "CPI y/y"])
+        self.assertTrue(np.isnan(got["Surprise"].iloc[1]))
+        self.assertTrue(pd.isna(got["Event"].iloc[2]))
+
+        latest = self.index.latest(["2025-03-06"], impact="High Impact Expected")
+        self.assertEqual(latest["Event"].iloc[0], "Main Refinancing Rate")
+        self.assertTrue(np.isnan(latest["Actual"].iloc[0]))
+        self.assertTrue(self.index.latest(["2025-03-06"], "JPY", "BOJ Policy Rate")["EventTime"].isna().all())
+        with self.assertRaises(ValueError):
+            self.index.asof(["2025-03-06"], direction="nearest")
+
+    def test_any_layout(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "cache.arrow")
+            write_data_to_arrow(self.cache, path)
+            bars = pd.date_range("2025-01-01", "2025-03-31", freq="h", tz="UTC")
+            expected = self.index.latest(bars, "USD", "Unemployment Rate")
+            for other in (CalendarIndex(schema.to_typed(self.cache, "Asia/Tehran")), CalendarIndex.from_arrow(path)):
+                pd.testing.assert_frame_equal(other.latest(bars, "USD", "Unemployment Rate"), expected)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
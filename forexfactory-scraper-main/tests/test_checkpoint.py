@@ -0,0 +1,129 @@
+# tests/test_checkpoint.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from dateutil.tz import gettz
+
+from src.forexfactory import incremental, scraper
+from src.forexfactory.checkpoint import ProgressJournal, progress_path
+from src.forexfactory.coverage import CoverageManifest, manifest_path
+from src.forexfactory.csv_util import journal_path, read_existing_data
+from src.forexfactory.date_logic import iter_calendar_pages
+from src.forexfactory.fetcher import HttpFetcher
+from tests.local_server import CalendarServer
+from tests.selenium_fakes import calendar_page_for, no_browser
+
+UTC = gettz("UTC")
+
+
+class HostDown(Exception):
+    pass
+
+
+class TestProgressJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.csv.progress")
+        self.pages = list(iter_calendar_pages(datetime(2025, 1, 1), datetime(2025, 1, 20), "week"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_reload_after_crash(self):
+        progress = ProgressJournal(self.path, {"tzname": "Europe/Paris", "granularity": "week"})
+        progress.plan(self.pages)
+        for page in self.pages[:3]:
+            progress.page_started(page)
+        progress.page_done(self.pages[0], {"2025-01-01": {"rows": 3}})
+        # The crash tears the line being written
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"done": "range=jan')
+
+        loaded = ProgressJournal.load(self.path)
+        self.assertEqual(loaded.args["granularity"], "week")
+        self.assertEqual(loaded.done, {self.pages[0].param})
+        self.assertEqual(loaded.in_flight, sorted(p.param for p in self.pages[1:3]))
+        self.assertEqual(loaded.days, {"2025-01-01": {"rows": 3}})
+        remaining = loaded.remaining_pages()
+        self.assertEqual([p.param for p in remaining], [p.param for p in self.pages[1:]])
+        self.assertEqual(remaining[0].start, datetime(2025, 1, 8, tzinfo=gettz("Europe/Paris")))
+
+        # A checkpoint folds everything into one atomic line
+        loaded.checkpoint()
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+        again = ProgressJournal.load(self.path)
+        self.assertEqual((again.done, again.in_flight, again.days), (loaded.done, loaded.in_flight, {}))
+        again.finish()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(ProgressJournal.load(self.path))
+
+
+class TestResume(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "cache.csv")
+        self.start = datetime(2025, 1, 6, tzinfo=UTC)
+        self.end = datetime(2025, 1, 15, tzinfo=UTC)
+        self.days = [self.start + timedelta(days=n) for n in range(10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_resume_after_crash(self):
+        with CalendarServer(calendar_page_for(self.days)) as srv, \
+                patch.object(scraper, "_launch_driver", no_browser):
+            fetched = []
+
+            def fetcher(pool_size=1, crash_at=None):
+                http = HttpFetcher(base_url=srv.calendar_url, pool_size=pool_size)
+                fetch = http.fetch
+
+                def counted(param):
+                    fetched.append(param)
+                    if len(fetched) == crash_at:
+                        raise HostDown(param)
+                    return fetch(param)
+                http.fetch = counted
+                return http
+
+            with patch.object(scraper, "HttpFetcher", lambda pool_size=1: fetcher(pool_size, crash_at=5)), \
+                    self.assertRaises(HostDown):
+                incremental.scrape_incremental(self.start, self.end, self.csv, tzname="UTC", backend="http",
+                                               write_mode="journal", now=datetime(2025, 3, 1, tzinfo=UTC))
+
+            progress = ProgressJournal.load(progress_path(self.csv))
+            stored = sorted(progress.done)
+            self.assertTrue(stored)
+            self.assertIn("day=jan10.2025", progress.in_flight)
+            # Stored pages are in the journal, not folded into the CSV yet
+            self.assertTrue(os.path.exists(journal_path(self.csv)))
+
+            fetched.clear()
+            with patch.object(scraper, "HttpFetcher", lambda pool_size=1: fetcher(pool_size)), \
+                    patch.object(incremental, "read_cache", side_effect=AssertionError("cache read")):
+                self.assertTrue(incremental.resume_incremental(self.csv))
+
+        # Only the pages that were not stored are fetched again
+        self.assertEqual(sorted(set(fetched) | set(stored)), sorted(p.param for p in
+                                                                  iter_calendar_pages(self.start, self.end)))
+        self.assertFalse(set(fetched) & set(stored))
+        self.assertFalse(os.path.exists(progress_path(self.csv)))
+        self.assertFalse(os.path.exists(journal_path(self.csv)))
+        df = read_existing_data(self.csv)
+        self.assertEqual(sorted(df["DateTime"].str[:10].unique()), [f"{d:%Y-%m-%d}" for d in self.days])
+        self.assertFalse(df.duplicated(["DateTime", "Currency", "Event"]).any())
+        manifest = CoverageManifest.load(manifest_path(self.csv))
+        self.assertEqual(len(manifest.days), 10)
+        self.assertFalse(incremental.resume_incremental(self.csv))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+# tests/test_config.py
+
+import unittest
+
+from src.forexfactory.config import FetchOptions, ScrapeConfig, StorageOptions
+
+
+class TestScrapeConfig(unittest.TestCase):
+
+    def test_flat_options_land_in_their_groups(self):
+        config = ScrapeConfig.from_options(workers=4, store="sqlite", scrape_details=True, days=[])
+        self.assertEqual(config.fetch.workers, 4)
+        self.assertEqual(config.storage.store, "sqlite")
+        self.assertTrue(config.details.scrape_details)
+        self.assertEqual(config.resume.days, [])
+        self.assertEqual(config.fetch.engine, "html")
+
+    def test_options_override_a_copy_of_the_config(self):
+        base = ScrapeConfig(fetch=FetchOptions(workers=2, backend="http"),
+                            storage=StorageOptions(write_mode="journal"))
+        config = ScrapeConfig.from_options(base, workers=3)
+        self.assertEqual((config.fetch.workers, config.fetch.backend), (3, "http"))
+        self.assertEqual(config.storage.write_mode, "journal")
+        self.assertEqual(base.fetch.workers, 2)
+
+    def test_unknown_option(self):
+        with self.assertRaises(TypeError):
+            ScrapeConfig.from_options(worker=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+# tests/test_coverage.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.coverage import CoverageManifest, actuals_complete, manifest_path
+from src.forexfactory.csv_util import CSV_COLUMNS
+from src.forexfactory.date_logic import contiguous_runs
+from src.forexfactory.incremental import scrape_incremental
+from tests.selenium_fakes import make_rows
+
+TZ = gettz("UTC")
+
+# make_rows layout for these tests
+ROW = {"fields": ("DateTime", "Actual", "Forecast", "Previous"), "Currency": "USD", "Event": "NFP"}
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.csv.coverage.json")
+        self.now = datetime(2025, 1, 20, 12, tzinfo=TZ)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_actuals_complete_ignores_speeches(self):
+        self.assertTrue(actuals_complete(make_rows([
+            ("2025-01-06T10:00:00+00:00", "1.0", "0.9", ""),
+            ("2025-01-06T11:00:00+00:00", "", "", ""),
+        ], **ROW)))
+        self.assertFalse(actuals_complete(make_rows([
+            ("2025-01-06T10:00:00+00:00", "", "0.9", "0.8"),
+        ], **ROW)))
+
+    def test_needs_scrape_rules(self):
+        m = CoverageManifest(self.path)
+        after = datetime(2025, 1, 10, tzinfo=TZ)
+        m.record_day("2025-01-06", make_rows([("2025-01-06T10:00:00+00:00", "1", "1", "1")], **ROW), after)
+        m.record_day("2025-01-07", make_rows([("2025-01-07T10:00:00+00:00", "", "1", "1")], **ROW), after)
+        m.record_day("2025-01-08", make_rows([], **ROW), datetime(2025, 1, 8, 9, tzinfo=TZ))
+        m.record_day("2025-01-02", make_rows([("2025-01-02T10:00:00+00:00", "", "1", "1")], **ROW), after)
+
+        self.assertFalse(m.needs_scrape(datetime(2025, 1, 6, tzinfo=TZ), self.now))
+        # Blank Actual within the grace period
+        self.assertTrue(m.needs_scrape(datetime(2025, 1, 7, tzinfo=TZ), self.now))
+        # Blank Actual but scraped more than a week after the day: final
+        self.assertFalse(m.needs_scrape(datetime(2025, 1, 2, tzinfo=TZ), self.now))
+        # Scraped while the day was still running
+        self.assertTrue(m.needs_scrape(datetime(2025, 1, 8, tzinfo=TZ), self.now))
+        # Missing, today and future days
+        self.assertTrue(m.needs_scrape(datetime(2025, 1, 9, tzinfo=TZ), self.now))
+        self.assertTrue(m.needs_scrape(datetime(2025, 1, 20, tzinfo=TZ), self.now))
+        self.assertTrue(m.needs_scrape(datetime(2025, 1, 25, tzinfo=TZ), self.now))
+        # Details asked for but not present
+        self.assertTrue(m.needs_scrape(datetime(2025, 1, 6, tzinfo=TZ), self.now, scrape_details=True))
+
+    def test_save_load_roundtrip(self):
+        m = CoverageManifest(self.path)
+        m.record_page(datetime(2025, 1, 4, tzinfo=TZ), datetime(2025, 1, 6, tzinfo=TZ),
+                      make_rows([("2025-01-06T10:00:00+00:00", "1", "1", "1")], **ROW))
+        m.save()
+        loaded = CoverageManifest.load(self.path)
+        self.assertEqual(sorted(loaded.days), ["2025-01-04", "2025-01-05", "2025-01-06"])
+        self.assertEqual(loaded.days["2025-01-04"]["rows"], 0)
+        self.assertEqual(loaded.days["2025-01-06"]["rows"], 1)
+
+    def test_contiguous_runs(self):
+        days = [datetime(2025, 1, d) for d in (1, 2, 3, 7, 9, 10)]
+        self.assertEqual([(a.day, b.day) for a, b in contiguous_runs(days)], [(1, 3), (7, 7), (9, 10)])
+
+
+class TestScrapeIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "cache.csv")
+        self.scraped = []
+        self.actual = "1"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def fake_scrape_page(self, driver, page, existing_df, **kwargs):
+        self.scraped.append(page.start.date().isoformat())
+        # Weekends have no events; weekdays one complete release
+        if page.start.weekday() >= 5:
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        return make_rows([(page.start.replace(hour=10).isoformat(), self.actual, "1", "1")], **ROW)
+
+    def run_incremental(self, now, **kwargs):
+        with patch.object(scraper, "_launch_driver", lambda profile=None: None), \
+                patch.object(scraper, "scrape_page", self.fake_scrape_page):
+            scrape_incremental(datetime(2025, 1, 1, tzinfo=TZ), datetime(2025, 1, 14, tzinfo=TZ),
+                               self.csv, tzname="UTC", now=now, **kwargs)
+
+    def test_rerun_only_fetches_unfinished_days(self):
+        self.run_incremental(datetime(2025, 1, 10, 12, tzinfo=TZ))
+        self.assertEqual(len(self.scraped), 14)
+
+        self.scraped.clear()
+        self.run_incremental(datetime(2025, 1, 11, 12, tzinfo=TZ))
+        # Jan 10 was scraped while running; Jan 11+ is today/future
+        self.assertEqual(self.scraped, [f"2025-01-{d}" for d in range(10, 15)])
+        self.assertEqual(len(pd.read_csv(self.csv)), 10)
+
+    def test_rescrape_fills_blank_actuals(self):
+        for write_mode in ("rewrite", "journal"):
+            with self.subTest(write_mode=write_mode):
+                for path in (self.csv, manifest_path(self.csv)):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self.actual = ""
+                self.run_incremental(datetime(2025, 1, 14, 12, tzinfo=TZ), write_mode=write_mode)
+                # Released since: the refresh picks the Actuals up
+                self.actual = "2.5"
+                self.scraped.clear()
+                self.run_incremental(datetime(2025, 1, 15, 12, tzinfo=TZ), write_mode=write_mode)
+                self.assertIn("2025-01-13", self.scraped)
+
+                df = pd.read_csv(self.csv, dtype=str)
+                self.assertEqual(len(df), 10)
+                rescraped = df["DateTime"].str[:10].isin(self.scraped)
+                self.assertTrue(rescraped.any())
+                self.assertEqual(set(df.loc[rescraped, "Actual"]), {"2.5"})
+                manifest = CoverageManifest.load(manifest_path(self.csv))
+                self.assertTrue(manifest.days["2025-01-13"]["actuals_complete"])
+
+    def test_bootstrap_from_existing_cache(self):
+        self.run_incremental(datetime(2025, 1, 20, tzinfo=TZ))
+        os.remove(manifest_path(self.csv))
+        self.scraped.clear()
+        self.run_incremental(datetime(2025, 1, 20, tzinfo=TZ))
+        # Days with rows come from the CSV; empty weekend days are fetched once
+        self.assertEqual(self.scraped, ["2025-01-04", "2025-01-05", "2025-01-11", "2025-01-12"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+# tests/test_csv_util.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.forexfactory import csv_util
+from src.forexfactory.csv_util import (
+    CSV_COLUMNS,
+    CsvJournalWriter,
+    append_to_journal,
+    changed_rows,
+    compact_journal,
+    dedupe_keys,
+    journal_path,
+    merge_new_data,
+    read_existing_data,
+    read_journal,
+    row_keys,
+    write_data_to_csv,
+)
+from src.forexfactory.normalize import normalize
+from src.forexfactory.schema import to_strings, to_typed
+from tests.selenium_fakes import make_rows
+
+# make_rows layout for these tests
+ROW = {"Actual": "1"}
+
+
+class CsvTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "cache.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+class TestAtomicWrite(CsvTestCase):
+
+    def test_sorted_output(self):
+        df = make_rows([("2025-01-02T00:00:00+00:00", "USD", "B", ""),
+                        ("2025-01-01T00:00:00+00:00", "EUR", "A", "")], **ROW)
+        write_data_to_csv(df, self.csv)
+        self.assertEqual(list(read_existing_data(self.csv)["Event"]), ["A", "B"])
+
+    def test_failed_write_keeps_previous_file(self):
+        write_data_to_csv(make_rows([("2025-01-01T00:00:00+00:00", "EUR", "A", "")], **ROW), self.csv)
+        with open(self.csv, encoding="utf-8") as f:
+            before = f.read()
+
+        with patch.object(csv_util.os, "fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_data_to_csv(make_rows([("2025-01-09T00:00:00+00:00", "USD", "Z", "")], **ROW), self.csv)
+
+        with open(self.csv, encoding="utf-8") as f:
+            self.assertEqual(f.read(), before)
+        # No temp file left behind
+        self.assertEqual(os.listdir(self.tmpdir), ["cache.csv"])
+
+
+class TestJournal(CsvTestCase):
+
+    def test_torn_last_line_is_dropped(self):
+        journal = journal_path(self.csv)
+        append_to_journal(make_rows([("2025-01-01T00:00:00+00:00", "EUR", "A", "")], **ROW), journal)
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write("2025-01-02T00:00:00+00:00,USD,High Impact Expected,Non-F")
+        df = read_journal(journal)
+        self.assertEqual(list(df["Event"]), ["A"])
+
+    def test_compact_merges_sorts_and_removes_journal(self):
+        write_data_to_csv(make_rows([("2025-01-02T00:00:00+00:00", "USD", "B", "")], **ROW), self.csv)
+        journal = journal_path(self.csv)
+        append_to_journal(make_rows([("2025-01-01T00:00:00+00:00", "EUR", "A", ""),
+                                     ("2025-01-02T00:00:00+00:00", "USD", "B", "Source: BLS")], **ROW), journal)
+        append_to_journal(make_rows([("2025-01-01T00:00:00+00:00", "EUR", "A", "")], **ROW), journal)
+
+        compact_journal(self.csv)
+        df = read_existing_data(self.csv)
+        self.assertEqual(list(df["Event"]), ["A", "B"])
+        self.assertEqual(df.iloc[1]["Detail"], "Source: BLS")
+        self.assertFalse(os.path.exists(journal))
+
+    def test_changed_rows(self):
+        existing = make_rows([("2025-01-01T00:00:00+00:00", "EUR", "A", ""),
+                              ("2025-01-01T00:00:00+00:00", "USD", "B", "known")], **ROW)
+        new = make_rows([("2025-01-01T00:00:00+00:00", "EUR", "A", "filled"),
+                         ("2025-01-01T00:00:00+00:00", "USD", "B", "other"),
+                         ("2025-01-01T00:00:00+00:00", "EUR", "A", ""),
+                         ("2025-01-02T00:00:00+00:00", "JPY", "C", "")], **ROW)
+        self.assertEqual(list(changed_rows(existing, new)["Event"]), ["A", "C"])
+
+    def test_journal_writer_matches_rewrite(self):
+        batches = [
+            make_rows([("2025-01-01T00:00:00+00:00", "EUR", "A", "")], **ROW),
+            make_rows([("2025-01-02T00:00:00+00:00", "USD", "B", "")], **ROW),
+            make_rows([("2025-01-03T00:00:00+00:00", "JPY", "C", "")], **ROW),
+        ]
+        writer = CsvJournalWriter(self.csv, compact_every=2)
+        merged = read_existing_data(self.csv)
+        for i, batch in enumerate(batches):
+            delta = changed_rows(merged, batch)
+            merged = merge_new_data(merged, batch)
+            writer.write(merged, delta)
+            if i == 1:
+                # Compacted after the second batch
+                self.assertFalse(os.path.exists(writer.journal_file))
+                self.assertEqual(len(read_existing_data(self.csv)), 2)
+        self.assertTrue(os.path.exists(writer.journal_file))
+        writer.close(merged)
+        self.assertFalse(os.path.exists(writer.journal_file))
+        self.assertEqual(list(read_existing_data(self.csv)["Event"]), ["A", "B", "C"])
+
+
+class TestMergeNewData(unittest.TestCase):
+
+    def setUp(self):
+        self.existing = make_rows([
+            ("2025-01-01T08:00:00+00:00", "EUR", "CPI", ""),
+            ("2025-01-01T09:00:00+00:00", "USD", "NFP", "Source: BLS"),
+        ], **ROW)
+        self.existing.loc[0, "Detail"] = float("nan")
+
+    def test_empty_existing_returns_new(self):
+        new = make_rows([("2025-01-01T08:00:00+00:00", "EUR", "CPI", "")], **ROW)
+        self.assertIs(merge_new_data(pd.DataFrame(columns=CSV_COLUMNS), new), new)
+
+    def test_append_unseen_and_fill_empty_detail(self):
+        new = make_rows([
+            ("2025-01-01T09:00:00+00:00", "USD", "NFP", "Source: other"),
+            (" 2025-01-01T08:00:00+00:00", "EUR ", "CPI", "  Source: Eurostat "),
+            ("2025-01-01T08:00:00+00:00", "EUR", "CPI", "Source: later"),
+            ("2025-01-02T10:00:00+00:00", "GBP", "GDP", ""),
+            ("2025-01-02T10:00:00+00:00", "GBP", "GDP", ""),
+        ], **ROW)
+        merged = merge_new_data(self.existing, new)
+        self.assertEqual(list(merged.columns), CSV_COLUMNS)
+        self.assertEqual(list(merged.index), list(range(len(merged))))
+        # Keys are compared stripped; the first non-empty detail fills, stripped
+        self.assertEqual(merged.loc[0, "Detail"], "Source: Eurostat")
+        # An existing detail is never overwritten
+        self.assertEqual(merged.loc[1, "Detail"], "Source: BLS")
+        # Unseen rows are appended in order, as the row loop used to do
+        self.assertEqual(list(merged["Event"]), ["CPI", "NFP", "GDP", "GDP"])
+
+    def test_non_empty_values_replace_stored_ones(self):
+        existing = normalize(to_typed(self.existing))
+        existing["Actual"] = pd.array(["", "1"], dtype=existing["Actual"].dtype)
+        new = make_rows([
+            ("2025-01-01T08:00:00+00:00", "EUR", "CPI", ""),
+            ("2025-01-01T09:00:00+00:00", "USD", "NFP", ""),
+        ], **ROW)
+        new["Actual"] = ["2.4%", ""]
+        new["Previous"] = ["2.2%", "-12K"]
+        self.assertEqual(len(changed_rows(existing, new)), 2)
+        merged = merge_new_data(existing, normalize(new)).set_index("Event")
+        self.assertEqual(list(merged["Actual"]), ["2.4%", "1"])
+        self.assertEqual(list(merged["Previous"]), ["2.2%", "-12K"])
+        # Normalized columns follow the new values
+        self.assertEqual(merged.loc["CPI", "ActualValue"], 2.4)
+        self.assertEqual(merged.loc["NFP", "PreviousValue"], -12000)
+        # A blank value never erases a stored one
+        self.assertEqual(len(changed_rows(merge_new_data(existing, new), new)), 0)
+
+    def test_inputs_not_modified(self):
+        new = make_rows([("2025-01-01T08:00:00+00:00", "EUR", "CPI", "Source: Eurostat")], **ROW)
+        before = self.existing.copy()
+        merge_new_data(self.existing, new)
+        pd.testing.assert_frame_equal(self.existing, before)
+
+
+class TestRowKeys(unittest.TestCase):
+
+    def test_keys_are_stripped(self):
+        df = make_rows([(" 2025-01-01T08:00:00+00:00", "EUR ", " CPI", "")], **ROW)
+        self.assertEqual(list(row_keys(df)), ["2025-01-01T08:00:00+00:00_EUR_CPI"])
+
+    def test_dedupe_keys_folds_like_successive_merges(self):
+        df = make_rows([
+            ("2025-01-01T08:00:00+00:00", "EUR", "CPI", ""),
+            ("2025-01-01T08:00:00+00:00", "EUR", "CPI", "Source: Eurostat"),
+            ("2025-01-01T08:00:00+00:00", "EUR", "CPI", "Source: later"),
+        ], **ROW)
+        df["Actual"] = ["1", "2", ""]
+        out = dedupe_keys(df)
+        self.assertEqual(len(out), 1)
+        # First Detail found, last non-empty value
+        self.assertEqual(out.iloc[0]["Detail"], "Source: Eurostat")
+        self.assertEqual(out.iloc[0]["Actual"], "2")
+
+
+if __name__ == '__main__':
+    unittest.main()
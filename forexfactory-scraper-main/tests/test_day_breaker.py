@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 from datetime import datetime
 from dateutil.tz import gettz
 from src.forexfactory.scraper import get_day_from_day_breaker
+from src.forexfactory.calendar_html import parse_day_breaker_text
 
 
 class MockWebElement:
@@ -42,6 +43,19 @@ class TestDayBreakerWithMock(unittest.TestCase):
         row_mock = MockWebElement("????")
         result = get_day_from_day_breaker(row_mock, fallback, "Asia/Tehran")
         self.assertIsNone(result)
+    def test_year_rollover(self):
+        # A range page starting in late December crosses into January
+        fallback = datetime(2024, 12, 30, tzinfo=gettz("Asia/Tehran"))
+        result = parse_day_breaker_text("Wed Jan 1", fallback)
+        self.assertEqual((result.year, result.month, result.day), (2025, 1, 1))
+        result = parse_day_breaker_text("Mon Dec 30", datetime(2025, 1, 1))
+        self.assertEqual(result.year, 2024)
+
+    def test_nested_span_text(self):
+        fallback = datetime(2025, 1, 1, tzinfo=gettz("UTC"))
+        result = parse_day_breaker_text("SunJan 5", fallback)
+        self.assertEqual(result.day, 5)
+        self.assertEqual(result.tzinfo, fallback.tzinfo)
 
 if __name__ == '__main__':
     unittest.main()
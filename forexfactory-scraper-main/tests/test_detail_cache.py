@@ -0,0 +1,189 @@
+# tests/test_detail_cache.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.csv_util import CSV_COLUMNS, read_existing_data, write_data_to_csv
+from src.forexfactory.detail_cache import DetailCache, detail_cache_path, text_id
+from src.forexfactory.storage import read_cache
+from tests.selenium_fakes import AlwaysVisible, FakeDriver, read_fixture
+
+NOW = datetime(2025, 3, 1, tzinfo=timezone.utc)
+PMI = "Source: NBS | Frequency: Released monthly"
+
+
+class TestDetailCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.csv.details.json")
+        self.now = NOW
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def make_cache(self, **kwargs):
+        return DetailCache.load(self.path, clock=lambda: self.now, **kwargs)
+
+    def test_series_lookup_ignores_dates(self):
+        cache = self.make_cache()
+        cache.put("CNY", "Manufacturing PMI", PMI)
+        self.assertEqual(cache.get(" CNY", "Manufacturing PMI "), PMI)
+        self.assertEqual(cache.get("USD", "Manufacturing PMI"), "")
+
+    def test_stale_entries_are_refetched(self):
+        cache = self.make_cache(max_age_days=30)
+        cache.put("CNY", "Manufacturing PMI", PMI)
+        self.now = NOW + timedelta(days=31)
+        self.assertEqual(cache.get("CNY", "Manufacturing PMI"), "")
+        self.assertEqual(self.make_cache(max_age_days=None).get("CNY", "Manufacturing PMI"), "")
+
+    def test_texts_are_stored_once(self):
+        cache = self.make_cache()
+        self.assertEqual(cache.put("CNY", "Manufacturing PMI", PMI),
+                         cache.put("CNY", "Non-Manufacturing PMI", PMI))
+        self.assertEqual(len(cache.texts), 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_refs_round_trip_through_save(self):
+        cache = self.make_cache(store_refs=True)
+        ref = cache.value(PMI)
+        self.assertEqual(ref, "ref:" + text_id(PMI))
+        cache.save()
+
+        loaded = self.make_cache()
+        df = pd.DataFrame([{"Detail": ref}, {"Detail": "plain"}, {"Detail": float("nan")}])
+        resolved = loaded.resolve_details(df)["Detail"]
+        self.assertEqual(list(resolved[:2]), [PMI, "plain"])
+        self.assertTrue(pd.isna(resolved[2]))
+
+    def test_new_texts_mark_the_cache_dirty(self):
+        cache = self.make_cache(store_refs=True)
+        self.assertFalse(cache.dirty)
+        cache.value(PMI)
+        self.assertTrue(cache.dirty)
+        cache.save()
+        cache.value(PMI)
+        cache.put("CNY", "Manufacturing PMI", PMI)
+        self.assertFalse(cache.dirty)
+
+    def test_version_1_series_are_dropped(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "texts": {text_id(PMI): PMI},
+                       "series": {"CNY|Manufacturing PMI": {"ref": text_id(PMI),
+                                                           "fetched_at": NOW.isoformat()}}}, f)
+        cache = self.make_cache()
+        # Their texts may hold per-release specs; the texts stay for the refs
+        self.assertEqual(cache.get("CNY", "Manufacturing PMI"), "")
+        self.assertEqual(cache.resolve("ref:" + text_id(PMI)), PMI)
+
+    def test_read_cache_resolves_refs(self):
+        csv = os.path.join(self.tmpdir, "cache.csv")
+        cache = self.make_cache(store_refs=True)
+        row = {col: "" for col in CSV_COLUMNS}
+        row.update({"DateTime": "2025-01-06T08:00:00+00:00", "Currency": "CNY", "Event": "PMI",
+                    "Detail": cache.value(PMI)})
+        write_data_to_csv(pd.DataFrame([row], columns=CSV_COLUMNS), csv)
+        cache.save()
+        self.assertTrue(read_existing_data(csv)["Detail"][0].startswith("ref:"))
+        self.assertEqual(read_cache(csv)["Detail"][0], PMI)
+
+
+class TestDetailCacheInScraper(unittest.TestCase):
+
+    def test_series_cache_leaves_out_the_next_release(self):
+        day = datetime(2025, 1, 6, tzinfo=gettz("UTC"))
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        cache = DetailCache(os.path.join(tmpdir, "details.json"), max_age_days=None)
+
+        def fake_parse_detail_table(driver):
+            return {"Source": "Destatis", "Next Release": "Feb 6, 2025"}
+
+        with patch.object(scraper, "WebDriverWait", AlwaysVisible), \
+                patch.object(scraper, "parse_detail_table", fake_parse_detail_table), \
+                patch.object(scraper.time, "sleep"):
+            df = scraper.parse_calendar_day(FakeDriver(read_fixture("calendar_day_jan06_2025.html")), day,
+                                            scrape_details=True, detail_cache=cache)
+
+        # The row keeps its own release date, the series only its specs
+        self.assertEqual(df.iloc[0]["Detail"], "Source: Destatis | Next Release: Feb 6, 2025")
+        self.assertEqual(cache.get(df.iloc[0]["Currency"], df.iloc[0]["Event"]), "Source: Destatis")
+
+    def test_cached_series_are_not_clicked(self):
+        day = datetime(2025, 1, 6, tzinfo=gettz("UTC"))
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        cache = DetailCache(os.path.join(tmpdir, "details.json"), max_age_days=None, store_refs=True)
+        cache.put("EUR", "German Prelim CPI m/m", "Source: Destatis")
+        clicks = []
+
+        def fake_parse_detail_table(driver):
+            clicks.append(1)
+            return {"Source": f"Clicked {len(clicks)}"}
+
+        with patch.object(scraper, "WebDriverWait", AlwaysVisible), \
+                patch.object(scraper, "parse_detail_table", fake_parse_detail_table), \
+                patch.object(scraper.time, "sleep"):
+            page = read_fixture("calendar_day_jan06_2025.html")
+            first = scraper.parse_calendar_day(FakeDriver(page), day, scrape_details=True, detail_cache=cache)
+            clicked = len(clicks)
+            second = scraper.parse_calendar_day(FakeDriver(page), day, scrape_details=True, detail_cache=cache)
+
+        self.assertEqual(clicked, len(first) - 1)
+        # Every series is known after the first pass: no click at all
+        self.assertEqual(len(clicks), clicked)
+        self.assertEqual(list(first["Detail"]), list(second["Detail"]))
+        self.assertTrue(first["Detail"].str.startswith("ref:").all())
+        self.assertEqual(cache.resolve(first.iloc[0]["Detail"]), "Source: Destatis")
+
+
+class TestRefsInScrape(unittest.TestCase):
+
+    def test_texts_are_saved_before_the_rows(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        csv = os.path.join(tmpdir, "cache.csv")
+        tz = gettz("UTC")
+
+        def fake_scrape_page(driver, page, existing_df, detail_cache=None, **kwargs):
+            row = {col: "" for col in CSV_COLUMNS}
+            row.update({"DateTime": page.start.replace(hour=8).isoformat(), "Currency": "EUR",
+                        "Event": "CPI", "Detail": detail_cache.value(f"Source: {page.start:%b %d}")})
+            return pd.DataFrame([row], columns=CSV_COLUMNS)
+
+        written = []
+        open_writer = scraper.open_writer
+
+        def checking_writer(*args, **kwargs):
+            writer = open_writer(*args, **kwargs)
+            write = writer.write
+
+            def checked_write(merged_df, delta_df, batch_df=None):
+                # A crash right after this write leaves no dangling ref
+                on_disk = DetailCache.load(detail_cache_path(csv))
+                written.extend(on_disk.resolve(ref) for ref in delta_df["Detail"])
+                write(merged_df, delta_df, batch_df)
+            writer.write = checked_write
+            return writer
+
+        with patch.object(scraper, "_launch_driver", lambda profile=None: object()), \
+                patch.object(scraper, "scrape_page", fake_scrape_page), \
+                patch.object(scraper, "open_writer", checking_writer):
+            scraper.scrape_range_pandas(datetime(2025, 1, 6, tzinfo=tz), datetime(2025, 1, 8, tzinfo=tz), csv,
+                                        tzname="UTC", scrape_details=True, detail_refs=True)
+
+        self.assertEqual(written, ["Source: Jan 06", "Source: Jan 07", "Source: Jan 08"])
+
+
+if __name__ == "__main__":
+    unittest.main()
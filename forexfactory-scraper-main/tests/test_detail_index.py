@@ -0,0 +1,65 @@
+# tests/test_detail_index.py
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.detail_index import DetailIndex
+from tests.selenium_fakes import AlwaysVisible, FakeDriver, make_rows, read_fixture
+
+
+class TestDetailIndex(unittest.TestCase):
+
+    def test_lookup_and_update(self):
+        df = make_rows([
+            ("2025-01-06T02:00:00+00:00", " EUR", "German Prelim CPI m/m ", "Source: Destatis"),
+            ("2025-01-06T09:45:00+00:00", "USD", "Final Services PMI", float("nan")),
+        ])
+        index = DetailIndex.from_dataframe(df)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.get("2025-01-06T02:00:00+00:00", "EUR", "German Prelim CPI m/m"),
+                         "Source: Destatis")
+        self.assertEqual(index.get("2025-01-06T09:45:00+00:00", "USD", "Final Services PMI"), "")
+
+        added = index.update(make_rows([
+            ("2025-01-06T02:00:00+00:00", "EUR", "German Prelim CPI m/m", "Source: other"),
+            ("2025-01-06T09:45:00+00:00", "USD", "Final Services PMI", "Source: S&P Global"),
+        ]))
+        # A known Detail is never overwritten, as in merge_new_data
+        self.assertEqual(added, 1)
+        self.assertEqual(index.get("2025-01-06T02:00:00+00:00", "EUR", "German Prelim CPI m/m"),
+                         "Source: Destatis")
+        self.assertIn(("2025-01-06T09:45:00+00:00", "USD", "Final Services PMI"), index)
+
+
+class TestDetailLookupInScraper(unittest.TestCase):
+
+    def test_known_details_are_not_clicked(self):
+        day = datetime(2025, 1, 6, tzinfo=gettz("UTC"))
+        index = DetailIndex.from_dataframe(make_rows([
+            ("2025-01-06T02:00:00+00:00", "EUR", "German Prelim CPI m/m", "Source: Destatis"),
+        ]))
+        parsed = []
+
+        def fake_parse_detail_table(driver):
+            parsed.append(1)
+            return {"Source": "Clicked"}
+
+        with patch.object(scraper, "WebDriverWait", AlwaysVisible), \
+                patch.object(scraper, "parse_detail_table", fake_parse_detail_table), \
+                patch.object(scraper.time, "sleep"):
+            df = scraper.parse_calendar_day(
+                FakeDriver(read_fixture("calendar_day_jan06_2025.html")), day,
+                scrape_details=True, detail_index=index,
+            )
+
+        self.assertEqual(df.iloc[0]["Detail"], "Source: Destatis")
+        self.assertTrue((df.iloc[1:]["Detail"] == "Source: Clicked").all())
+        self.assertEqual(len(parsed), len(df) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
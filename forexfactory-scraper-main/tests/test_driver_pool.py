@@ -0,0 +1,144 @@
+# tests/test_driver_pool.py
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.forexfactory import scraper
+from src.forexfactory.scraper import _DriverPool
+
+
+class CountingDriver:
+
+    def __init__(self, n):
+        self.n = n
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class PoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.launched = []
+        self.lock = threading.Lock()
+
+        def launch(profile=None):
+            with self.lock:
+                driver = CountingDriver(len(self.launched))
+                self.launched.append(driver)
+            return driver
+
+        patcher = patch.object(scraper, "_launch_driver", launch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_pool(self, **kwargs):
+        pool = _DriverPool(**kwargs)
+        self.addCleanup(pool.quit_all)
+        return pool
+
+    def wait_for_launches(self, n, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while len(self.launched) < n and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertGreaterEqual(len(self.launched), n)
+
+
+class TestDriverPool(PoolTestCase):
+
+    def test_same_driver_between_pages(self):
+        pool = self.make_pool()
+        first = pool.get()
+        self.assertIs(pool.get(), first)
+        self.assertEqual(len(self.launched), 1)
+
+    def test_spares_are_prewarmed_and_swapped_in_without_delay(self):
+        pool = self.make_pool(spares=1)
+        self.wait_for_launches(1)
+        first = pool.get()
+        self.assertIs(first, self.launched[0])
+        self.wait_for_launches(2)
+
+        with patch.object(scraper.time, "sleep", side_effect=AssertionError("cold relaunch")):
+            replacement = pool.relaunch()
+        self.assertIs(replacement, self.launched[1])
+        self.assertTrue(first.quit_called)
+        # The consumed spare is replaced in the background
+        self.wait_for_launches(3)
+
+    def test_cold_relaunch_without_spare(self):
+        pool = self.make_pool()
+        pool.get()
+        with patch.object(scraper.time, "sleep") as sleep:
+            pool.relaunch()
+        # No fixed pause any more: the retry waits for the throttle
+        sleep.assert_not_called()
+        self.assertEqual(len(self.launched), 2)
+
+    def test_recycled_after_max_pages(self):
+        pool = self.make_pool(max_pages=3)
+        drivers = [pool.get() for _ in range(7)]
+        self.assertEqual([d.n for d in drivers], [0, 0, 0, 1, 1, 1, 2])
+        self.assertTrue(self.launched[0].quit_called)
+
+    def test_unhealthy_driver_is_replaced(self):
+        pool = self.make_pool()
+        first = pool.get()
+        first.alive = False
+        self.assertIsNot(pool.get(), first)
+        self.assertTrue(first.quit_called)
+
+    def test_recycled_above_rss_threshold(self):
+        pool = self.make_pool(max_rss_mb=500)
+        first = pool.get()
+        with patch.object(scraper, "chrome_rss", return_value=400 * 2**20):
+            self.assertIs(pool.get(), first)
+        with patch.object(scraper, "chrome_rss", return_value=900 * 2**20):
+            self.assertIsNot(pool.get(), first)
+
+    def test_rss_limit_without_psutil_warns(self):
+        with patch.object(scraper, "rss_supported", return_value=False), \
+                self.assertLogs(scraper.logger, "WARNING") as logs:
+            pool = self.make_pool(max_rss_mb=500)
+        self.assertIn("psutil", logs.output[0])
+        self.assertEqual(pool.max_rss_mb, 0)
+
+    def test_dead_spare_is_not_handed_out(self):
+        pool = self.make_pool(spares=1)
+        self.wait_for_launches(1)
+        dead = self.launched[0]
+        dead.alive = False
+        driver = pool.get()
+        self.assertIsNot(driver, dead)
+        self.assertTrue(driver.alive)
+        self.assertTrue(dead.quit_called)
+
+    def test_quit_all_closes_spares(self):
+        pool = self.make_pool(spares=2)
+        self.wait_for_launches(2)
+        pool.get()
+        pool.quit_all()
+        self.assertTrue(all(d.quit_called for d in self.launched))
+
+    def test_one_driver_per_thread(self):
+        pool = self.make_pool()
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(pool.get())) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(d) for d in seen}), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# tests/test_fetcher.py
+
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.fetcher import ChallengeError, HttpFetcher, is_challenge_page
+from tests.local_server import CHALLENGE_PAGE, CalendarServer
+from tests.selenium_fakes import calendar_page_for, no_browser, read_fixture
+
+FIXTURE = "calendar_day_jan06_2025.html"
+
+
+class TestChallengeDetection(unittest.TestCase):
+
+    def test_detection(self):
+        page = read_fixture(FIXTURE)
+        self.assertFalse(is_challenge_page(200, page))
+        self.assertTrue(is_challenge_page(403, page))
+        self.assertTrue(is_challenge_page(200, CHALLENGE_PAGE))
+        self.assertTrue(is_challenge_page(200, "<html><body>maintenance</body></html>"))
+
+
+class TestHttpFetcher(unittest.TestCase):
+
+    def test_keep_alive_pool(self):
+        page = read_fixture(FIXTURE)
+        with CalendarServer(page) as srv:
+            fetcher = HttpFetcher(base_url=srv.calendar_url, pool_size=1)
+            for day in ("jan06.2025", "jan07.2025", "jan08.2025"):
+                self.assertEqual(fetcher.fetch("day=" + day), page)
+            fetcher.close()
+            self.assertEqual(srv.paths[-1], "/calendar?day=jan08.2025")
+            # All three requests went through a single pooled connection
+            self.assertEqual(srv.connections, 1)
+
+    def test_challenge_raises(self):
+        with CalendarServer(read_fixture(FIXTURE)) as srv:
+            srv.challenge = True
+            fetcher = HttpFetcher(base_url=srv.calendar_url)
+            with self.assertRaises(ChallengeError):
+                fetcher.fetch("day=jan06.2025")
+            fetcher.close()
+
+
+class TestHttpBackendRange(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        os.remove(self.path)
+        tz = gettz("UTC")
+        self.start = datetime(2025, 1, 6, tzinfo=tz)
+        self.end = datetime(2025, 1, 7, tzinfo=tz)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_scrape_without_browser(self):
+        with CalendarServer(read_fixture(FIXTURE)) as srv, \
+                patch.object(scraper, "_launch_driver", no_browser):
+            srv.page = calendar_page_for([self.start, self.end])
+            scraper.scrape_range_pandas(
+                self.start, self.end, self.path,
+                backend="http", fetcher=HttpFetcher(base_url=srv.calendar_url),
+            )
+        df = pd.read_csv(self.path, dtype=str)
+        # 6 kept rows per day, two days
+        self.assertEqual(len(df), 12)
+        self.assertEqual(df["DateTime"].str[:10].nunique(), 2)
+
+    def test_month_granularity_single_request(self):
+        tz = gettz("UTC")
+        days = [datetime(2025, 1, d, tzinfo=tz) for d in range(1, 32)]
+        with CalendarServer(calendar_page_for(days)) as srv, \
+                patch.object(scraper, "_launch_driver", no_browser):
+            scraper.scrape_range_pandas(
+                days[0], days[-1], self.path, backend="http",
+                fetcher=HttpFetcher(base_url=srv.calendar_url), granularity="month",
+            )
+            self.assertEqual(srv.paths, ["/calendar?month=jan.2025"])
+        df = pd.read_csv(self.path, dtype=str)
+        self.assertEqual(len(df), 31 * 6)
+        self.assertEqual(df["DateTime"].str[:10].nunique(), 31)
+
+    def test_pages_are_asked_for_in_the_run_timezone(self):
+        profiles = []
+
+        def browser_page(slots, page, existing_df, **kwargs):
+            profiles.append(slots.profile)
+            return pd.DataFrame()
+
+        with CalendarServer(calendar_page_for([self.start])) as srv, \
+                patch.object(scraper, "_scrape_page_with_retries", browser_page):
+            scraper.scrape_range_pandas(
+                self.start, self.start, self.path, tzname="Europe/Paris",
+                backend="http", fetcher=HttpFetcher(base_url=srv.calendar_url),
+            )
+            self.assertEqual(srv.cookies, ["fftimezone=Europe%2FParis"])
+            srv.challenge = True
+            scraper.scrape_range_pandas(
+                self.end, self.end, self.path, tzname="Europe/Paris",
+                backend="http", fetcher=HttpFetcher(base_url=srv.calendar_url),
+            )
+        # The browser fallback is pinned to the same zone
+        self.assertEqual([p.timezone for p in profiles], ["Europe/Paris"])
+        df = pd.read_csv(self.path, dtype=str)
+        self.assertTrue(df["DateTime"].str.endswith("+01:00").all())
+
+    def test_challenge_falls_back_to_browser(self):
+        fallback_days = []
+
+        def browser_page(slots, page, existing_df, **kwargs):
+            fallback_days.append(page.start.date())
+            return pd.DataFrame()
+
+        with CalendarServer(read_fixture(FIXTURE)) as srv, \
+                patch.object(scraper, "_scrape_page_with_retries", browser_page):
+            srv.challenge = True
+            scraper.scrape_range_pandas(
+                self.start, self.end, self.path,
+                backend="http", fetcher=HttpFetcher(base_url=srv.calendar_url),
+            )
+        self.assertEqual(fallback_days, [self.start.date(), self.end.date()])
+
+    def test_unparsable_page_falls_back_on_a_fetch_thread(self):
+        threads = []
+
+        def browser_page(slots, page, existing_df, **kwargs):
+            threads.append(threading.current_thread().name)
+            return pd.DataFrame()
+
+        with CalendarServer(read_fixture(FIXTURE)) as srv, \
+                patch.object(scraper, "_scrape_page_with_retries", browser_page), \
+                patch.object(scraper, "parse_calendar_html", side_effect=ValueError("bad page")):
+            scraper.scrape_range_pandas(
+                self.start, self.end, self.path, workers=2,
+                backend="http", fetcher=HttpFetcher(base_url=srv.calendar_url),
+            )
+        # Same threads (and so the same pooled drivers) as the browser fetches
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(t.startswith("pipeline-fetch") for t in threads))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+# tests/test_metrics.py
+
+import json
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+from dateutil.tz import gettz
+
+from src.forexfactory import metrics, scraper
+from src.forexfactory.browser import count_commands
+from src.forexfactory.fetcher import HttpFetcher
+from src.forexfactory.metrics import DayProfiler, Metrics, profile_path
+from tests.local_server import CalendarServer
+from tests.selenium_fakes import AlwaysVisible, FakeDriver, calendar_page_for, no_browser, read_fixture
+
+UTC = gettz("UTC")
+
+
+def read_trace(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.trace = os.path.join(self.tmpdir, "trace.jsonl")
+        self.prom = os.path.join(self.tmpdir, "scraper.prom")
+        self.m = Metrics(trace_path=self.trace, prometheus_path=self.prom, buckets=(0.1, 1))
+
+    def tearDown(self):
+        self.m.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_counters_and_histograms(self):
+        self.m.inc("pages", result="ok")
+        self.m.inc("pages", 2, result="ok")
+        self.m.observe("page_seconds", 0.05)
+        self.m.observe("page_seconds", 0.5)
+        self.m.observe("page_seconds", 5)
+        self.assertEqual(self.m.counter("pages", result="ok"), 3)
+        self.assertEqual(self.m.counter("pages", result="failed"), 0)
+        self.assertEqual(self.m.histogram("page_seconds"), (3, 5.55))
+
+        text = self.m.prometheus_text()
+        self.assertIn("# TYPE forexfactory_pages_total counter", text)
+        self.assertIn('forexfactory_pages_total{result="ok"} 3', text)
+        self.assertIn('forexfactory_page_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('forexfactory_page_seconds_bucket{le="1"} 2', text)
+        self.assertIn('forexfactory_page_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("forexfactory_page_seconds_count 3", text)
+
+        self.m.flush()
+        with open(self.prom, encoding="utf-8") as f:
+            self.assertEqual(f.read(), text)
+
+    def test_timer_and_trace_context(self):
+        with self.m.context(page="day=jan06.2025"):
+            with self.m.timer("merge"):
+                pass
+            with self.assertRaises(ValueError), self.m.timer("csv_write"):
+                raise ValueError("disk full")
+        self.m.trace("page", rows=6)
+        self.m.flush()
+
+        self.assertEqual(self.m.histogram("stage_seconds", stage="merge")[0], 1)
+        self.assertEqual(self.m.histogram("stage_seconds", stage="csv_write")[0], 1)
+        merge, write, page = read_trace(self.trace)
+        self.assertEqual((merge["event"], merge["stage"], merge["page"]), ("stage", "merge", "day=jan06.2025"))
+        self.assertEqual(write["error"], "ValueError")
+        self.assertNotIn("page", page)
+        self.assertEqual(page["rows"], 6)
+
+    def test_day_profiler(self):
+        path = os.path.join(self.tmpdir, "day.pstats")
+        profiler = DayProfiler(date(2025, 1, 7), path)
+        with profiler.around(date(2025, 1, 6), date(2025, 1, 6)):
+            pass
+        profiler.dump()
+        self.assertFalse(os.path.exists(path))
+
+        with profiler.around(date(2025, 1, 6), date(2025, 1, 12)):
+            sorted(range(1000))
+        profiler.dump()
+        self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+
+class TestScraperInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "cache.csv")
+        self.trace = os.path.join(self.tmpdir, "trace.jsonl")
+        self.prom = os.path.join(self.tmpdir, "scraper.prom")
+        self.m = Metrics(trace_path=self.trace, prometheus_path=self.prom)
+        self.previous = metrics.install(self.m)
+
+    def tearDown(self):
+        metrics.install(self.previous)
+        self.m.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_http_run(self):
+        start, end = datetime(2025, 1, 6, tzinfo=UTC), datetime(2025, 1, 7, tzinfo=UTC)
+        with CalendarServer(calendar_page_for([start, end])) as srv, \
+                patch.object(scraper, "_launch_driver", no_browser):
+            scraper.scrape_range_pandas(start, end, self.csv, backend="http",
+                                        fetcher=HttpFetcher(base_url=srv.calendar_url), profile_day=end)
+
+        self.assertEqual(self.m.counter("pages", result="ok"), 2)
+        self.assertEqual(self.m.counter("http_fetches", result="ok"), 2)
+        self.assertEqual(self.m.counter("rows_scraped"), 12)
+        self.assertEqual(self.m.counter("rows_added"), 12)
+        for stage in ("http_fetch", "extract_html", "store_write", "csv_write"):
+            self.assertGreater(self.m.histogram("stage_seconds", stage=stage)[0], 0, stage)
+        self.assertEqual(self.m.histogram("page_seconds")[0], 2)
+
+        self.assertTrue(os.path.exists(self.prom))
+        records = read_trace(self.trace)
+        pages = [r for r in records if r["event"] == "page"]
+        self.assertEqual([(p["page"], p["rows"]) for p in pages],
+                         [("day=jan06.2025", 6), ("day=jan07.2025", 6)])
+        fetches = [r for r in records if r.get("stage") == "http_fetch"]
+        self.assertEqual({r["page"] for r in fetches}, {"day=jan06.2025", "day=jan07.2025"})
+        self.assertTrue(os.path.exists(profile_path(self.csv, end)))
+        self.assertFalse(os.path.exists(profile_path(self.csv, start)))
+
+    def test_detail_clicks_and_webdriver_calls(self):
+        day = datetime(2025, 1, 6, tzinfo=UTC)
+        driver = count_commands(FakeDriver(read_fixture("calendar_day_jan06_2025.html")))
+        with patch.object(scraper, "WebDriverWait", AlwaysVisible), \
+                patch.object(scraper, "parse_detail_table", lambda driver: {"Source": "Clicked"}), \
+                patch.object(scraper.time, "sleep"):
+            df = scraper.parse_calendar_day(driver, day, scrape_details=True)
+        self.assertEqual(self.m.counter("detail_lookups", source="click"), len(df))
+        self.assertEqual(self.m.histogram("stage_seconds", stage="detail_click")[0], len(df))
+        self.assertEqual(self.m.histogram("stage_seconds", stage="extract_selenium")[0], 1)
+        # One per command actually sent, however the extraction code gets there
+        self.assertEqual(self.m.counter("webdriver_calls"), len(driver.commands))
+        self.assertGreater(len(driver.commands), 12 * len(df))
+
+
+if __name__ == "__main__":
+    unittest.main()
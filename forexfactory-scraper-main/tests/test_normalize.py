@@ -0,0 +1,67 @@
+# tests/test_normalize.py
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.forexfactory import schema
+from src.forexfactory.csv_util import CSV_COLUMNS, merge_new_data, write_data_to_csv
+from src.forexfactory.normalize import NORMALIZED_COLUMNS, is_normalized, normalize, parse_values
+from tests.selenium_fakes import make_rows
+
+# make_rows layout for these tests
+ROW = {"Actual": "1"}
+
+
+class TestNormalize(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = make_rows([
+            ("2025-01-10T17:00:00+03:30", "USD", "Non-Farm Employment Change", np.nan),
+            ("2025-01-10T17:00:00+03:30", "USD", "Unemployment Rate", np.nan),
+            ("2025-01-15T23:59:59+03:30", "EUR", "Bank Holiday", np.nan),
+            ("2025-01-16T00:00:00+03:30", "GBP", "MPC Member Speaks", np.nan),
+        ], **ROW)
+        self.cache["Actual"] = ["256K", "4.1%", np.nan, np.nan]
+        self.cache["Forecast"] = ["164K", "4.2", np.nan, np.nan]
+
+    def test_parse_values(self):
+        values = pd.Series(["55.3", "1.8%", "-12K", "1.2B", "<0.25%", "3.62|2.3", "0-0-9", "Pass", "", np.nan])
+        got = parse_values(values)
+        np.testing.assert_allclose(got["Value"].to_numpy()[:6], [55.3, 1.8, -12_000, 1.2e9, 0.25, 3.62])
+        self.assertTrue(got["Value"].iloc[6:].isna().all())
+        self.assertEqual(got["Unit"].tolist()[:6], ["", "%", "", "", "%", ""])
+        self.assertTrue(got["Unit"].iloc[6:].isna().all())
+        self.assertEqual(got["Magnitude"].tolist()[:6], [0, 0, 3, 9, 0, 0])
+
+    def test_surprise_and_flags_in_both_layouts(self):
+        for df in (self.cache, schema.to_typed(self.cache)):
+            got = normalize(df)
+            self.assertTrue(is_normalized(got))
+            self.assertEqual(got["Surprise"].iloc[0], 92_000)
+            # "4.1%" against "4.2": not the same unit
+            self.assertTrue(np.isnan(got["Surprise"].iloc[1]))
+            self.assertEqual(got["AllDay"].tolist(), [False, False, True, False])
+            self.assertEqual(got["Tentative"].tolist(), [False, False, False, True])
+
+    def test_merge_keeps_columns_out_of_csv(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            existing = normalize(schema.to_typed(self.cache.iloc[:2]))
+            merged = merge_new_data(existing, normalize(self.cache.iloc[2:]))
+            self.assertEqual(list(merged.columns), CSV_COLUMNS + NORMALIZED_COLUMNS)
+            self.assertEqual(merged["AllDay"].tolist(), [False, False, True, False])
+
+            path = os.path.join(tmpdir, "cache.csv")
+            write_data_to_csv(merged, path)
+            self.assertEqual(list(pd.read_csv(path).columns), CSV_COLUMNS)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+# tests/test_page_cache.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.date_logic import CalendarPage
+from src.forexfactory.fetcher import HttpFetcher
+from src.forexfactory.page_cache import PageCache, is_fresh
+from tests.local_server import CalendarServer
+from tests.selenium_fakes import calendar_page_for, no_browser, read_fixture
+
+UTC = gettz("UTC")
+NOW = datetime(2025, 3, 10, 12, 0, tzinfo=UTC)
+
+
+def day_page(d):
+    return CalendarPage(d, d, f"day={d:%b%d.%Y}".lower())
+
+
+class TestFreshness(unittest.TestCase):
+
+    def test_policy(self):
+        # Today and future days: always refetched
+        self.assertFalse(is_fresh(date(2025, 3, 10), NOW - timedelta(seconds=5), NOW))
+        self.assertFalse(is_fresh(date(2025, 3, 12), NOW, NOW))
+        # Past day fetched long after it ended: forever
+        self.assertTrue(is_fresh(date(2024, 1, 5), datetime(2024, 6, 1, tzinfo=UTC), NOW))
+        # Past day fetched while still recent: minutes only
+        fetched = datetime(2025, 3, 10, 0, 30, tzinfo=UTC)
+        self.assertTrue(is_fresh(date(2025, 3, 9), fetched, fetched + timedelta(minutes=10)))
+        self.assertFalse(is_fresh(date(2025, 3, 9), fetched, NOW))
+        # Blank Actuals: minutes only until the grace period is over
+        fetched = datetime(2025, 3, 5, tzinfo=UTC)
+        self.assertTrue(is_fresh(date(2025, 3, 3), fetched, NOW))
+        self.assertFalse(is_fresh(date(2025, 3, 3), fetched, NOW, complete=False))
+        self.assertTrue(is_fresh(date(2025, 2, 20), fetched, NOW, complete=False))
+
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "pages.sqlite")
+        self.now = NOW
+        self.cache = PageCache(self.path, clock=lambda: self.now)
+        self.page = read_fixture("calendar_day_jan06_2025.html")
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip_compressed(self):
+        page = day_page(datetime(2025, 1, 6, tzinfo=UTC))
+        self.cache.put(page, self.page)
+        self.assertEqual(self.cache.get(page), self.page)
+        self.assertEqual(self.cache.read(page.param), self.page)
+        stored = self.cache.conn.execute("SELECT length(body) FROM pages").fetchone()[0]
+        self.assertLess(stored, len(self.page.encode("utf-8")) / 3)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+
+    def test_recent_and_future_pages_expire(self):
+        today = day_page(datetime(2025, 3, 10, tzinfo=UTC))
+        yesterday = day_page(datetime(2025, 3, 9, tzinfo=UTC))
+        self.cache.put(today, self.page)
+        self.cache.put(yesterday, self.page)
+        self.assertIsNone(self.cache.get(today))
+        self.assertIsNotNone(self.cache.get(yesterday))
+        self.now = NOW + timedelta(hours=1)
+        self.assertIsNone(self.cache.get(yesterday))
+        # Still archived for replay
+        self.assertEqual(len(self.cache.entries()), 2)
+
+    def test_blank_actuals_expire(self):
+        page = day_page(datetime(2025, 3, 3, tzinfo=UTC))
+        blank = self.page.replace("0.4%", "", 1)
+        self.now = datetime(2025, 3, 5, tzinfo=UTC)
+        self.cache.put(page, blank)
+        self.now = NOW
+        self.assertIsNone(self.cache.get(page))
+        self.cache.put(page, self.page)
+        self.now = NOW + timedelta(days=1)
+        self.assertEqual(self.cache.get(page), self.page)
+        self.assertEqual(self.cache.conn.execute("SELECT actuals_complete FROM pages").fetchone()[0], 1)
+
+    def test_archive_without_the_column(self):
+        page = day_page(datetime(2025, 3, 3, tzinfo=UTC))
+        self.now = datetime(2025, 3, 5, tzinfo=UTC)
+        self.cache.put(page, self.page.replace("0.4%", "", 1))
+        self.cache.conn.execute("ALTER TABLE pages DROP COLUMN actuals_complete")
+        self.cache.close()
+        self.cache = PageCache(self.path, clock=lambda: NOW)
+        self.assertIsNone(self.cache.get(page))
+        self.assertEqual(self.cache.conn.execute("SELECT actuals_complete FROM pages").fetchone()[0], 0)
+
+    def test_entries_by_range(self):
+        for d in (5, 6, 7):
+            self.cache.put(day_page(datetime(2025, 1, d, tzinfo=UTC)), self.page)
+        entries = self.cache.entries(date(2025, 1, 6), date(2025, 1, 7))
+        self.assertEqual([e.param for e in entries], ["day=jan06.2025", "day=jan07.2025"])
+
+
+class TestScrapeWithPageCache(unittest.TestCase):
+
+    def test_second_run_needs_no_network(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        start, end = datetime(2025, 1, 6, tzinfo=UTC), datetime(2025, 1, 7, tzinfo=UTC)
+        outputs = []
+        with CalendarServer(calendar_page_for([start, end])) as srv, \
+                patch.object(scraper, "_launch_driver", no_browser):
+            for run in range(2):
+                csv = os.path.join(tmpdir, f"run{run}.csv")
+                with PageCache(os.path.join(tmpdir, "pages.sqlite")) as cache:
+                    scraper.scrape_range_pandas(
+                        start, end, csv, backend="http",
+                        fetcher=HttpFetcher(base_url=srv.calendar_url), page_cache=cache,
+                    )
+                outputs.append(pd.read_csv(csv, dtype=str))
+            self.assertEqual(srv.paths, ["/calendar?day=jan06.2025", "/calendar?day=jan07.2025"])
+        pd.testing.assert_frame_equal(outputs[0], outputs[1])
+        self.assertEqual(len(outputs[1]), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# tests/test_parallel.py
+
+import os
+import random
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.config import FetchOptions, ScrapeConfig, StorageOptions
+from src.forexfactory.scraper import scrape_range_pandas
+
+
+class FakeDriver:
+    def execute_script(self, script, *args):
+        return 1
+
+    def quit(self):
+        pass
+
+
+def fake_scrape_page(driver, page, existing_df, **kwargs):
+    # Random latency so that workers finish out of order
+    time.sleep(random.uniform(0, 0.02))
+    the_date = page.start
+    return pd.DataFrame([
+        {
+            "DateTime": the_date.replace(hour=h).isoformat(),
+            "Currency": cur,
+            "Impact": "High Impact Expected",
+            "Event": f"Event {cur}",
+            "Actual": "1.0",
+            "Forecast": "",
+            "Previous": "",
+            "Detail": "",
+        }
+        for h, cur in ((8, "USD"), (8, "EUR"), (2, "JPY"))
+    ])
+
+
+class TestParallelRange(unittest.TestCase):
+
+    def _run(self, workers, **kwargs):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        os.remove(path)
+        tz = gettz("UTC")
+        with patch.object(scraper, "_launch_driver", lambda profile=None: FakeDriver()), \
+                patch.object(scraper, "scrape_page", fake_scrape_page):
+            scrape_range_pandas(
+                datetime(2025, 1, 1, tzinfo=tz),
+                datetime(2025, 1, 10, tzinfo=tz),
+                path,
+                workers=workers,
+                **kwargs,
+            )
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        os.remove(path)
+        return content
+
+    def test_parallel_output_matches_sequential(self):
+        sequential = self._run(1)
+        parallel = self._run(4)
+        self.assertEqual(sequential, parallel)
+        self.assertEqual(len(sequential.strip().splitlines()), 1 + 10 * 3)
+
+    def test_journal_mode_output_matches_rewrite(self):
+        rewrite = self._run(1)
+        journal = self._run(2, write_mode="journal", compact_every=3)
+        self.assertEqual(rewrite, journal)
+
+    def test_config_matches_flat_options(self):
+        config = ScrapeConfig(fetch=FetchOptions(granularity="week"),
+                              storage=StorageOptions(write_mode="journal", compact_every=3))
+        self.assertEqual(self._run(2, granularity="week", write_mode="journal", compact_every=3),
+                         self._run(2, config=config))
+
+
+if __name__ == '__main__':
+    unittest.main()
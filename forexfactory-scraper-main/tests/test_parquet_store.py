@@ -0,0 +1,126 @@
+# tests/test_parquet_store.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from src.forexfactory.csv_util import read_existing_data, write_data_to_csv
+from src.forexfactory.parquet_store import ParquetStore
+from src.forexfactory.sqlite_store import SqliteStore
+from src.forexfactory.storage import open_writer, read_cache
+from tests.selenium_fakes import HIGH, MEDIUM, make_rows
+
+# make_rows layout for these tests
+ROW = {"fields": ("DateTime", "Currency", "Impact", "Event", "Detail"), "Actual": "1.2%", "Previous": "0.9%"}
+
+ROWS = make_rows([
+    ("2024-12-31T23:30:00-05:00", "USD", HIGH, "NFP", ""),
+    ("2025-01-06T08:00:00+01:00", "EUR", MEDIUM, "CPI", "Source: Eurostat"),
+    ("2025-01-06T14:30:00+00:00", "USD", HIGH, "ISM", ""),
+    ("2025-02-03T09:00:00+03:30", "GBP", HIGH, "GDP", ""),
+], **ROW)
+
+
+class TestParquetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmpdir, "cache.parquet")
+        self.store = ParquetStore(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def partitions(self):
+        return sorted(
+            os.path.relpath(os.path.join(d, f), self.root)
+            for d, _, files in os.walk(self.root) for f in files
+        )
+
+    def test_partitioned_by_local_year_month(self):
+        self.assertEqual(self.store.upsert(ROWS), 4)
+        self.assertEqual(self.partitions(), [
+            os.path.join("year=2024", "month=12", "part-0.parquet"),
+            os.path.join("year=2025", "month=01", "part-0.parquet"),
+            os.path.join("year=2025", "month=02", "part-0.parquet"),
+        ])
+
+    def test_round_trip_is_lossless(self):
+        self.store.upsert(ROWS)
+        csv = os.path.join(self.tmpdir, "export.csv")
+        self.store.export_csv(csv)
+        source = os.path.join(self.tmpdir, "source.csv")
+        write_data_to_csv(ROWS, source)
+        pd.testing.assert_frame_equal(read_existing_data(csv), read_existing_data(source))
+
+    def test_typed_columns(self):
+        self.store.upsert(ROWS)
+        df = self.store.read()
+        self.assertEqual(str(df["DateTime"].dt.tz), "UTC")
+        self.assertIsInstance(df["Currency"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["DateTime"].iloc[0], pd.Timestamp("2025-01-01T04:30:00Z"))
+
+    def test_filters(self):
+        self.store.upsert(ROWS)
+        df = self.store.read_strings(currencies=["USD"], impacts=[HIGH])
+        self.assertEqual(list(df["Event"]), ["NFP", "ISM"])
+
+        # Calendar days as scraped: NFP is on Dec 31 locally, Jan 1 in UTC
+        df = self.store.read_strings(start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                                     end=datetime(2025, 1, 31, tzinfo=timezone.utc))
+        self.assertEqual(list(df["Event"]), ["CPI", "ISM"])
+
+    def test_single_day_matches_sqlite(self):
+        self.store.upsert(ROWS)
+        with SqliteStore(os.path.join(self.tmpdir, "cache.sqlite")) as sqlite_store:
+            sqlite_store.upsert(ROWS)
+            for start, end in ((datetime(2025, 1, 6), datetime(2025, 1, 6)),
+                               ("2024-12-31", "2024-12-31"),
+                               (datetime(2025, 2, 3), None)):
+                with self.subTest(start=start):
+                    expected = sqlite_store.read(start=start, end=end)
+                    df = self.store.read_strings(start=start, end=end)
+                    self.assertTrue(len(expected))
+                    self.assertEqual(list(df["Event"]), list(expected["Event"]))
+        self.assertEqual(list(self.store.read_strings(start=datetime(2025, 1, 6),
+                                                      end=datetime(2025, 1, 6))["Event"]), ["CPI", "ISM"])
+
+    def test_upsert_rewrites_only_touched_partitions(self):
+        self.store.upsert(ROWS)
+        untouched = os.path.join(self.root, "year=2025", "month=02", "part-0.parquet")
+        mtime = os.stat(untouched).st_mtime_ns
+
+        update = make_rows([
+            ("2025-01-06T14:30:00+00:00", "USD", HIGH, "ISM", "Source: ISM"),
+            ("2025-01-07T10:00:00+00:00", "EUR", HIGH, "Retail Sales", ""),
+        ], **ROW)
+        self.assertEqual(self.store.upsert(update), 1)
+        self.assertEqual(os.stat(untouched).st_mtime_ns, mtime)
+
+        df = self.store.read_strings()
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df.loc[df["Event"] == "ISM", "Detail"].iloc[0], "Source: ISM")
+
+    def test_known_detail_is_kept(self):
+        self.store.upsert(ROWS)
+        self.store.upsert(make_rows([("2025-01-06T08:00:00+01:00", "EUR", MEDIUM, "CPI", "other")], **ROW))
+        df = self.store.read_strings()
+        self.assertEqual(df.loc[df["Event"] == "CPI", "Detail"].iloc[0], "Source: Eurostat")
+
+    def test_writer_and_read_cache(self):
+        csv = os.path.join(self.tmpdir, "cache.csv")
+        writer = open_writer(csv, store="parquet", export_csv=True)
+        self.assertTrue(writer.read().empty)
+        writer.write(ROWS, ROWS)
+        writer.close(ROWS)
+
+        self.assertEqual(len(read_cache(csv, store="parquet")), 4)
+        self.assertEqual(len(read_existing_data(csv)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# tests/test_pipeline.py
+
+import asyncio
+import random
+import threading
+import time
+import unittest
+
+from src.forexfactory.pipeline import Stage, run_pipeline
+
+
+class TestRunPipeline(unittest.TestCase):
+
+    def test_results_come_back_in_submission_order(self):
+        def fetch(item, _):
+            time.sleep(random.uniform(0, 0.01))
+            return item * 10
+
+        def parse(item, value):
+            time.sleep(random.uniform(0, 0.005))
+            return value + 1
+
+        sunk = []
+        run_pipeline(range(30), [Stage("fetch", fetch, 4), Stage("parse", parse, 2)],
+                     lambda item, value: sunk.append((item, value)))
+        self.assertEqual(sunk, [(d, d * 10 + 1) for d in range(30)])
+
+    def test_stages_overlap(self):
+        # 3 stages of 50 ms each over 6 items: ~400 ms pipelined, 900 ms sequential
+        def slow(item, value):
+            time.sleep(0.05)
+            return item
+
+        start = time.perf_counter()
+        run_pipeline(range(6), [Stage("fetch", slow, 1), Stage("parse", slow, 1)],
+                     lambda item, value: time.sleep(0.05))
+        self.assertLess(time.perf_counter() - start, 0.75)
+
+    def test_backpressure_bounds_items_in_flight(self):
+        lock = threading.Lock()
+        state = {"in_flight": 0, "max": 0}
+
+        def fetch(item, _):
+            with lock:
+                state["in_flight"] += 1
+                state["max"] = max(state["max"], state["in_flight"])
+            return item
+
+        def slow_sink(item, value):
+            time.sleep(0.01)
+            with lock:
+                state["in_flight"] -= 1
+
+        run_pipeline(range(40), [Stage("fetch", fetch, 4)], slow_sink, max_in_flight=5)
+        self.assertLessEqual(state["max"], 5)
+
+    def test_none_skips_later_stages(self):
+        parsed = []
+        sunk = []
+        run_pipeline(
+            range(4),
+            [Stage("fetch", lambda item, _: None if item == 2 else item, 2),
+             Stage("parse", lambda item, value: parsed.append(item) or value, 1)],
+            lambda item, value: sunk.append(value),
+        )
+        self.assertEqual(sorted(parsed), [0, 1, 3])
+        self.assertEqual(sunk, [0, 1, None, 3])
+
+    def test_errors_stop_the_pipeline(self):
+        sunk = []
+
+        def fetch(item, _):
+            if item == 3:
+                raise ValueError("boom")
+            return item
+
+        with self.assertRaises(ValueError):
+            run_pipeline(range(100), [Stage("fetch", fetch, 2)],
+                         lambda item, value: sunk.append(item))
+        self.assertLess(len(sunk), 100)
+
+        def failing_sink(item, value):
+            raise OSError("disk full")
+
+        with self.assertRaises(OSError):
+            run_pipeline(range(10), [Stage("fetch", lambda item, _: item, 2)], failing_sink)
+
+    def test_stage_can_run_on_an_earlier_stage_pool(self):
+        threads = {}
+
+        def record(name):
+            def run(item, value):
+                threads.setdefault(name, set()).add(threading.current_thread().name)
+                return item
+            return run
+
+        run_pipeline(range(10), [Stage("fetch", record("fetch"), 2),
+                                 Stage("parse", record("parse"), 1),
+                                 Stage("fallback", record("fallback"), 2, pool="fetch")],
+                     lambda item, value: None)
+        self.assertTrue(all(t.startswith("pipeline-fetch") for t in threads["fallback"]))
+        self.assertTrue(all(t.startswith("pipeline-parse") for t in threads["parse"]))
+
+    def test_inside_a_running_event_loop(self):
+        sunk = []
+
+        async def main():
+            run_pipeline(range(5), [Stage("fetch", lambda item, _: item * 2, 2)],
+                         lambda item, value: sunk.append(value))
+
+        asyncio.run(main())
+        self.assertEqual(sunk, [0, 2, 4, 6, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# tests/test_replay.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.coverage import CoverageManifest, manifest_path
+from src.forexfactory.csv_util import merge_new_data, read_existing_data, write_data_to_csv
+from src.forexfactory.date_logic import CalendarPage
+from src.forexfactory.fetcher import HttpFetcher
+from src.forexfactory.page_cache import PageCache
+from src.forexfactory.replay import plan_replay, replay
+from src.forexfactory.storage import open_writer, read_cache
+from tests.local_server import CalendarServer
+from tests.selenium_fakes import calendar_page_for, no_browser
+
+UTC = gettz("UTC")
+JANUARY = [datetime(2025, 1, d, tzinfo=UTC) for d in range(1, 32)]
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.archive = os.path.join(self.tmpdir, "pages.sqlite")
+        self.now = datetime(2025, 3, 1, tzinfo=UTC)
+        with PageCache(self.archive, clock=lambda: self.now) as cache:
+            cache.put(CalendarPage(JANUARY[0], JANUARY[-1], "month=jan.2025"), calendar_page_for(JANUARY))
+            # Jan 6 fetched again later with a revised Forecast
+            self.now += timedelta(days=1)
+            revised = calendar_page_for([JANUARY[5]]).replace("53.5", "77.7")
+            cache.put(CalendarPage(JANUARY[5], JANUARY[5], "day=jan06.2025"), revised)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def csv(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_latest_page_owns_each_day(self):
+        with PageCache(self.archive) as cache:
+            tasks = plan_replay(cache.entries())
+        owned = {param: days for param, _, days in tasks}
+        self.assertEqual(owned["day=jan06.2025"], ["2025-01-06"])
+        self.assertEqual(len(owned["month=jan.2025"]), 30)
+        self.assertNotIn("2025-01-06", owned["month=jan.2025"])
+
+    def test_rebuild_is_reproducible(self):
+        self.assertEqual(replay(self.archive, self.csv("a.csv"), tzname="UTC", processes=2), 31 * 6)
+        replay(self.archive, self.csv("b.csv"), tzname="UTC", processes=1)
+        with open(self.csv("a.csv"), "rb") as a, open(self.csv("b.csv"), "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+        df = read_existing_data(self.csv("a.csv"))
+        jan6 = df[df["DateTime"].str.startswith("2025-01-06")]
+        jan7 = df[df["DateTime"].str.startswith("2025-01-07")]
+        self.assertIn("77.7", set(jan6["Forecast"]))
+        self.assertNotIn("77.7", set(jan7["Forecast"]))
+
+    def test_range_and_store(self):
+        n = replay(self.archive, self.csv("c.csv"), tzname="UTC", processes=1,
+                   from_day=date(2025, 1, 5), to_day=date(2025, 1, 7), store="sqlite")
+        self.assertEqual(n, 3 * 6)
+        self.assertTrue(os.path.exists(self.csv("c.sqlite")))
+
+    def test_window_replaces_only_its_days(self):
+        for store in ("csv", "sqlite", "parquet"):
+            with self.subTest(store=store):
+                csv = self.csv(f"window-{store}.csv")
+                replay(self.archive, csv, tzname="UTC", processes=1, store=store)
+                # Details scraped later for Jan 6, an event only the cache has on Jan 20
+                df = read_cache(csv, store)
+                edits = df[df["DateTime"].str.startswith("2025-01-06")].copy()
+                edits["Detail"] = "Source: Eurostat"
+                extra = edits.iloc[:1].copy()
+                extra["DateTime"] = "2025-01-20T10:00:00+00:00"
+                extra["Event"] = "Only in the cache"
+                batch = pd.concat([edits, extra], ignore_index=True)
+                if store == "csv":
+                    write_data_to_csv(merge_new_data(df, batch), csv)
+                else:
+                    writer = open_writer(csv, store=store)
+                    writer.write(None, batch, batch)
+                    writer.close(None)
+                manifest = CoverageManifest(manifest_path(csv))
+                manifest.record_day("2025-01-06", df.iloc[:0], datetime(2025, 1, 6, tzinfo=UTC))
+                manifest.save()
+
+                n = replay(self.archive, csv, tzname="UTC", processes=1, store=store,
+                           from_day=date(2025, 1, 5), to_day=date(2025, 1, 7))
+                self.assertEqual(n, 3 * 6)
+                df = read_cache(csv, store)
+                self.assertEqual(len(df), 31 * 6 + 1)
+                self.assertIn("Only in the cache", set(df["Event"]))
+                jan6 = df[df["DateTime"].str.startswith("2025-01-06")]
+                self.assertEqual(set(jan6["Detail"]), {"Source: Eurostat"})
+                self.assertIn("77.7", set(jan6["Forecast"]))
+                # Recorded as scraped when the Jan 6 page was archived
+                entry = CoverageManifest.load(manifest_path(csv)).days["2025-01-06"]
+                self.assertEqual((entry["rows"], entry["scraped_at"][:10]), (6, "2025-03-02"))
+
+    def test_replay_matches_scrape(self):
+        start, end = JANUARY[5], JANUARY[6]
+        archive = self.csv("scraped.sqlite")
+        with CalendarServer(calendar_page_for([start, end])) as srv, \
+                patch.object(scraper, "_launch_driver", no_browser), \
+                PageCache(archive) as cache:
+            scraper.scrape_range_pandas(start, end, self.csv("scraped.csv"), tzname="UTC", backend="http",
+                                        fetcher=HttpFetcher(base_url=srv.calendar_url), page_cache=cache)
+        replay(archive, self.csv("replayed.csv"), tzname="UTC", processes=1)
+        with open(self.csv("scraped.csv"), "rb") as a, open(self.csv("replayed.csv"), "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_missing_archive(self):
+        with self.assertRaises(FileNotFoundError):
+            replay(self.csv("nope.sqlite"), self.csv("x.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
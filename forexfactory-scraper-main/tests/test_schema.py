@@ -0,0 +1,98 @@
+# tests/test_schema.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import gettz
+
+from src.forexfactory import schema
+from src.forexfactory.csv_util import (
+    CSV_COLUMNS,
+    changed_rows,
+    merge_new_data,
+    read_existing_data,
+    write_data_to_csv,
+)
+from tests.selenium_fakes import make_rows
+
+# make_rows layout for these tests
+ROW = {"Actual": "1"}
+
+CASABLANCA = gettz("Africa/Casablanca")
+
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.tmpdir, "cache.csv")
+        # Casablanca switches between +00:00 and +01:00 around Ramadan
+        self.cache = make_rows([
+            ("2025-01-06T09:00:00+01:00", "EUR", "German CPI", "Source: Destatis"),
+            ("2025-03-03T09:00:00+00:00", "EUR", "German CPI", np.nan),
+            ("2025-03-03T14:30:00+00:00", "USD", "ISM PMI", np.nan),
+        ], **ROW)
+        self.cache["Forecast"] = ["0.3%", np.nan, "48.9"]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip(self):
+        typed = schema.to_typed(self.cache, CASABLANCA)
+        self.assertTrue(schema.is_typed(typed))
+        self.assertIsInstance(typed["Currency"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(typed["Actual"].dtype, pd.StringDtype)
+        self.assertEqual(typed["DateTime"].iloc[0], pd.Timestamp("2025-01-06T08:00:00Z"))
+        pd.testing.assert_frame_equal(schema.to_strings(typed), self.cache)
+        self.assertIs(schema.to_strings(self.cache), self.cache)
+
+    def test_inferred_timezone(self):
+        one_offset = pd.Series(["2025-01-06T02:00:00+03:30", np.nan])
+        self.assertEqual(schema.infer_tz(one_offset), timezone(timedelta(hours=3, minutes=30)))
+        # Several offsets and no timezone given: UTC, the strings change
+        self.assertEqual(schema.infer_tz(self.cache["DateTime"]), timezone.utc)
+        typed = schema.to_typed(self.cache)
+        self.assertEqual(schema.to_strings(typed)["DateTime"].iloc[0], "2025-01-06T08:00:00+00:00")
+
+    def test_invalid_datetimes_are_nat(self):
+        df = make_rows([("garbage", "USD", "A", ""), ("2025-13-06T02:00:00+00:00", "USD", "B", ""),
+                        ("2025-01-06T02:00:00-05:00", "USD", "C", "")], **ROW)
+        stamps = schema.to_typed(df, "UTC")["DateTime"]
+        self.assertTrue(stamps.iloc[:2].isna().all())
+        self.assertEqual(stamps.iloc[2], pd.Timestamp("2025-01-06T07:00:00Z"))
+
+    def test_merge_keeps_the_typed_layout(self):
+        typed = schema.to_typed(self.cache, CASABLANCA)
+        batch = make_rows([
+            ("2025-03-03T09:00:00+00:00", "EUR", "German CPI", "Source: Destatis"),
+            ("2025-03-04T10:00:00+00:00", "GBP", "Services PMI", np.nan),
+        ], **ROW)
+
+        merged = merge_new_data(typed, batch)
+        self.assertTrue(schema.is_typed(merged))
+        self.assertIsInstance(merged["Event"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(schema.to_strings(merged), merge_new_data(self.cache, batch))
+
+        delta = changed_rows(typed, batch)
+        self.assertFalse(schema.is_typed(delta))
+        pd.testing.assert_frame_equal(delta, changed_rows(self.cache, batch))
+
+    def test_csv_io(self):
+        write_data_to_csv(self.cache, self.csv)
+        with open(self.csv, encoding="utf-8") as f:
+            expected = f.read()
+        write_data_to_csv(schema.to_typed(self.cache, CASABLANCA), self.csv)
+        with open(self.csv, encoding="utf-8") as f:
+            self.assertEqual(f.read(), expected)
+        typed = read_existing_data(self.csv, typed=True, tz=CASABLANCA)
+        self.assertEqual(list(typed.columns), CSV_COLUMNS)
+        self.assertLess(schema.memory_usage(typed), schema.memory_usage(self.cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
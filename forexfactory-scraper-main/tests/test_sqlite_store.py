@@ -0,0 +1,110 @@
+# tests/test_sqlite_store.py
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.forexfactory.csv_util import read_existing_data
+from src.forexfactory.sqlite_store import SqliteStore
+from src.forexfactory.storage import open_writer, read_cache
+from tests.selenium_fakes import make_rows
+
+# make_rows layout for these tests
+ROW = {"fields": ("DateTime", "Currency", "Event", "Actual", "Detail"), "Forecast": "0.2%", "Previous": "0.1%"}
+
+ROWS = make_rows([
+    ("2025-01-06T08:00:00+01:00", "EUR", "CPI", "", ""),
+    ("2025-01-06T14:30:00+01:00", "USD", "ISM", "49.3", "Source: ISM"),
+    ("2025-01-07T10:00:00+01:00", "GBP", "GDP", "0.1%", ""),
+], **ROW)
+
+
+class TestSqliteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "cache.sqlite")
+        self.store = SqliteStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_upsert_counts_new_rows(self):
+        self.assertEqual(self.store.upsert(ROWS), 3)
+        self.assertEqual(self.store.upsert(ROWS), 0)
+        self.assertEqual(len(self.store), 3)
+
+    def test_keys_are_stripped(self):
+        self.store.upsert(ROWS)
+        again = make_rows([(" 2025-01-06T08:00:00+01:00", "EUR ", " CPI", "", "")], **ROW)
+        self.assertEqual(self.store.upsert(again), 0)
+
+    def test_fills_empty_detail_and_keeps_known_one(self):
+        self.store.upsert(ROWS)
+        self.store.upsert(make_rows([
+            ("2025-01-06T08:00:00+01:00", "EUR", "CPI", "", "Source: Eurostat"),
+            ("2025-01-06T14:30:00+01:00", "USD", "ISM", "", "other"),
+        ], **ROW))
+        details = self.store.read().set_index("Event")["Detail"]
+        self.assertEqual(details["CPI"], "Source: Eurostat")
+        self.assertEqual(details["ISM"], "Source: ISM")
+
+    def test_updates_actual_but_not_with_blank(self):
+        self.store.upsert(ROWS)
+        self.store.upsert(make_rows([("2025-01-06T08:00:00+01:00", "EUR", "CPI", "2.4%", "")], **ROW))
+        self.store.upsert(make_rows([("2025-01-06T14:30:00+01:00", "USD", "ISM", "", "")], **ROW))
+        actuals = self.store.read().set_index("Event")["Actual"]
+        self.assertEqual(actuals["CPI"], "2.4%")
+        self.assertEqual(actuals["ISM"], "49.3")
+
+    def test_read_filters_and_shape(self):
+        self.store.upsert(ROWS)
+        df = self.store.read(start="2025-01-07", end="2025-01-07")
+        self.assertEqual(list(df["Event"]), ["GDP"])
+        df = self.store.read(currencies=["USD", "GBP"])
+        self.assertEqual(list(df["Event"]), ["ISM", "GDP"])
+        # Same shape as read_existing_data: NaN for empty cells
+        self.assertTrue(pd.isna(self.store.read(currencies=["EUR"])["Actual"].iloc[0]))
+
+    def test_indexes(self):
+        names = {row[0] for row in self.store.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_events_datetime", names)
+        self.assertIn("idx_events_currency", names)
+
+    def test_reader_sees_committed_rows_during_write(self):
+        self.store.upsert(ROWS)
+        self.store.conn.execute("BEGIN IMMEDIATE")
+        self.store.conn.execute(
+            "INSERT INTO events (DateTime, Currency, Event) VALUES ('2025-01-08', 'JPY', 'X')")
+        reader = SqliteStore(self.path, timeout=0.1)
+        try:
+            self.assertEqual(len(reader.read()), 3)
+        finally:
+            reader.close()
+            self.store.conn.rollback()
+
+    def test_writer_exports_csv(self):
+        csv = os.path.join(self.tmpdir, "cache.csv")
+        writer = open_writer(csv, store="sqlite", export_csv=True)
+        writer.write(ROWS, ROWS.iloc[:1], ROWS)
+        writer.close(ROWS)
+        self.assertEqual(len(read_cache(csv, store="sqlite")), 3)
+        self.assertEqual(list(read_existing_data(csv)["Event"]), ["CPI", "ISM", "GDP"])
+
+    def test_durable_writer_syncs_every_commit(self):
+        csv = os.path.join(self.tmpdir, "cache.csv")
+        for durable, level in ((False, 1), (True, 2)):
+            writer = open_writer(csv, store="sqlite", durable=durable)
+            # 1 = NORMAL, 2 = FULL
+            self.assertEqual(writer.store.conn.execute("PRAGMA synchronous").fetchone()[0], level)
+            writer.close(ROWS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+# tests/test_throttle.py
+
+import queue
+import threading
+import unittest
+from datetime import datetime
+
+from dateutil.tz import gettz
+
+from src.forexfactory import scraper
+from src.forexfactory.date_logic import iter_calendar_pages
+from src.forexfactory.fetcher import ChallengeError, HttpFetcher
+from src.forexfactory.throttle import AimdThrottle, TokenBucket
+from tests.local_server import CalendarServer
+from tests.selenium_fakes import read_fixture
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_callers_queue_up(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=1, clock=clock, sleep=clock.sleep)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.5, 1.0])
+        clock.now = 10.0
+        # Idle time only saves up `burst` tokens
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0.0, 0.5])
+
+    def test_unlimited_and_drain(self):
+        clock = FakeClock()
+        bucket = TokenBucket(clock=clock, sleep=clock.sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+        bucket.set_rate(4.0, drain=True)
+        self.assertEqual(bucket.acquire(), 0.25)
+        self.assertEqual(clock.now, 0.25)
+
+
+class TestAimdThrottle(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def make(self, **kwargs):
+        return AimdThrottle(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def fetch(self, throttle, seconds, outcome=None, kind="page"):
+        with throttle.request(kind) as req:
+            self.clock.now += seconds
+            req.outcome = outcome
+
+    def test_unlimited_until_pushed_back(self):
+        throttle = self.make(max_concurrency=4)
+        for _ in range(10):
+            self.fetch(throttle, 0.5)
+        self.assertIsNone(throttle.rate)
+        self.assertEqual(throttle.concurrency, 4)
+
+        self.fetch(throttle, 0.5, "challenge")
+        self.assertEqual(throttle.concurrency, 2)
+        # 4 in flight at 0.5 s each were 8 req/s: halved
+        self.assertAlmostEqual(throttle.rate, 4.0)
+        # The next request waits for the drained bucket
+        start = self.clock.now
+        self.fetch(throttle, 0.0)
+        self.assertAlmostEqual(self.clock.now - start, 0.25)
+
+    def test_one_back_off_per_round(self):
+        throttle = self.make(max_concurrency=8, rate=8.0)
+        started = []
+        for _ in range(3):
+            ctx = throttle.request()
+            started.append((ctx, ctx.__enter__()))
+        self.clock.now += 1.0
+        for ctx, req in started:
+            req.outcome = "timeout"
+            ctx.__exit__(None, None, None)
+        # The three were sent at the same pace: a single halving
+        self.assertEqual(throttle.concurrency, 4)
+        self.assertAlmostEqual(throttle.rate, 4.0)
+
+    def test_additive_increase(self):
+        throttle = self.make(max_concurrency=4, rate=1.0, max_rate=1.5, increase=0.1)
+        self.fetch(throttle, 0.1, "error")
+        self.assertEqual((throttle.concurrency, throttle.rate), (2, 0.5))
+        for _ in range(2):
+            self.fetch(throttle, 0.1)
+        self.assertEqual(throttle.concurrency, 3)
+        self.assertAlmostEqual(throttle.rate, 0.5 + 0.1 / 0.5 + 0.1 / 0.7)
+        for _ in range(50):
+            self.fetch(throttle, 0.1)
+        self.assertEqual((throttle.concurrency, throttle.rate), (4, 1.5))
+
+    def test_slow_pages_and_ignored_errors(self):
+        throttle = self.make(max_concurrency=2)
+        for _ in range(5):
+            self.fetch(throttle, 2.0, kind="browser")
+        # Usual latency of another kind of request is not compared
+        self.fetch(throttle, 10.0, kind="browser_details")
+        self.assertEqual(throttle.concurrency, 2)
+        self.fetch(throttle, 10.0, kind="browser")
+        self.assertEqual(throttle.concurrency, 1)
+        rate = throttle.rate
+
+        with self.assertRaises(KeyError):
+            with throttle.request(classify=lambda e: None):
+                raise KeyError("parsing bug")
+        with self.assertRaises(ChallengeError):
+            with throttle.request(classify=lambda e: "challenge"):
+                self.clock.now += 1
+                raise ChallengeError("429")
+        self.assertAlmostEqual(throttle.rate, rate / 2)
+
+
+class TestThrottledServer(unittest.TestCase):
+
+    def test_http_backend_reports_challenges(self):
+        with CalendarServer(read_fixture("calendar_day_jan06_2025.html")) as srv:
+            srv.challenge = True
+            fetcher = HttpFetcher(base_url=srv.calendar_url)
+            throttle = AimdThrottle(max_concurrency=4)
+            page = next(iter_calendar_pages(datetime(2025, 1, 6, tzinfo=gettz("UTC")),
+                                            datetime(2025, 1, 6, tzinfo=gettz("UTC"))))
+            self.assertIsNone(scraper._HttpBackend(fetcher, throttle).fetch_html(page))
+            fetcher.close()
+        self.assertEqual(throttle.concurrency, 2)
+        self.assertIsNotNone(throttle.rate)
+
+    def test_settles_under_the_server_limit(self):
+        with CalendarServer(read_fixture("calendar_day_jan06_2025.html")) as srv:
+            srv.max_rate = 40
+            srv.calendar_delay = 0.01
+            fetcher = HttpFetcher(base_url=srv.calendar_url, pool_size=4)
+            throttle = AimdThrottle(max_concurrency=4, increase=1.0)
+            todo = queue.Queue()
+            for n in range(60):
+                todo.put(n)
+            done = []
+
+            def worker():
+                while True:
+                    try:
+                        n = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        with throttle.request("http", classify=lambda e: "challenge"):
+                            fetcher.fetch(f"day=p{n}")
+                        done.append(n)
+                    except ChallengeError:
+                        todo.put(n)
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            fetcher.close()
+
+        self.assertEqual(sorted(done), list(range(60)))
+        # Without the throttle, four workers retrying at once keep the
+        # server's window full and never get through
+        self.assertLess(srv.throttled, 60)
+        self.assertTrue(10 < throttle.rate < 60, throttle.rate)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ from dateutil.tz import gettz
 #
 # یا اگر بعداً به فایل جدا مثلاً date_logic.py منتقل کردید، آن را اصلاح کنید.
 from src.forexfactory.date_logic import build_url_for_partial_range, build_url_for_full_month
+from src.forexfactory.date_logic import build_url_for_day, iter_calendar_pages
 
 
 class TestUrlBuilders(unittest.TestCase):
@@ -32,6 +33,45 @@ class TestUrlBuilders(unittest.TestCase):
         result = build_url_for_full_month(2025, 1)
         self.assertEqual(result, "month=jan.2025")
 
+    def test_build_url_for_day(self):
+        self.assertEqual(build_url_for_day(datetime(2025, 1, 5)), "day=jan05.2025")
+
+
+class TestCalendarPages(unittest.TestCase):
+
+    def setUp(self):
+        self.tz = gettz("Asia/Tehran")
+
+    def test_day_pages(self):
+        pages = list(iter_calendar_pages(datetime(2025, 1, 30, tzinfo=self.tz),
+                                         datetime(2025, 2, 1, tzinfo=self.tz), "day"))
+        self.assertEqual([p.param for p in pages],
+                         ["day=jan30.2025", "day=jan31.2025", "day=feb01.2025"])
+
+    def test_week_pages(self):
+        pages = list(iter_calendar_pages(datetime(2025, 1, 1, tzinfo=self.tz),
+                                         datetime(2025, 1, 10, tzinfo=self.tz), "week"))
+        self.assertEqual([p.param for p in pages],
+                         ["range=jan1.2025-jan7.2025", "range=jan8.2025-jan10.2025"])
+
+    def test_month_pages(self):
+        pages = list(iter_calendar_pages(datetime(2024, 12, 20, tzinfo=self.tz),
+                                         datetime(2025, 3, 5, tzinfo=self.tz), "month"))
+        self.assertEqual([p.param for p in pages], [
+            "range=dec20.2024-dec31.2024",
+            "month=jan.2025",
+            "month=feb.2025",
+            "range=mar1.2025-mar5.2025",
+        ])
+        # Pages cover the range without gaps or overlaps
+        self.assertEqual(pages[1].start.day, 1)
+        self.assertEqual(pages[1].end.day, 31)
+        self.assertEqual(pages[2].end.day, 28)
+
+    def test_unknown_granularity(self):
+        with self.assertRaises(ValueError):
+            list(iter_calendar_pages(datetime(2025, 1, 1), datetime(2025, 1, 2), "year"))
+
 
 if __name__ == '__main__':
     unittest.main()